@@ -0,0 +1,139 @@
+#! /usr/bin/env python2.7
+# ===========================================================
+#
+#   Benchmark for sharpo
+#   analytic_check.py :: cross-check of the analytic projection
+#                        (--quadrature analytic) against the
+#                        numerical ones
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python benchmarks/analytic_check.py [--lmax L] [--radii R ...] [--grid-order NR NANG]
+#                                          [--cubature] [--tolerance TOL] [MOLDEN ...]
+#      (about 1.5 minutes with the defaults)
+#
+#  Comments
+#  :: Every file (default: example/h2o.molden and synthetic molecules
+#     with cartesian and spherical d and f functions, closed and open
+#     shell) is projected onto the origin, an off-center point and the
+#     first atom at all radii, with the analytic engine and with the
+#     fixed Gauss grid (native evaluator) of --grid-order; --cubature
+#     adds the adaptive path (needs cubature and orbkit).
+#  :: The largest |all_c(analytic) - all_c(numerical)| of every file and
+#     path is printed together with the wall times. The fixed grid
+#     converges to the analytic values for growing --grid-order; the
+#     default order is tight enough for the tolerance (an angular degree
+#     of 61 leaves ~3e-4 near tight core functions). The adaptive path is
+#     only accurate to its abserr/relerr and has its own tolerance.
+#  :: Exits with 1 if a difference is above the tolerance.
+#
+#  Last edited
+#  17.10.2026 :: analytic path with 128 radial points
+#  17.10.2026 :: first version
+#
+# ===========================================================
+from __future__ import print_function
+
+import argparse
+import tempfile
+import shutil
+import time
+import sys
+import os
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+from sharpo import api
+
+molecules = [(3, "dzp", "closed", False),                       #: (atoms, basis, spin, spherical)
+             (4, "tzp", "open",   True),
+             (5, "tzp", "closed", False)]
+
+
+#--------------------------------------------
+# all_c and wall time of one path
+#--------------------------------------------
+def projection(qc, centers, radii, lmax, settings):
+  t0 = time.time()
+  result = api.project(qc, centers=centers, radii=radii, lmax=lmax, **settings)
+  return result['all_c'], time.time() - t0
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Cross-check of the analytic projection against the numerical ones")
+  parser.add_argument("files", type=str, nargs='*', metavar="MOLDEN",
+                      help="molden files. Default = example/h2o.molden and synthetic molecules")
+  parser.add_argument("--lmax", type=int, default=6, help="highest l. Default = 6")
+  parser.add_argument("--radii", type=float, nargs='+', default=[1., 2., 4.], metavar="R",
+                      help="radii [a.u.]. Default = 1 2 4")
+  parser.add_argument("--grid-order", type=int, nargs=2, default=[192, 121], dest='grid_order', metavar=("NR", "NANG"),
+                      help="fixed grid of the numerical path. Default = 192 121")
+  parser.add_argument("--n-radial", type=int, default=128, dest='n_radial',
+                      help="radial points of the analytic path. Default = 128")
+  parser.add_argument("--cubature", action="store_true", help="also compare with the adaptive cubature path")
+  parser.add_argument("--tolerance", type=float, default=1e-4, help="largest accepted difference. Default = 1e-4")
+  parser.add_argument("--cubature-tolerance", type=float, default=5e-3, dest='cubature_tolerance',
+                      help="largest accepted difference of the adaptive path. Default = 5e-3")
+  args = parser.parse_args()
+
+  workdir = tempfile.mkdtemp(prefix="sharpo-analytic-")
+  files = list(args.files)
+  if not files:
+    files.append(os.path.join(root, "example", "h2o.molden"))
+    for atoms, basis, spin, spherical in molecules:
+      filename = os.path.join(workdir, "%iat-%s-%s%s.molden" % (atoms, basis, spin, "-sph" if spherical else ""))
+      synthetic.write_molden(filename, atoms, basis, spin, spherical)
+      files.append(filename)
+
+  paths = [("gauss", args.tolerance, {'quadrature': "gauss", 'grid_order': args.grid_order, 'evaluator': "native"})]
+  if args.cubature:
+    paths.append(("cubature", args.cubature_tolerance, {'quadrature': "cubature"}))
+
+  failed = False
+  print("%-28s  %-9s  %12s  %12s  %10s  %10s" % ("file", "path", "max |diff|", "max all_c", "t_num [s]", "t_ana [s]"))
+  try:
+    for filename in files:
+      qc = api.load(filename, reader="native")
+      centers = numpy.array([[0., 0., 0.], [0.3, -0.5, 0.8], qc.geo_spec[0]], dtype=float)
+      analytic, t_analytic = projection(qc, centers, args.radii, args.lmax,
+                                        {'quadrature': "analytic", 'grid_order': (args.n_radial, 0)})
+      for name, tolerance, settings in paths:
+        if name == "cubature":
+          qc = api.load(filename)                               #: cubature evaluates the MOs with orbkit
+        numerical, t_numerical = projection(qc, centers, args.radii, args.lmax, settings)
+        diff = numpy.abs(analytic - numerical).max()
+        status = ""
+        if diff > tolerance:
+          status = "  <- FAILED"
+          failed = True
+        print("%-28s  %-9s  %12.3e  %12.6f  %10.3f  %10.3f%s" % (os.path.basename(filename)[:28], name, diff,
+              numpy.abs(analytic).max(), t_numerical, t_analytic, status))
+  finally:
+    shutil.rmtree(workdir, ignore_errors=True)
+
+  sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,131 @@
+#! /usr/bin/env python2.7
+# ===========================================================
+#
+#   Benchmark for sharpo
+#   startup.py :: start-up time of the fast paths of sharpo
+#                 (help, version, info, license, MO energies)
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python benchmarks/startup.py [-n REPEAT] [--limit SECONDS] [--input MOLDEN]
+#
+#  Comments
+#  :: Every case runs "python -m sharpo ..." REPEAT times in a fresh
+#     interpreter; the median wall time is reported.
+#  :: Every case is run once more in-process to check that none of
+#     the heavy modules (heavy_modules) were imported.
+#  :: Exits with 1 if a case imports a heavy module or its median is
+#     above the limit, so it can guard the fast paths in scripts.
+#
+#  Last edited
+#  17.10.2026 :: first version
+#
+# ===========================================================
+from __future__ import print_function
+
+import subprocess
+import argparse
+import time
+import sys
+import os
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+heavy_modules = ["orbkit", "cubature", "scipy"]                 #: must not be loaded on the fast paths
+marker = "#sharpo-modules:"
+
+#--------------------------------------------
+# Runs main(argv) and reports the heavy
+# modules loaded (in a fresh interpreter)
+#--------------------------------------------
+probe = '''
+import sys
+sys.path.insert(0, %r)
+from sharpo import cli
+try:
+  cli.main(%r)
+except SystemExit:
+  pass
+loaded = sorted(set(name.split(".")[0] for name in sys.modules) & set(%r))
+sys.stderr.write("%s" + " ".join(loaded) + "\\n")
+'''
+
+#--------------------------------------------
+# Cases: (name, arguments)
+#--------------------------------------------
+def cases(input_file):
+  return [("help",        ["--help"]),
+          ("version",     ["--version"]),
+          ("info",        ["--info"]),
+          ("license",     ["--license"]),
+          ("mo-energies", [input_file, "--mo-energies-only"])]
+
+
+#--------------------------------------------
+# Median wall time of "python -m sharpo args"
+#--------------------------------------------
+def startup_time(args, repeat):
+  env = dict(os.environ)
+  env["PYTHONPATH"] = os.pathsep.join([root] + [p for p in [env.get("PYTHONPATH")] if p])
+  times = []
+  with open(os.devnull, "w") as devnull:
+    for i in range(0, repeat):
+      t0 = time.time()
+      subprocess.call([sys.executable, "-m", "sharpo"] + args, stdout=devnull, stderr=devnull, env=env)
+      times.append(time.time() - t0)
+  times.sort()
+  return times[len(times)//2]
+
+
+#--------------------------------------------
+# Heavy modules loaded by main(args)
+#--------------------------------------------
+def loaded_modules(args):
+  process = subprocess.Popen([sys.executable, "-c", probe % (root, args, heavy_modules, marker)],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+  out, err = process.communicate()
+  for line in err.decode("utf-8", "replace").splitlines():
+    if line.startswith(marker):
+      return line[len(marker):].split()
+  raise RuntimeError("probe failed for %s:\n%s" % (" ".join(args), err.decode("utf-8", "replace")))
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Start-up time of the fast paths of sharpo")
+  parser.add_argument("-n", "--repeat", type=int, default=10, help="runs per case. Default = 10")
+  parser.add_argument("--limit", type=float, default=1.0, help="largest accepted median [s]. Default = 1.0")
+  parser.add_argument("--input", type=str, default=os.path.join(root, "example", "h2o.molden"),
+                      help="molden file of the MO energy case. Default = example/h2o.molden")
+  args = parser.parse_args()
+
+  failed = False
+  print("%-12s  %10s  %s" % ("case", "median [s]", "heavy modules"))
+  for name, argv in cases(args.input):
+    median = startup_time(argv, args.repeat)
+    loaded = loaded_modules(argv)
+    status = ""
+    if loaded or median > args.limit:
+      status = "  <- FAILED"
+      failed = True
+    print("%-12s  %10.3f  %s%s" % (name, median, " ".join(loaded) or "-", status))
+
+  sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+  main()
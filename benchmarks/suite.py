@@ -0,0 +1,393 @@
+#! /usr/bin/env python2.7
+# ===========================================================
+#
+#   Benchmark for sharpo
+#   suite.py :: stage timings and accuracy of the projection on
+#               synthetic molecules over a matrix of settings
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python benchmarks/suite.py [--matrix {small,full}] [--molecules ATOMS:BASIS ...]
+#                                 [--radius R ...] [--lmax L ...] [--npoints N ...]
+#                                 [--spin {closed,open} ...] [--tolerance T ...] [-n REPEAT]
+#                                 [--rtol RTOL] [--atol ATOL]
+#                                 [--update-reference] [--compare RESULTS.json]
+#                                 [-- SHARPO OPTIONS]
+#      e.g. python benchmarks/suite.py --matrix small -- --quadrature gauss --evaluator native
+#
+#   Contains Functions:
+#   :: case_list(args)
+#      Returns the cases of the matrix
+#
+#   :: run_case(case, molden_file, workdir, repeat, sharpo_args)
+#      Runs "python -m sharpo" on one case; returns the median stage
+#      times, the counters, the peak memory and all_c
+#
+#   :: reference_file(case)
+#      Returns benchmarks/reference/<name>.npz of the molecule and radius
+#      of a case
+#
+#   :: store_reference(case, molden_file, workdir, env)
+#      Runs the case with reference_args at reference_lmax and saves
+#      all_c as its reference
+#
+#   :: check_reference(case, all_c, rtol, atol)
+#      Compares all_c with the reference of the case; a missing reference
+#      fails
+#
+#   :: compare(old_file, results)
+#      Prints the wall times of an earlier results file next to this run
+#
+#  Comments
+#  :: Every case runs sharpo in a fresh process with --profile,
+#     --no-cache, --coeff and --format npz --text-export, so every stage
+#     of a normal run is timed:
+#       read, energy_window, coefficients, projection (= projection/integration),
+#       smearing (= projection/smearing), output
+#     and the peak memory belongs to the case alone.
+#  :: The matrix is molecules x radius x lmax x npoints x spin x tolerance;
+#     a molecule is ATOMS:BASIS (basis sets of synthetic.py). --npoints
+#     changes only the smearing and the output; the tolerance is passed
+#     as --abserr and --relerr (cubature, the default quadrature).
+#  :: Accuracy: all_c of every case is compared with the exact values
+#     (benchmarks/reference/<molecule>_r<radius>.npz, l <= reference_lmax).
+#     The references are made by the analytic projection with 1024
+#     radial points (reference_args; 512 points agree to 2e-7 for 24
+#     atoms in r = 3), which depends neither on the settings under test
+#     nor on orbkit, and are part of the repository. The check passes if
+#       |all_c - reference| <= atol + rtol*|reference|
+#     everywhere; atol and rtol are the tolerance of the case unless
+#     --atol/--rtol are given. A case without reference fails.
+#     --update-reference (re)makes the references of the cases of this
+#     run; the reference runs are not timed.
+#  :: Results are saved as JSON (benchmarks/results/<date>-<time>.json)
+#     with the version, the git commit and the environment; --compare
+#     prints the wall times of an older file next to the new ones.
+#  :: Exits with 1 if a case fails or an accuracy check fails.
+#
+#  Last edited
+#  17.10.2026 :: tolerance axis; exact references in the repository,
+#                a missing reference fails
+#  17.10.2026 :: first version
+#
+# ===========================================================
+from __future__ import print_function
+
+import multiprocessing
+import subprocess
+import argparse
+import platform
+import tempfile
+import shutil
+import json
+import time
+import sys
+import os
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+reference_dir = os.path.join(root, "benchmarks", "reference")
+results_dir = os.path.join(root, "benchmarks", "results")
+
+stages = [("read",          ["read"]),
+          ("energy_window", ["energy_window"]),
+          ("coefficients",  ["coefficients"]),
+          ("projection",    ["projection/integration", "projection/cache"]),
+          ("smearing",      ["projection/smearing"]),
+          ("output",        ["output"])]
+
+matrices = {'small': {'molecules': ["3:minimal", "6:dz"],
+                      'radius':    [1.5],
+                      'lmax':      [2, 4],
+                      'npoints':   [50.],
+                      'spin':      ["closed", "open"],
+                      'tolerance': [1e-3]},
+            'full':  {'molecules': ["3:minimal", "6:dz", "12:dzp", "24:dzp", "48:tzp"],
+                      'radius':    [1.5, 3.0],
+                      'lmax':      [2, 4, 6],
+                      'npoints':   [50., 200.],
+                      'spin':      ["closed", "open"],
+                      'tolerance': [1e-3, 1e-4]}}
+
+reference_args = ["--quadrature", "analytic", "--grid-order", "1024", "0", "--reader", "native"]   #: settings of the references
+reference_lmax = 6                                              #: highest l of the references
+
+
+#--------------------------------------------
+# Cases of the matrix
+#--------------------------------------------
+def case_list(args):
+  matrix = matrices[args.matrix]
+  cases = []
+  for molecule in args.molecules or matrix['molecules']:
+    atoms, basis = molecule.split(":")
+    for spin in args.spin or matrix['spin']:
+      for radius in args.radius or matrix['radius']:
+        for lmax in args.lmax or matrix['lmax']:
+          for npoints in args.npoints or matrix['npoints']:
+            for tolerance in args.tolerance or matrix['tolerance']:
+              cases.append({'atoms': int(atoms), 'basis': basis, 'spin': spin, 'spherical': args.spherical,
+                            'radius': radius, 'lmax': lmax, 'npoints': npoints, 'tolerance': tolerance})
+  return cases
+
+
+#--------------------------------------------
+# Name of a case and of its reference
+#--------------------------------------------
+def molecule_name(case):
+  return "%iat-%s%s-%s" % (case['atoms'], case['basis'], "-sph" if case['spherical'] else "", case['spin'])
+
+
+def case_name(case):
+  return "%s_r%g_l%i_np%g_tol%g" % (molecule_name(case), case['radius'], case['lmax'], case['npoints'],
+                                     case['tolerance'])
+
+
+def reference_file(case):
+  return os.path.join(reference_dir, "%s_r%g.npz" % (molecule_name(case), case['radius']))
+
+
+#--------------------------------------------
+# One case in a fresh process (repeat times)
+#--------------------------------------------
+def run_case(case, molden_file, workdir, repeat, sharpo_args):
+  env = dict(os.environ)
+  env["PYTHONPATH"] = os.pathsep.join([root] + [p for p in [env.get("PYTHONPATH")] if p])
+  profile_file = os.path.join(workdir, "profile.json")
+  argv = [sys.executable, "-m", "sharpo", molden_file,
+          "-r", str(case['radius']), "--lmax", str(case['lmax']), "-np", str(case['npoints']),
+          "--abserr", str(case['tolerance']), "--relerr", str(case['tolerance']),
+          "--coeff", "--no-cache", "--format", "npz", "--text-export",
+          "-o", os.path.join(workdir, "bench"), "--profile", profile_file] + sharpo_args
+
+  runs = []
+  for i in range(0, repeat):
+    t0 = time.time()
+    with open(os.path.join(workdir, "sharpo.log"), "w") as log:
+      status = subprocess.call(argv, stdout=log, stderr=subprocess.STDOUT, cwd=workdir, env=env)
+    wall = time.time() - t0
+    if status != 0:
+      with open(os.path.join(workdir, "sharpo.log")) as log:
+        raise RuntimeError("sharpo failed (%i):\n%s" % (status, log.read()[-2000:]))
+    with open(profile_file) as f:
+      runs.append((wall, json.load(f)))
+
+  times = {}
+  for name, parts in stages:
+    values = [sum(s['wall'] for s in report['stages'] if s['name'] in parts) for wall, report in runs]
+    times[name] = float(numpy.median(values))
+  times['total'] = float(numpy.median([wall for wall, report in runs]))
+  report = runs[-1][1]
+  with numpy.load(os.path.join(workdir, "bench.npz")) as data:
+    all_c = numpy.array(data['projection/all_c'])
+  return {'times': times, 'counters': report['totals'], 'info': report['info'],
+          'peak_memory_mb': report['peak_memory_mb']}, all_c
+
+
+#--------------------------------------------
+# Reference of a case from a run with
+# reference_args
+#--------------------------------------------
+def store_reference(case, molden_file, workdir, env):
+  reference_case = dict(case, lmax=max(case['lmax'], reference_lmax))
+  if not os.path.isdir(workdir):
+    os.makedirs(workdir)
+  measured, all_c = run_case(reference_case, molden_file, workdir, 1, reference_args)
+  if not os.path.isdir(reference_dir):
+    os.makedirs(reference_dir)
+  numpy.savez_compressed(reference_file(case), all_c=all_c, settings=json.dumps(reference_args),
+                         version=env['version'], commit=env['commit'] or "")
+
+
+#--------------------------------------------
+# all_c against the stored reference
+#--------------------------------------------
+def check_reference(case, all_c, rtol, atol):
+  filename = reference_file(case)
+  if not os.path.exists(filename):
+    return {'status': "FAILED (no reference)", 'max_abs_error': None, 'max_rel_error': None}
+  with numpy.load(filename) as data:
+    reference = data['all_c']
+  lmax = case['lmax']
+  if reference.shape[2] <= lmax or reference.shape[:2] + reference.shape[3:] != all_c.shape[:2] + all_c.shape[3:]:
+    return {'status': "FAILED (shape %s, reference %s)" % (all_c.shape, reference.shape),
+            'max_abs_error': None, 'max_rel_error': None}
+  reference = reference[:, :, :lmax+1]
+  error = numpy.abs(all_c - reference)
+  passed = bool((error <= atol + rtol*numpy.abs(reference)).all())
+  return {'status': "ok" if passed else "FAILED",
+          'max_abs_error': float(error.max()),
+          'max_rel_error': float((error/numpy.maximum(numpy.abs(reference), atol)).max())}
+
+
+#--------------------------------------------
+# Version, commit and environment of the run
+#--------------------------------------------
+def environment(args, sharpo_args):
+  sys.path.insert(0, root)
+  from sharpo import __version__
+  try:
+    with open(os.devnull, "w") as devnull:
+      commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=root, stderr=devnull).decode("utf-8").strip()
+  except (OSError, subprocess.CalledProcessError):
+    commit = None
+  return {'version': __version__, 'commit': commit,
+          'date': time.strftime("%Y-%m-%d %H:%M:%S"),
+          'python': platform.python_version(), 'numpy': numpy.__version__,
+          'platform': platform.platform(), 'machine': platform.machine(),
+          'cpus': multiprocessing.cpu_count(), 'repeat': args.repeat,
+          'rtol': args.rtol, 'atol': args.atol, 'sharpo_args': sharpo_args}
+
+
+#--------------------------------------------
+# Wall times of an older run next to this one
+#--------------------------------------------
+def compare(old_file, results):
+  with open(old_file) as f:
+    old = json.load(f)
+  old_cases = dict((case['name'], case) for case in old['cases'])
+  print("")
+  print("Compared with %s (%s, commit %s)" % (old_file, old['environment']['date'],
+                                              (old['environment']['commit'] or "-")[:10]))
+  print("%-40s  %13s  %10s  %10s  %8s" % ("case", "stage", "old [s]", "new [s]", "speed-up"))
+  for case in results['cases']:
+    if case['name'] not in old_cases or 'times' not in case or 'times' not in old_cases[case['name']]:
+      continue
+    for stage in [name for name, parts in stages] + ['total']:
+      t_old = old_cases[case['name']]['times'].get(stage, 0.)
+      t_new = case['times'][stage]
+      if t_old == 0. and t_new == 0.:
+        continue
+      speedup = "%8.2f" % (t_old/t_new) if t_new > 0. else "       -"
+      print("%-40s  %13s  %10.3f  %10.3f  %s" % (case['name'], stage, t_old, t_new, speedup))
+
+
+def main():
+  argv = sys.argv[1:]
+  sharpo_args = []
+  if "--" in argv:                                              #: everything after -- goes to sharpo
+    sharpo_args = argv[argv.index("--")+1:]
+    argv = argv[:argv.index("--")]
+
+  parser = argparse.ArgumentParser(description="Stage timings and accuracy of sharpo on synthetic molecules",
+                                   epilog="Options after -- are passed to sharpo (e.g. -- --quadrature gauss)")
+  parser.add_argument("--matrix", type=str, choices=sorted(matrices), default="small",
+                      help="default cases (overridden per axis by the options below). Default = small")
+  parser.add_argument("--molecules", type=str, nargs='+', default=None, metavar="ATOMS:BASIS",
+                      help="synthetic molecules, basis one of %s" % ", ".join(sorted(synthetic.basis_sets)))
+  parser.add_argument("--radius", type=float, nargs='+', default=None, metavar="R", help="cut-off radii [Ang]")
+  parser.add_argument("--lmax", type=int, nargs='+', default=None, metavar="L", help="highest l")
+  parser.add_argument("--npoints", type=float, nargs='+', default=None, metavar="N", help="smearing points per eV")
+  parser.add_argument("--spin", type=str, nargs='+', choices=synthetic.spin_types, default=None, help="closed and/or open shell")
+  parser.add_argument("--tolerance", type=float, nargs='+', default=None, metavar="T",
+                      help="--abserr and --relerr of sharpo (cubature); also the atol and rtol of the accuracy check")
+  parser.add_argument("--spherical", action="store_true", help="spherical d and f functions in the molecules")
+  parser.add_argument("-n", "--repeat", type=int, default=1, help="runs per case; the median is reported. Default = 1")
+  parser.add_argument("--rtol", type=float, default=None, help="relative tolerance of all_c. Default = tolerance of the case")
+  parser.add_argument("--atol", type=float, default=None, help="absolute tolerance of all_c. Default = tolerance of the case")
+  parser.add_argument("--update-reference", action="store_true", dest='update_reference',
+                      help="(re)makes the references of the cases with the analytic projection (%s)" % " ".join(reference_args))
+  parser.add_argument("--compare", type=str, default=None, metavar="RESULTS",
+                      help="results file of an earlier run to compare the times with")
+  parser.add_argument("--output", type=str, default=None, metavar="FILE",
+                      help="results file. Default = benchmarks/results/<date>-<time>.json")
+  parser.add_argument("--keep", action="store_true", help="keeps the molden files and outputs (printed directory)")
+  args = parser.parse_args(argv)
+
+  workdir = tempfile.mkdtemp(prefix="sharpo-bench-")
+  results = {'environment': environment(args, sharpo_args), 'cases': []}
+  failed = False
+  molecules = {}
+  updated = set()
+  print("%-40s  %8s  %8s  %8s  %8s  %8s  %8s  %8s  %s" % ("case", "read", "coeff", "proj", "smear", "output",
+                                                          "total", "MB", "all_c"))
+  try:
+    for case in case_list(args):
+      name = case_name(case)
+      entry = {'name': name, 'settings': case}
+
+      #---------------------------
+      # molden file of the molecule
+      # (written once per molecule)
+      # ---
+      mol = molecule_name(case)
+      if mol not in molecules:
+        molden_file = os.path.join(workdir, mol + ".molden")
+        molecules[mol] = (molden_file, synthetic.write_molden(molden_file, case['atoms'], case['basis'],
+                                                              case['spin'], case['spherical']))
+      molden_file, entry['molecule'] = molecules[mol]
+
+      casedir = os.path.join(workdir, name)
+      os.makedirs(casedir)
+      try:
+        measured, all_c = run_case(case, molden_file, casedir, args.repeat, sharpo_args)
+      except RuntimeError as error:
+        entry['error'] = str(error)
+        results['cases'].append(entry)
+        failed = True
+        print("%-40s  FAILED: %s" % (name, str(error).splitlines()[0]))
+        continue
+      entry.update(measured)
+      if args.update_reference and reference_file(case) not in updated:
+        try:
+          store_reference(case, molden_file, os.path.join(casedir, "reference"), results['environment'])
+        except RuntimeError as error:
+          print("%-40s  FAILED reference: %s" % (name, str(error).splitlines()[0]))
+        updated.add(reference_file(case))
+      rtol = args.rtol if args.rtol is not None else case['tolerance']
+      atol = args.atol if args.atol is not None else case['tolerance']
+      entry['accuracy'] = check_reference(case, all_c, rtol, atol)
+      entry['accuracy'].update({'reference': os.path.relpath(reference_file(case), root), 'rtol': rtol, 'atol': atol})
+      if entry['accuracy']['status'].startswith("FAILED"):
+        failed = True
+      results['cases'].append(entry)
+      t = entry['times']
+      print("%-40s  %8.3f  %8.3f  %8.3f  %8.3f  %8.3f  %8.3f  %8.1f  %s" % (
+            name, t['read'], t['coefficients'], t['projection'], t['smearing'], t['output'],
+            t['total'], entry['peak_memory_mb'] or 0., entry['accuracy']['status']))
+  finally:
+    if args.keep:
+      print("Files kept in %s" % workdir)
+    else:
+      shutil.rmtree(workdir, ignore_errors=True)
+
+  #---------------------------
+  # results of this run
+  # ---
+  output = args.output
+  if output is None:
+    if not os.path.isdir(results_dir):
+      os.makedirs(results_dir)
+    output = os.path.join(results_dir, time.strftime("%Y%m%d-%H%M%S") + ".json")
+  with open(output, "w") as f:
+    json.dump(results, f, indent=1, sort_keys=True)
+  print("")
+  print("Results saved to %s" % output)
+
+  if args.compare is not None:
+    compare(args.compare, results)
+  sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,199 @@
+#! /usr/bin/env python2.7
+# ===========================================================
+#
+#   Benchmark for sharpo
+#   synthetic.py :: synthetic molden wave functions of any size
+#                   (atoms, basis, closed or open shell)
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python benchmarks/synthetic.py N_ATOMS [--basis BASIS] [--spin {closed,open}]
+#                                     [--spherical] [--seed SEED] [-o FILE]
+#
+#   Contains Functions:
+#   :: geometry(n_atoms, rng)
+#      Returns the elements and the coordinates [Ang] of n_atoms atoms
+#
+#   :: n_functions(shells, spherical)
+#      Returns the number of AOs of a list of shells
+#
+#   :: write_molden(filename, n_atoms, basis, spin, spherical, seed)
+#      Writes the wave function; returns {'atoms', 'n_ao', 'n_mo'}
+#
+#  Comments
+#  :: The atoms (C, H, H, C, H, H, ...) sit on a cubic lattice with a
+#     spacing of 1.5 Ang, the closest ones to the origin first, with a
+#     small random displacement; so the projection center (0,0,0) is
+#     always inside the molecule.
+#  :: Basis sets (shells per element, see basis_sets):
+#       minimal < dz < dzp < tzp
+#     The exponents are in the range of real valence basis sets; the
+#     contraction coefficients need not be normalized (orbkit and the
+#     native evaluator normalize the primitives).
+#  :: One MO per AO; random coefficients and ascending random energies
+#     (a.u.) from a seeded generator -> the same file for the same
+#     arguments. Half of the MOs are occupied (closed: 2 electrons,
+#     open: one more alpha than beta electron, 1 electron each).
+#  :: The MOs are not orthonormal; sharpo does not need them to be.
+#
+#  Last edited
+#  17.10.2026 :: first version
+#
+# ===========================================================
+from __future__ import print_function
+
+import argparse
+import numpy
+
+spacing = 1.5                                                   #: lattice constant [Ang]
+elements = {'C': 6, 'H': 1}
+
+#--------------------------------------------
+# Contracted shells: (type, [(exponent, coefficient), ...])
+#--------------------------------------------
+s_core    = ('s', [(3047.5, 0.0018), (457.37, 0.0140), (103.95, 0.0688), (29.210, 0.2322), (9.2867, 0.4679), (3.1639, 0.3623)])
+s_valence = ('s', [(7.8683, -0.1193), (1.8813, -0.1609), (0.5442, 1.1435)])
+s_outer   = ('s', [(0.1687, 1.0)])
+s_diffuse = ('s', [(0.0438, 1.0)])
+p_valence = ('p', [(7.8683, 0.0690), (1.8813, 0.3164), (0.5442, 0.7443)])
+p_outer   = ('p', [(0.1687, 1.0)])
+p_diffuse = ('p', [(0.0438, 1.0)])
+d_pol     = ('d', [(0.8000, 1.0)])
+d_pol2    = ('d', [(0.2500, 1.0)])
+f_pol     = ('f', [(0.7610, 1.0)])
+h_valence = ('s', [(18.731, 0.0335), (2.8254, 0.2347), (0.6401, 0.8138)])
+h_outer   = ('s', [(0.1613, 1.0)])
+h_p       = ('p', [(1.1000, 1.0)])
+h_d       = ('d', [(1.0570, 1.0)])
+
+basis_sets = {'minimal': {'C': [s_core, s_valence, p_valence],
+                          'H': [h_valence]},
+              'dz':      {'C': [s_core, s_valence, s_outer, p_valence, p_outer],
+                          'H': [h_valence, h_outer]},
+              'dzp':     {'C': [s_core, s_valence, s_outer, p_valence, p_outer, d_pol],
+                          'H': [h_valence, h_outer, h_p]},
+              'tzp':     {'C': [s_core, s_valence, s_outer, s_diffuse, p_valence, p_outer, p_diffuse,
+                                d_pol, d_pol2, f_pol],
+                          'H': [h_valence, h_outer, h_p, h_d]}}
+spin_types = ['closed', 'open']
+
+l_of = {'s': 0, 'p': 1, 'd': 2, 'f': 3}
+
+
+#--------------------------------------------
+# Elements and coordinates [Ang]
+#--------------------------------------------
+def geometry(n_atoms, rng):
+  n = 1
+  while n**3 < n_atoms:
+    n += 1
+  axis = (numpy.arange(n) - (n-1)/2.)*spacing
+  sites = numpy.array([(x, y, z) for x in axis for y in axis for z in axis])
+  order = numpy.lexsort((sites[:,2], sites[:,1], sites[:,0], numpy.round((sites**2).sum(axis=1), 6)))
+  coords = sites[order[:n_atoms]] + rng.uniform(-0.1, 0.1, (n_atoms, 3))
+  symbols = [['C', 'H', 'H'][i % 3] for i in range(0, n_atoms)]
+  return symbols, coords
+
+
+#--------------------------------------------
+# Number of AOs of a list of shells
+#--------------------------------------------
+def n_functions(shells, spherical=False):
+  n = 0
+  for shell_type, primitives in shells:
+    l = l_of[shell_type]
+    n += 2*l+1 if spherical else (l+1)*(l+2)//2
+  return n
+
+
+#--------------------------------------------
+# One MO block of the molden file
+#--------------------------------------------
+def mo_lines(coefficients, energies, occupations, spin):
+  lines = []
+  for i in range(0, len(energies)):
+    lines.append(" Sym= %10s" % ("%i.1" % (i+1)))
+    lines.append(" Ene= %16.8f" % energies[i])
+    lines.append(" Spin= %s" % spin)
+    lines.append(" Occup= %12.6f" % occupations[i])
+    for j in range(0, coefficients.shape[1]):
+      lines.append("%5i %18.11f" % (j+1, coefficients[i,j]))
+  return lines
+
+
+#--------------------------------------------
+# Synthetic molden file
+#--------------------------------------------
+def write_molden(filename, n_atoms, basis="dz", spin="closed", spherical=False, seed=0):
+  rng = numpy.random.RandomState(seed)
+  symbols, coords = geometry(n_atoms, rng)
+  shells = [basis_sets[basis][s] for s in symbols]
+  n_ao = sum(n_functions(atom_shells, spherical) for atom_shells in shells)
+
+  lines = ["[Molden Format]", "[Atoms] Angs"]
+  for i in range(0, n_atoms):
+    lines.append("%-3s %5i %3i %20.10f %20.10f %20.10f" % (symbols[i], i+1, elements[symbols[i]],
+                                                            coords[i,0], coords[i,1], coords[i,2]))
+  if spherical:
+    lines.append("[5D7F]")
+  lines.append("[GTO]")
+  for i in range(0, n_atoms):
+    lines.append("%5i 0" % (i+1))
+    for shell_type, primitives in shells[i]:
+      lines.append(" %s %4i 1.00" % (shell_type, len(primitives)))
+      for exponent, coefficient in primitives:
+        lines.append(" %18.10E %18.10E" % (exponent, coefficient))
+    lines.append("")
+
+  #---------------------------
+  # MOs: one per AO, half occupied
+  # ---
+  lines.append("[MO]")
+  n_occ = n_ao//2
+  if spin == "closed":
+    energies = numpy.sort(rng.uniform(-1.5, 0.5, n_ao))
+    occupations = numpy.where(numpy.arange(n_ao) < n_occ, 2., 0.)
+    lines += mo_lines(rng.normal(0., n_ao**-0.5, (n_ao, n_ao)), energies, occupations, "Alpha")
+  else:
+    for name, n_electrons in (("Alpha", n_occ+1), ("Beta", n_occ)):
+      energies = numpy.sort(rng.uniform(-1.5, 0.5, n_ao))
+      occupations = numpy.where(numpy.arange(n_ao) < n_electrons, 1., 0.)
+      lines += mo_lines(rng.normal(0., n_ao**-0.5, (n_ao, n_ao)), energies, occupations, name)
+
+  with open(filename, "w") as f:
+    f.write("\n".join(lines) + "\n")
+  return {'atoms': n_atoms, 'n_ao': n_ao, 'n_mo': n_ao*(1 if spin == "closed" else 2)}
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Writes a synthetic molden wave function")
+  parser.add_argument("atoms", type=int, help="number of atoms")
+  parser.add_argument("--basis", type=str, choices=sorted(basis_sets), default="dz", help="basis set. Default = dz")
+  parser.add_argument("--spin", type=str, choices=spin_types, default="closed", help="closed or open shell. Default = closed")
+  parser.add_argument("--spherical", action="store_true", help="spherical d and f functions ([5D7F])")
+  parser.add_argument("--seed", type=int, default=0, help="seed of the random numbers. Default = 0")
+  parser.add_argument("-o", "--output", type=str, default="synthetic.molden", help="file name. Default = synthetic.molden")
+  args = parser.parse_args()
+
+  size = write_molden(args.output, args.atoms, args.basis, args.spin, args.spherical, args.seed)
+  print("%s: %i atoms, %i AOs, %i MOs" % (args.output, size['atoms'], size['n_ao'], size['n_mo']))
+
+
+if __name__ == "__main__":
+  main()
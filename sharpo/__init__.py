@@ -0,0 +1,27 @@
+# ===========================================================
+#
+#   sharpo (Spherical HARmonics Projected Orbitals)
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: Sharpo is free software: you can redistribute it and/or
+#      modify it under the terms of the GNU Lesser General Public
+#      License as published by the Free Software Foundation, either
+#      version 3 of the License, or any later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#  Comments
+#  :: The command-line program is cli.main (python sharpo or
+#     python -m sharpo). Importing the package loads nothing else.
+#
+# ===========================================================
+
+__version__ = "0.3.4"
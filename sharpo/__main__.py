@@ -0,0 +1,15 @@
+#! /usr/bin/env python2.7
+#---------------------------------
+# Entry point of "python sharpo" (the
+# directory) and "python -m sharpo"
+#---------------------------------
+import os
+import sys
+
+if __package__ in (None, ""):
+  sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  from sharpo.cli import main
+else:
+  from .cli import main
+
+main()
@@ -0,0 +1,572 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   adaptive.py :: adaptive projection of the molecular orbitals
+#                  onto spherical harmonics with cubature
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: func(x_array, *args)
+#      Integrand of [2] (angular part) for cubature
+#
+#   :: func_block(task)
+#      [2] on one block of points of func (one thread); returns the
+#      time in the spherical harmonics and in the MO evaluation
+#
+#   :: point_block(qc_eval, memory)
+#      Points per block of func: thread_block, halved until the smallest
+#      block of MOs (projection.smallest_block) fits into memory [MB] of
+#      a thread
+#
+#   :: func2(x_array, *args)
+#      Integrand of [1] (radial part) for cubature
+#
+#   :: default_settings()
+#      Settings of the integration without --abserr, --relerr, ...
+#
+#   :: norm_index(settings, pairs)
+#      cubature's norm argument of settings['norm']; "paired" only with
+#      (re, im) pairs in the integrand (pairs = True), else "individual"
+#
+#   :: integrate(*args, **kwargs)
+#      cubature(*args, **kwargs); a MemoryBudgetError of the integrand
+#      is raised as such
+#
+#   :: converged(value, error, settings, factor)
+#      Returns True for every component with error <= factor*max(abserr, relerr*|value|)
+#
+#   :: angular_integral(r, args)
+#      \varphi_{i,lm}(r) and its estimated error for all MOs
+#
+#   :: radial_integral(r0, r1, args)
+#      [1] on the shell r0 < r < r1 and its estimated error for all MOs
+#
+#   :: cubature_unit(unit)
+#      One work unit (center, l, m); returns c_il[shell, mo], the estimated
+#      errors e_il[shell, mo], the largest error of the angular integrals
+#      per MO and the counters of the unit (None without --profile)
+#
+#   :: cubature_projection(qc, centers, radii, lmax, nproc, real_sh, mo_block, max_memory, profile, settings, threads)
+#      Parameters
+#      [orbkit qc]    :: qc         :: wave function (dictionary of orbkit or
+#                                      gaussians.native_qc)
+#      [numpy array]  :: centers    :: centers[center, xyz] (a.u.)
+#      [numpy array]  :: radii      :: ascending radii (a.u.); radii[-1] is the cutoff radius
+#      [int]          :: lmax       :: highest l of the projection
+#      [int]          :: nproc      :: number of worker processes
+#      [bool]         :: real_sh    :: projection onto real harmonics
+#      [int]          :: mo_block   :: MOs per block (0 -> from max_memory or all)
+#      [float]        :: max_memory :: memory budget of all processes and threads [MB]
+#      [Profile]      :: profile    :: None or profiling.Profile -> the integrand
+#                                      counters of every unit are added
+#      [dictionary]   :: settings   :: None or tolerances of the integration (see
+#                                      Comments): 'abserr', 'relerr', 'norm',
+#                                      'max_eval', 'converge'
+#      [int]          :: threads    :: threads per process for the points of func
+#                                      (native evaluator only)
+#      Returns the cumulative all_c[center,radius,l,mo], its estimated error
+#      error[center,radius,l,mo] and the largest error of the angular
+#      integrals angular_error[center,mo]
+#
+#  Comments
+#  :: Solves the two integrals of the projection (in latex notation):
+#       [1] c_{i,l}(R_0) = \sum_m  \int_0^{R_0} r^2 | \varphi_{i,lm}(r) |^2 dr
+#       [2] \varphi_{i,lm}(r) = \int Y_{lm}(\theta,\phi)* \psi_i(r,\theta,\phi) d\theta d\phi
+#     with cubature; cubature takes the functions to integrate as
+#     python functions (func, func2).
+#  :: cubature is imported on first use, so the rest of sharpo runs
+#     without it.
+#  :: Every (center,l,m) is an independent unit; the units are reduced
+#     in unit order -> same result for any number of processes.
+#  :: settings (--abserr, --relerr, --norm, --max-eval; defaults below):
+#     cubature stops when the error of the integral meets abserr or
+#     relerr*|integral| in the chosen norm (norms, index = cubature's norm
+#     argument) or after max_eval integrand evaluations (0 -> no limit).
+#     Complex harmonics: the real and imaginary part of an MO are
+#     neighbours in the integrand, so "paired" measures |error| of
+#     \varphi_{i,lm} in the complex plane. It only applies to this
+#     angular integrand: real harmonics have no pairs (rejected by api
+#     and arghandler) and the radial integrand |\varphi_{i,lm}|^2 has one
+#     real value per MO, so [1] uses "individual" (norm_index).
+#  :: converge (--converge): every angular integral [2] is first done on
+#     one region only (retire_eval); MOs whose error is already below
+#     retire_factor times the tolerance are retired and only the others
+#     are integrated again with the full budget, i.e. an (l,m) at a radius
+#     to which no MO contributes costs one region. The stricter factor
+#     keeps the retired values accurate enough for the radial integral,
+#     which otherwise needs more refinement. cubature cannot continue an
+#     integral, so the second pass starts again on the whole sphere; its
+#     first call has the same points as the first pass, and func returns
+#     the recorded values of the remaining MOs instead of evaluating them
+#     again (active 'record', 'replay'). The first region is evaluated
+#     once. all_c stays within abserr of the run without --converge
+#     (tests/test_adaptive.py; h2o: 8e-5 at abserr 1e-3).
+#  :: The radial integral [1] retires no MOs: a second radial pass would
+#     repeat all angular integrals of its first call (every radius of a
+#     region needs [2] for the MOs left), which costs more than the
+#     refinement saved; the retired angular integrals already make the
+#     converged MOs cheap in every call of func2.
+#  :: Threads (--threads): every call of func is split into blocks of
+#     thread_block points, which are evaluated by a thread pool of the
+#     process (parallel.map_threads). The work is in numpy (exp, products,
+#     BLAS dot of the native evaluator), which releases the GIL only for
+#     arrays of more than a few hundred elements; every numpy call of a
+#     block runs on thread_block points. Every block fills its own rows
+#     of the output and cubature does the sums. The block size does not
+#     follow len(theta)/threads: BLAS gives bitwise different values for
+#     other splits of the points, so a fixed size keeps the result the
+#     same for any number of threads. Calls with fewer than thread_block
+#     points (half of all points at relerr 1e-5, h2o) stay on one thread.
+#     Larger blocks also save the per-call overhead (h2o, one thread:
+#     88 s with 256 points, 50 s with 2048). With a tight --max-memory
+#     the blocks are halved until they fit the budget of a thread
+#     (point_block); then the block size, and the last digits of the
+#     result, depend on the number of threads. orbkit keeps the grid in
+#     module variables and is not thread-safe -> one thread with the
+#     orbkit evaluator.
+#  :: --max-memory: out, the coordinates of one call of func and the
+#     output of func2 are taken from the budget of the process, the rest
+#     is shared by the threads for the Ylm values, the evaluator and the
+#     MO blocks (projection.mo_block_size). The regions kept by the
+#     cubature library itself are not counted. cubature turns exceptions
+#     of the integrand into a SystemError; func keeps its
+#     MemoryBudgetError in active and integrate raises it again.
+#  :: Errors: error is the estimate of cubature for [1], summed over m and
+#     the radial shells; angular_error is the largest estimate for [2]
+#     over all radii and (l,m). Both are reported per MO.
+#
+#  Last edited
+#  17.10.2026 :: retire_factor documented and tested
+#  17.10.2026 :: MO blocks of whole chunks (gaussians.mo_chunk)
+#  17.10.2026 :: MemoryBudgetError of the integrand through cubature
+#  17.10.2026 :: blocks of 2048 points for the threads
+#  17.10.2026 :: paired norm only for the complex angular integrand;
+#                --converge reuses the first call of the first pass
+#  17.10.2026 :: buffers of func and func2 within --max-memory
+#  17.10.2026 :: point blocks of func on a thread pool
+#  17.10.2026 :: tolerances, norm, evaluation limit and convergence mode
+#                as settings; estimated errors per MO
+#  17.10.2026 :: integrand counters (--profile)
+#  17.10.2026 :: moved out of the sharpo script
+#
+# ===========================================================
+
+import numpy
+import time
+
+from . import sh
+from . import projection
+from . import parallel
+from . import profiling
+
+abserr = 1e-3                            #: default of --abserr: |error| < abserr requested (If zero, it will be ignored.)
+relerr = 1e-3                            #: default of --relerr: |error| < relerr*|integral| requested (If zero, it will be ignored.)
+norms = ["individual", "paired", "l2", "l1", "linf"]   #: --norm; the index is cubature's norm argument
+thread_block = 2048                      #: points per block of func (--threads); fixed -> same result for any number of threads
+retire_eval = 1                          #: --converge: evaluations of the first pass of [2] (1 -> the first region only)
+retire_factor = 0.1                      #: --converge: MOs with error <= retire_factor*tolerance after the first pass are retired
+vectorized = True                        #: If True, uses a vector of points in cubature, instead of a single point calculation. (Much faster!)
+calc_mo = True                           #: If True, lets Orbkit calculate the individual orbitals
+
+counters = {}                            #: --profile: counters of the current work unit
+active = {}                              #: current unit: 'angular_qc' (MOs of the running angular integral), 'angular_error', 'budget_error',
+                                         #  'radial_points' (points of the running call of func2), 'record' / 'first_call'
+                                         #  / 'replay' (--converge: the first call of [2] and the values kept for the next pass)
+
+
+#--------------------------------------------
+# Default settings of the integration
+#--------------------------------------------
+def default_settings():
+  return {'abserr': abserr, 'relerr': relerr, 'norm': "individual", 'max_eval': 0, 'converge': False}
+
+
+#-----------------------------------------------------------
+# function [2], angular part, to integrate (see above)
+#-----------------------------------------------------------
+def func(x_array,*args):
+
+  # numpy array: x_array                    :: shape(nr_grid_points,2); column 0 = theta; column 1 = phi
+  # boolean:     args[0] = vectorized       :: if true -> cubature uses vector algorithm
+  # boolean:     args[1] = calc_mo          :: if true -> Orbkit calculates indiv. Orbitals
+  # float:       args[2] = r[ir]            :: contains the r-grid point
+  # int:         args[3] = l                :: contains l-quantum number
+  # int:         args[4] = m                :: contains m-quantum number
+  # float:       args[5] = center_shift[x]  :: contains center_shift -> x
+  # float:       args[6] = center_shift[y]  :: contains center_shift -> x
+  # float:       args[7] = center_shift[z]  :: contains center_shift -> x
+  # int:         args[8] = numproc          :: number of processors used by orbkit to create grid
+  data = parallel.worker_data
+
+  #------------------------------
+  # Initializing integration grid
+  #---
+  r     = args[2]                                       #: r as parameter
+  theta = numpy.array(x_array[:,0], copy=True)          #: integration over theta [xarray column 0]
+  phi   = numpy.array(x_array[:,1], copy=True)          #: integration over phi   [xarray column 1]
+
+  #-------------------------------------------
+  # Grid in cartesian coords
+  #---
+  x = r * numpy.sin(theta) * numpy.cos(phi) + args[5]
+  y = r * numpy.sin(theta) * numpy.sin(phi) + args[6]
+  z = r * numpy.cos(theta) + args[7]
+
+  #----------------------------------------------------
+  # --converge: the first call of the second pass has
+  # the points of the first pass -> recorded values
+  #---
+  replay = active.get('replay')
+  if replay is not None and numpy.array_equal(replay[0], x_array):
+    active['replay'] = None
+    if parallel.worker_data.get('profile'):
+      counters['func_calls'] += 1
+    return replay[1]
+
+  #----------------------------------------------------
+  # Output buffer, allocated once:
+  #   out[point, mo] (real, imag: out[point, 2*mo], out[point, 2*mo+1])
+  # The points are split into blocks of thread_block,
+  # which are filled by the threads of the process
+  #---
+  qc_eval = active['angular_qc']                        #: MOs still active in this integral
+  n_mo    = projection.n_functions(qc_eval)
+  profile = data.get('profile')
+  if profile:
+    counters['func_calls']  += 1
+    counters['func_points'] += len(theta)
+  if data['real_sh']:
+    out = numpy.empty((len(theta), n_mo))
+  else:
+    out = numpy.empty((len(theta), 2*n_mo))
+
+  #----------------------------------------------------
+  # Memory of every thread: the budget of the process
+  # without out, the coordinates and the buffers of
+  # the radial integrand (fdim values per radius)
+  #---
+  memory = 0.
+  if data['max_memory'] > 0.:
+    call_bytes = out.nbytes + 8.*len(theta)*7 + 8.*data['fdim']*active.get('radial_points', 0)
+    memory = (data['max_memory'] - call_bytes/projection.megabyte)/data['threads']
+    if memory <= 0.:
+      active['budget_error'] = projection.MemoryBudgetError("--max-memory is too small: the buffers of one call of "
+                                                            "the integrand (%i points) need %.3f MB per process"
+                                                            % (len(theta), call_bytes/projection.megabyte))
+      raise active['budget_error']
+
+  tasks = [(p0, p1, theta, phi, x, y, z, out, memory, args)
+           for p0, p1 in parallel.point_blocks(len(theta), point_block(qc_eval, memory))]
+  try:
+    times = parallel.map_threads(func_block, tasks, data['threads'])
+  except projection.MemoryBudgetError as error:
+    active['budget_error'] = error
+    raise
+  if profile:
+    counters['t_ylm']      += sum(t[0] for t in times)
+    counters['t_evaluate'] += sum(t[1] for t in times)
+  if active.get('record'):
+    active['record'] = False
+    active['first_call'] = (numpy.array(x_array, copy=True), out)
+
+  if out.shape[1] == 1:
+    return out[:,0]                                        # cubature expects shape (npt,) for fdim = 1
+  return out                                               # Orbkit saves orbital function values opposite to
+                                                           #             Cubature (func,npt) --> (npt,func)
+
+
+#-----------------------------------------------------------
+# Points per block: thread_block, or fewer if
+# the smallest block of MOs does not fit into
+# memory
+#-----------------------------------------------------------
+def point_block(qc_eval, memory):
+  block = thread_block
+  n_min = projection.smallest_block(projection.n_functions(qc_eval))
+  while memory > 0. and block > 1 and (24.*block + projection.evaluator_bytes(qc_eval, block)
+                                       + projection.bytes_per_value*block*n_min) > memory*projection.megabyte:
+    block //= 2
+  return block
+
+
+#-----------------------------------------------------------
+# [2] on the points p0 <= p < p1 of one call of func;
+# runs in a thread and fills out[p0:p1]
+#-----------------------------------------------------------
+def func_block(task):
+  p0, p1, theta, phi, x, y, z, out, memory, args = task
+  data    = parallel.worker_data
+  qc_eval = active['angular_qc']
+  center  = numpy.array([args[5], args[6], args[7]])
+  theta   = theta[p0:p1]
+  phi     = phi[p0:p1]
+  sin_t   = numpy.sin(theta)
+  n_mo    = projection.n_functions(qc_eval)
+  fixed   = 24.*(p1-p0) + projection.evaluator_bytes(qc_eval, p1-p0)   #: Ylm, sin, evaluator
+  n_block = projection.mo_block_size(n_mo, p1-p0, data['mo_block'], memory, fixed)
+
+  #----------------------------------------------------
+  # Function [2] for a block of MOs at a time: real
+  # harmonics give real values; complex ones are split
+  # into real and imaginary parts, which are integrated
+  # separately.
+  #---
+  t0 = time.time()
+  if data['real_sh']:
+    ylm = sh.rsh(args[3],args[4],theta,phi)
+  else:
+    ylm = sh.sh(args[3],args[4],theta,phi)
+  t_ylm = time.time() - t0
+
+  t_evaluate = 0.
+  for i0 in range(0, n_mo, n_block):
+    i1 = min(i0+n_block, n_mo)
+    if n_block >= n_mo:
+      qc_block = qc_eval
+    else:
+      qc_block = projection.mo_subset(qc_eval, i0, i1)
+
+    #--------------------
+    # MOs from orbkit or sharpo's own evaluator
+    #---
+    t0 = time.time()
+    orb = projection.evaluate_mos(qc_block, x[p0:p1], y[p0:p1], z[p0:p1], args[8], center, data['cutoff_r'])
+    t_evaluate += time.time() - t0
+
+    if data['real_sh']:
+      out[p0:p1, i0:i1] = (ylm * orb * sin_t).transpose()
+    else:
+      out[p0:p1, 2*i0:2*i1:2]   = (numpy.real(ylm) * orb * sin_t).transpose()
+      out[p0:p1, 2*i0+1:2*i1:2] = (numpy.imag(ylm) * orb * sin_t).transpose()
+  return t_ylm, t_evaluate
+
+
+#-------------------------------------------------------------
+# function [1], radial part, to integrate (see above)
+#-------------------------------------------------------------
+def func2(x_array, *args):
+  r = numpy.array(x_array[:,0], copy=True)                 #: x_array stores the grid of the integration variable; x_array[:,0] = first variable, x_array[:,1] = second variable ...
+
+  profile = parallel.worker_data.get('profile')
+  if profile:
+    counters['func2_calls']  += 1
+    counters['func2_points'] += len(r)
+
+  #---------------------------------------
+  # Calculate the integral over theta, phi
+  #                   for all entries in r
+  #---
+  out = numpy.empty((len(r), parallel.worker_data['fdim']))
+  active['radial_points'] = len(r)                         #: out is part of the memory of func
+  for ir in range(0,len(r)):
+    philm, philm_error = angular_integral(r[ir], args)
+
+    #---------------------------------
+    # Absolute square of phi times r^2
+    #---
+    out[ir] = numpy.real(numpy.conj(philm)*philm)
+  out *= (r**2.)[:,None]
+  if out.shape[1] == 1:
+    return out[:,0]                                        # cubature expects shape (npt,) for fdim = 1
+  return out
+
+
+#--------------------------------------------
+# cubature; keeps the MemoryBudgetError of
+# the integrand (cubature raises SystemError)
+#--------------------------------------------
+def integrate(*args, **kwargs):
+  from cubature import cubature
+  active['budget_error'] = None
+  try:
+    return cubature(*args, **kwargs)
+  except Exception:
+    if active.get('budget_error') is not None:
+      raise active['budget_error']
+    raise
+
+
+#--------------------------------------------
+# cubature's norm argument; "paired" needs
+# (re, im) pairs in the integrand
+#--------------------------------------------
+def norm_index(settings, pairs):
+  if settings['norm'] == "paired" and not pairs:
+    return norms.index("individual")
+  return norms.index(settings['norm'])
+
+
+#--------------------------------------------
+# error <= factor*max(abserr, relerr*|value|)
+#--------------------------------------------
+def converged(value, error, settings, factor=1.):
+  return error <= factor*numpy.maximum(settings['abserr'], settings['relerr']*numpy.abs(value))
+
+
+#--------------------------------------------
+# [2] for all MOs at radius r
+#--------------------------------------------
+def angular_integral(r, args):
+  data = parallel.worker_data
+  settings = data['settings']
+  profile = data.get('profile')
+  ndim = 2                                                 #: Specifies the number of dimensions being integrated
+  xmin = numpy.array([ 0., 0.],dtype=float)                #: Specifies the minimum integration limit for each variable
+  xmax = numpy.array([numpy.pi, 2.*numpy.pi],dtype=float)  #: Specifies the maximum integration limit for each variable
+
+  qc = data['qc']
+  n_mo = data['fdim']
+  if data['real_sh']:
+    philm = numpy.zeros(n_mo)
+  else:
+    philm = numpy.zeros(n_mo, dtype=complex)
+  error = numpy.zeros(n_mo)
+  todo = numpy.arange(n_mo)                                #: MOs not yet retired
+  passes = [settings['max_eval']]                          #: evaluation limit of every pass
+  if settings['converge'] and not (0 < settings['max_eval'] <= retire_eval):
+    passes = [retire_eval, settings['max_eval']]
+  for k in range(0, len(passes)):
+    active['angular_qc'] = qc if len(todo) == n_mo else projection.mo_select(qc, todo)
+    fdim = len(todo) if data['real_sh'] else 2*len(todo)
+    if profile:
+      calls = counters['func_calls']
+    active['record'] = k < len(passes)-1                     #: first pass of --converge: keep its first call
+    value, value_error = integrate(func, ndim, fdim, xmin, xmax,
+                                   args=(vectorized,calc_mo, r,
+                                         args[2], args[3], args[4], args[5], args[6], args[7]),
+                                   adaptive='h', abserr=settings['abserr'], relerr=settings['relerr'],
+                                   norm=norm_index(settings, not data['real_sh']), maxEval=passes[k],
+                                   vectorized=vectorized)
+    active['record'], active['replay'] = False, None
+    if profile:
+      counters['angular_integrals'] += 1
+      counters['max_depth_angular'] = max(counters['max_depth_angular'], counters['func_calls'] - calls - 1)
+    if data['real_sh']:
+      philm[todo] = value
+      error[todo] = value_error
+    else:
+      philm[todo] = value[0::2] + 1j*value[1::2]
+      error[todo] = numpy.hypot(value_error[0::2], value_error[1::2])
+
+    #---------------------------
+    # --converge: retire the MOs which
+    # are well below the tolerance
+    # ---
+    if k < len(passes)-1:
+      keep = ~converged(philm[todo], error[todo], settings, retire_factor)
+      todo = todo[keep]
+      if profile:
+        counters['retired'] += n_mo - len(todo)
+        counters['retired_lm'] += int(len(todo) == 0)
+      points, out = active.pop('first_call')
+      if len(todo) == 0:
+        break
+      columns = numpy.flatnonzero(keep)
+      if not data['real_sh']:
+        columns = numpy.column_stack([2*columns, 2*columns+1]).ravel()
+      active['replay'] = (points, out[:, columns] if len(columns) > 1 else out[:, columns[0]])
+  active['angular_error'] = numpy.maximum(active['angular_error'], error)
+  return philm, error
+
+
+#--------------------------------------------
+# [1] on r0 < r < r1 for all MOs
+#--------------------------------------------
+def radial_integral(r0, r1, args):
+  data = parallel.worker_data
+  settings = data['settings']
+  profile = data.get('profile')
+  ndim = 1                                                 #: Specifies the number of dimensions being integrated
+  fdim = data['fdim']                                      #: Specifies the length of the output vector of func2
+  if profile:
+    calls = counters['func2_calls']
+  c_il, e_il = integrate(func2, ndim, fdim, numpy.array([r0]), numpy.array([r1]),
+                         args=args,
+                         adaptive='h', abserr=settings['abserr'], relerr=settings['relerr'],
+                         norm=norm_index(settings, False), maxEval=settings['max_eval'], vectorized=vectorized)
+  if profile:
+    counters['max_depth_radial'] = max(counters['max_depth_radial'], counters['func2_calls'] - calls - 1)
+  return c_il, e_il
+
+
+#------------------------------------------------------------
+# One work unit of the adaptive projection: one (l,m) for
+# one center; orbkit itself runs serially inside the workers.
+# The radial integral is split into the shells between the
+# radii (one shell [0, cutoff_r] without --radii)
+#------------------------------------------------------------
+def cubature_unit(unit):
+  ic, l, m = unit
+  data    = parallel.worker_data
+  radii   = data['radii']
+  centers = data['centers']
+  fdim    = data['fdim']
+  profile = data.get('profile')
+  if profile:
+    counters.clear()
+    counters.update((name, 0) for name in profiling.counter_names)
+    wall0, cpu0 = time.time(), profiling.cpu_time(False)
+  edges = numpy.append(0., radii)
+  active['angular_error'] = numpy.zeros(fdim)
+  c_il = numpy.zeros((len(radii), fdim))                        #: c_il[shell, mo]
+  e_il = numpy.zeros((len(radii), fdim))                        #: e_il[shell, mo]
+  for k in range(0,len(radii)):
+    c_il[k], e_il[k] = radial_integral(edges[k], edges[k+1],
+                                       (vectorized,calc_mo,l,m,
+                                        centers[ic,0],centers[ic,1],centers[ic,2],
+                                        1))
+  if not profile:
+    return c_il, e_il, active['angular_error'], None
+  counters['wall'] = time.time() - wall0
+  counters['cpu'] = profiling.cpu_time(False) - cpu0
+  stats = dict(counters)
+  stats.update({'center': ic, 'l': l, 'm': m})
+  return c_il, e_il, active['angular_error'], stats
+
+
+#------------------------------------------------------------
+# All centers, radii and (l,m), distributed over nproc workers
+#------------------------------------------------------------
+def cubature_projection(qc, centers, radii, lmax, nproc, real_sh=False, mo_block=0, max_memory=0.,
+                        profile=None, settings=None, threads=1):
+  if settings is None:
+    settings = default_settings()
+  if not (isinstance(qc, dict) and qc.get('native')):
+    threads = 1                                                     #: orbkit keeps the grid in module variables
+  fdim = projection.n_functions(qc)
+  units = [(ic, l, m) for ic in range(0,len(centers))
+                      for l in range(0,lmax+1)
+                      for m in range(-l,l+1)]
+  c_units = parallel.run(cubature_unit, units, nproc,
+                         {'qc': qc, 'centers': centers, 'radii': radii, 'cutoff_r': radii[-1],
+                          'fdim': fdim, 'real_sh': real_sh, 'mo_block': mo_block,
+                          'max_memory': max_memory/float(max(nproc, 1)),
+                          'profile': profile is not None, 'settings': settings,
+                          'threads': max(threads, 1)})
+  if profile is not None:
+    profile.add_units([result[3] for result in c_units])
+
+  all_c = numpy.zeros((len(centers), len(radii), lmax+1, fdim))     #: all_c[center,radius,l,mo]
+  error = numpy.zeros((len(centers), len(radii), lmax+1, fdim))     #: error[center,radius,l,mo]
+  angular_error = numpy.zeros((len(centers), fdim))                 #: angular_error[center,mo]
+  for i in range(0,len(units)):
+    all_c[units[i][0], :, units[i][1], :] += c_units[i][0]
+    error[units[i][0], :, units[i][1], :] += c_units[i][1]
+    angular_error[units[i][0]] = numpy.maximum(angular_error[units[i][0]], c_units[i][2])
+  return numpy.cumsum(all_c, axis=1), numpy.cumsum(error, axis=1), angular_error   #: shells -> cumulative
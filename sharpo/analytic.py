@@ -0,0 +1,335 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   analytic.py :: projection of Gaussian basis functions onto
+#                  spherical harmonics without angular quadrature
+#                  (expansion in modified spherical Bessel functions)
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: scaled_bessel(lam_max, z)
+#      Returns exp(-z) i_lam(z) for lam = 0..lam_max, shape (lam_max+1, len(z))
+#
+#   :: legendre_all(lam_max, x)
+#      Returns (2 lam + 1) P_lam(x) for lam = 0..lam_max
+#
+#   :: coupling(poly, d, agrid, lam_max)
+#      Angular integrals T[k, lam, lm] of one AO (see Comments)
+#
+#   :: shell_philm(shell, center, agrid, r)
+#      Returns \varphi_{mu,lm}(r) of the AOs of one shell, shape (n_ao, n_r, lm)
+#
+#   :: angular_table(lmax, l_basis, real_sh)
+#      Returns the unit vectors and the Ylm table of the angular grid of T
+#
+#   :: radial_panels(n_r, radii, shells, center)
+#      Returns r and w_panel[radius, ir] of one center
+#
+#   :: analytic_projection(wfn, centers, radii, lmax, n_r, nproc, real_sh, mo_block, max_memory)
+#      Parameters
+#      [dictionary]   :: wfn        :: from gaussians.native_qc with the MO coefficients
+#      [numpy array]  :: centers    :: centers[center, xyz] (a.u.)
+#      [numpy array]  :: radii      :: ascending radii (a.u.); radii[-1] is the cutoff radius
+#      [int]          :: lmax       :: highest l of the projection
+#      [int]          :: n_r        :: radial Gauss-Legendre points (as --grid-order NR)
+#      [int]          :: nproc      :: number of worker processes
+#      [bool]         :: real_sh    :: projection onto real harmonics
+#      [int]          :: mo_block   :: MOs per block (0 -> from max_memory or all)
+#      [float]        :: max_memory :: memory budget of all processes [MB] (0 -> unlimited)
+#      Returns the cumulative all_c[center,radius,l,mo]
+#
+#   :: radial_block_size(wfn, shells, agrid, n_r, n_radii, fixed, nproc, max_memory)
+#      Returns the radial points projected at once for one center, such
+#      that phi_ao, the unit results, the workers and one MO fit into
+#      max_memory next to fixed bytes (projection.MemoryBudgetError if not
+#      even one point fits)
+#
+#  Comments
+#  :: A primitive P(r-A) exp(-a|r-A|^2) with the polynomial P of degree
+#     lP (cartesian or solid harmonic) seen from the center C, with
+#     r = C + r n and d = A - C:
+#       exp(-a|rn-d|^2) = exp(-a(r-d)^2) \sum_lam (2lam+1) e^{-z} i_lam(z) P_lam(n.d/|d|),
+#       z = 2 a r |d|
+#     and P(rn-d) = \sum_k r^k Q_k(n) with polynomials Q_k of degree k in n.
+#     Y_lm* Q_k P_lam is a polynomial of degree l+k+lam on the unit sphere;
+#     it integrates to zero for lam > l+k, so the sum is finite and
+#       \varphi_{mu,lm}(r) = \sum_k r^k \sum_lam T[k,lam,lm] \sum_prim c exp(-a(r-d)^2) e^{-z} i_lam(z)
+#       T[k,lam,lm] = \int Y_lm* Q_k (2lam+1) P_lam dOmega
+#     T is a polynomial integral; it is exact on the Gauss product grid of
+#     degree 2(lmax+lP) and does not depend on r or the exponents. Only
+#     the radial integral [1] (see adaptive.py) is done numerically, on
+#     Gauss-Legendre panels between the radii.
+#  :: The radial integrand has sharp peaks at r = |d| for tight functions
+#     (core s of heavy atoms). The panels are split at |d| and at
+#     |d| +- peak_width/sqrt(a), tightest primitives first; all panels
+#     share the NR points and the splits beyond NR/min_panel_points are
+#     dropped (quadrature.panel_grid), so the grid has exactly NR points.
+#     Against NR = 1024 (h2o and synthetic molecules, radii 1 2 4) NR = 64
+#     is converged to ~1e-3 and NR = 128 to ~2e-6; the default fixed grid
+#     (64 31) is off by ~5e-3. The angular part is exact, whereas the
+#     fixed grid needs a degree of ~120 for 1e-5 near such functions.
+#  :: exp(-z) i_lam(z) = sqrt(pi/2z) ive(lam+1/2, z) (scipy); the factor
+#     exp(-a(r-d)^2) never overflows.
+#  :: The MOs follow from one matrix product with the AO projections (as
+#     --ao-projection); shells which cannot reach the sphere are skipped
+#     (gaussians.screen).
+#  :: Work units are blocks of shell_block shells of one center, reduced
+#     in unit order -> same result for any number of processes.
+#  :: With --max-memory, the centers are projected one after the other
+#     and, if phi_ao of all radial points does not fit, in blocks of
+#     radial points; the MOs are transformed in blocks. The radial sums
+#     of the blocks are added in order (the last digits differ from the
+#     projection without blocks).
+#
+#  Last edited
+#  17.10.2026 :: MO blocks of whole chunks (gaussians.mo_chunk)
+#  17.10.2026 :: the radial panels share the NR points
+#  17.10.2026 :: radial and MO blocks within --max-memory
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import numpy
+
+from . import projection
+from . import quadrature
+from . import parallel
+from . import gaussians
+
+shell_block = 16                                                #: shells per work unit
+peak_width = 3.                                                 #: panel edges at |d| +- peak_width/sqrt(a) of every primitive
+
+
+#--------------------------------------------
+# exp(-z) i_lam(z), lam = 0..lam_max
+#--------------------------------------------
+def scaled_bessel(lam_max, z):
+  from scipy.special import ive
+  z = numpy.asarray(z, dtype=float)
+  zero = z < 1e-300
+  zs = numpy.where(zero, 1., z)
+  lam = numpy.arange(lam_max+1)[:,None]
+  out = numpy.sqrt(0.5*numpy.pi/zs) * ive(lam+0.5, zs)
+  out[:, zero] = 0.
+  out[0, zero] = 1.                                             #: i_0(0) = 1, i_lam(0) = 0
+  return out
+
+
+#--------------------------------------------
+# (2 lam + 1) P_lam(x), lam = 0..lam_max
+#--------------------------------------------
+def legendre_all(lam_max, x):
+  p = numpy.zeros((lam_max+1, len(x)))
+  p[0] = 1.
+  if lam_max > 0:
+    p[1] = x
+  for lam in range(1, lam_max):
+    p[lam+1] = ((2*lam+1)*x*p[lam] - lam*p[lam-1])/(lam+1.)
+  return p * (2.*numpy.arange(lam_max+1)+1.)[:,None]
+
+
+#--------------------------------------------
+# T[k, lam, lm] of one AO
+#--------------------------------------------
+def coupling(poly, d, agrid, lam_max):
+  n = agrid['n']                                                #: n[xyz, point]
+  l_poly = max(sum(key) for key, c in poly)
+
+  #-------------------------------------
+  # (r n_x - d_x)^lx = \sum_j binom(lx,j) r^j n_x^j (-d_x)^(lx-j)
+  # multiplied over x, y, z -> Q[k, point]
+  #---
+  Q = numpy.zeros((l_poly+1, n.shape[1]))
+  for key, c in poly:
+    term = numpy.ones((1, n.shape[1]))
+    for axis in range(0, 3):
+      lx = key[axis]
+      factor = numpy.array([gaussians.binomial(lx, j) * (-d[axis])**(lx-j) * n[axis]**j
+                            for j in range(0, lx+1)])
+      product = numpy.zeros((term.shape[0]+lx, n.shape[1]))
+      for j in range(0, lx+1):
+        product[j:j+term.shape[0]] += factor[j]*term
+      term = product
+    Q[:term.shape[0]] += c*term
+
+  dist = numpy.linalg.norm(d)
+  cos_g = numpy.dot(d/dist, n) if dist > 0. else n[2]          #: d = 0: only lam = 0 survives
+  P = legendre_all(lam_max, cos_g)
+  dtype = agrid['ylm'].dtype                                    #: same type -> einsum needs no casting buffers
+  return numpy.einsum('kp,ap,mp->kam', Q.astype(dtype), P.astype(dtype), agrid['ylm'])
+
+
+#--------------------------------------------
+# \varphi_{mu,lm}(r) of the AOs of one shell
+#--------------------------------------------
+def shell_philm(shell, center, agrid, r):
+  d = shell['center'] - center
+  dist = numpy.linalg.norm(d)
+  lam_max = agrid['lmax'] + shell['l']
+
+  #-------------------------------------
+  # radial factors of the contraction:
+  # F[lam, r] = \sum_prim c exp(-a(r-d)^2) e^{-z} i_lam(z)
+  #---
+  F = numpy.zeros((lam_max+1, len(r)))
+  for a, c in zip(shell['exps'], shell['coeffs']):
+    F += c * numpy.exp(-a*(r-dist)**2) * scaled_bessel(lam_max, 2.*a*r*dist)
+  powers = numpy.array([r**k for k in range(0, shell['l']+1)])
+
+  philm = numpy.empty((len(shell['aos']), len(r), agrid['ylm'].shape[0]), dtype=agrid['ylm'].dtype)
+  for i in range(0, len(shell['aos'])):
+    T = coupling(shell['aos'][i][1], d, agrid, lam_max)
+    philm[i] = numpy.einsum('kr,ar,kam->rm', powers[:T.shape[0]], F, T)
+  return philm
+
+
+#--------------------------------------------
+# Angular grid of degree 2(lmax+l_basis): n
+# and conj(Ylm) times weights
+#--------------------------------------------
+def angular_table(lmax, l_basis, real_sh=False):
+  theta, phi, w_ang = quadrature.angular_grid(2*(lmax+l_basis))
+  return {'n':    numpy.array([numpy.sin(theta)*numpy.cos(phi),
+                               numpy.sin(theta)*numpy.sin(phi),
+                               numpy.cos(theta)]),
+          'ylm':  projection.ylm_table(lmax, theta, phi, w_ang, real_sh),
+          'lmax': lmax}
+
+
+#--------------------------------------------
+# Radial panels of one center, split at the
+# distances of the atoms
+#--------------------------------------------
+def radial_panels(n_r, radii, shells, center):
+  dists, edges = [], []
+  for shell in shells:
+    dist = numpy.linalg.norm(shell['center'] - center)
+    dists.append(dist)
+    edges += [(a, dist - peak_width/numpy.sqrt(a)) for a in shell['exps']]
+    edges += [(a, dist + peak_width/numpy.sqrt(a)) for a in shell['exps']]
+  edges.sort(key=lambda edge: -edge[0])                         #: tightest peaks first
+  splits = sorted(set(dists)) + [edge for a, edge in edges]
+  r, w_r, panel = quadrature.panel_grid(n_r, radii, splits)
+  w_panel = numpy.zeros((len(radii), len(r)))                   #: w_panel[radius, ir]
+  w_panel[panel, numpy.arange(len(r))] = w_r * r**2
+  return r, w_panel
+
+
+#--------------------------------------------
+# One work unit: a block of shells around
+# one center on a block of radial points
+#--------------------------------------------
+def analytic_unit(unit):
+  ic, ir0, ir1, s0, s1 = unit
+  data = parallel.worker_data
+  r = data['r'][ic][ir0:ir1]
+  return [shell_philm(shell, data['centers'][ic], data['agrid'], r) for shell in data['shells'][ic][s0:s1]]
+
+
+#--------------------------------------------
+# Radial points per block within max_memory
+#--------------------------------------------
+def radial_block_size(wfn, shells, agrid, n_r, n_radii, fixed, nproc, max_memory):
+  n_mo = wfn['coeffs'].shape[0]
+  n_lm, n_ang = agrid['ylm'].shape
+  size = agrid['ylm'].itemsize
+  n_aos = max([len(shell['aos']) for shell in shells] + [1])
+  lam_max = agrid['lmax'] + max([shell['l'] for shell in shells] + [0])
+  n_block = n_r
+  while True:
+    phi_ao = float(wfn['n_ao']*n_block*n_lm*size)
+    parent = (fixed + 2.*phi_ao + 8.*n_radii*n_mo*n_lm             #: unit results, phi_ao, c_lm
+              + n_block*n_lm*(3.*size + 8.) + 16.*n_radii*n_lm)    #  and the transformation of one MO
+    worker = (agrid['ylm'].nbytes + agrid['n'].nbytes + 8.*n_ang*(lam_max+8)   #: Ylm table, n, P and Q of T
+              + shell_block*n_aos*n_block*n_lm*size + 8.*n_block*(4*(lam_max+1) + 2*n_lm))
+                                                                    #: philm, F, Bessel functions, powers
+    needed = max(parent + max(nproc, 1)*worker, 3.*agrid['ylm'].nbytes)   #: 3 tables while the table is made
+    if needed <= max_memory*projection.megabyte:
+      return n_block
+    if n_block == 1:
+      raise projection.MemoryBudgetError("--max-memory %.3f MB is too small: one radial point with one MO needs %.3f MB"
+                                         % (max_memory, needed/projection.megabyte))
+    n_block = (n_block + 1)//2
+
+
+#--------------------------------------------
+# All centers and radii, distributed over
+# nproc workers
+#--------------------------------------------
+def analytic_projection(wfn, centers, radii, lmax, n_r, nproc, real_sh=False, mo_block=0, max_memory=0.):
+  basis = wfn['basis']
+  radii = numpy.array(radii, dtype=float)
+  agrid = angular_table(lmax, max(shell['l'] for shell in basis), real_sh)
+  shells = [gaussians.screen(basis, center, radii[-1]) for center in centers]
+  grids = [radial_panels(n_r, radii, shells[ic], centers[ic]) for ic in range(0, len(centers))]
+
+  coeffs = wfn['coeffs']
+  n_mo = coeffs.shape[0]
+  n_lm = agrid['ylm'].shape[0]
+  size = agrid['ylm'].itemsize
+  all_c = numpy.zeros((len(centers), len(radii), lmax+1, n_mo))
+
+  #-------------------------------------
+  # batches of (center, ir0, ir1): all at
+  # once, or within max_memory one radial
+  # block of one center after the other
+  #---
+  if max_memory <= 0.:
+    batches = [[(ic, 0, len(grids[ic][0])) for ic in range(0, len(centers))]]
+  else:
+    batches = []
+    for ic in range(0, len(centers)):
+      n_points = len(grids[ic][0])
+      n_block = radial_block_size(wfn, shells[ic], agrid, n_points, len(radii), all_c.nbytes, nproc, max_memory)
+      batches += [[(ic, ir0, min(ir0+n_block, n_points))] for ir0 in range(0, n_points, n_block)]
+
+  c_lm = {}
+  for batch in batches:
+    units = [(ic, ir0, ir1, s0, min(s0+shell_block, len(shells[ic])))
+             for ic, ir0, ir1 in batch for s0 in range(0, len(shells[ic]), shell_block)]
+    results = parallel.run(analytic_unit, units, nproc,
+                           {'shells': shells, 'centers': centers, 'agrid': agrid,
+                            'r': [r for r, w_panel in grids]})
+
+    #-------------------------------------
+    # AO projections -> MOs, block by block;
+    # deterministic reduction in unit order
+    #---
+    for ic, ir0, ir1 in batch:
+      r, w_panel = grids[ic]
+      phi_ao = numpy.zeros((wfn['n_ao'], ir1-ir0, n_lm), dtype=agrid['ylm'].dtype)
+      for i in range(0, len(units)):
+        if units[i][:3] != (ic, ir0, ir1):
+          continue
+        for shell, philm in zip(shells[ic][units[i][3]:units[i][4]], results[i]):
+          phi_ao[[i_ao for i_ao, poly in shell['aos']]] = philm
+      if ic not in c_lm:
+        c_lm[ic] = numpy.zeros((len(radii), n_mo, n_lm))
+      if mo_block > 0:
+        n_block = projection.chunked_block(mo_block, n_mo)
+      else:
+        n_block = projection.block_size(n_mo, 2.*phi_ao.nbytes + all_c.nbytes + c_lm[ic].nbytes,
+                                        (ir1-ir0)*n_lm*(3.*size + 8.) + 16.*len(radii)*n_lm, max_memory)
+      for i0 in range(0, n_mo, n_block):
+        i1 = min(i0+n_block, n_mo)
+        c_lm[ic][:, i0:i1] += projection.density_lm(projection.mo_philm(phi_ao, coeffs[i0:i1]), w_panel[:, ir0:ir1])
+      if ir1 == len(r):
+        all_c[ic] = projection.sum_over_m(numpy.cumsum(c_lm.pop(ic), axis=0), lmax)
+    del results
+  return all_c
@@ -0,0 +1,424 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   api.py :: in-process interface of sharpo; returns the
+#             projection as numpy arrays instead of text files
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: quiet_orbkit()
+#      Switches off the output and the log-file of orbkit
+#
+#   :: load(input_file, itype, reader, sidecar)
+#      Parameters
+#      [string]  :: input_file :: wave function file
+#      [string]  :: itype      :: input type [molden, gaussian.log, aomix]
+#      [string]  :: reader     :: "orbkit" or "native" (molden only)
+#      [bool]    :: sidecar    :: native reader: use the binary sidecar INPUT.npz
+#      Returns the wave function qc (orbkit qc or molden.MoldenQC)
+#
+#   :: energy_window(qc, e_range, efermi_shift, sigma)
+#      Parameters
+#      [orbkit qc]   :: qc           :: wave function
+#      [list]        :: e_range      :: None or (Emin, Emax) [eV] relative to E_Fermi;
+#                                       None or (0, 0) -> all MOs
+#      [bool]        :: efermi_shift :: true -> E_Fermi = E_HOMO, else 0
+#      [float]       :: sigma        :: smearing factor (widens the full range)
+#      Returns a dictionary with 'selected_MO' (1-based), 'E_Fermi', 'emin',
+#      'emax' [eV] and 'energy_range_is_set'
+#
+#   :: select_window(mo_arrays, e_range, efermi_shift, sigma)
+#      energy_window of the MO energies, occupations and syms mo_arrays
+#      (molden.mo_arrays); used for the cache without reading the input
+#
+#   :: expansion_centers(qc, center, centers)
+#      Returns centers[center, xyz] (a.u.) from center and centers (see project)
+#
+#   :: project(qc, center, radius, lmax, ...)
+#      Parameters (lengths in a.u.)
+#      [orbkit qc]   :: qc            :: wave function, e.g. from load; is not changed
+#                                        and can be used for any number of calls;
+#                                        None -> the projection is taken from the
+#                                        cache only (input_file and cache_dir needed)
+#      [list]        :: center        :: center of the expansion
+#      [float]       :: radius        :: integration radius
+#      [int]         :: lmax          :: highest l of the projection
+#      [list]        :: centers       :: None, centers[center, xyz] or arghandler.all_atoms;
+#                                        overrides center
+#      [list]        :: radii         :: None or ascending radii; overrides radius
+#      [list]        :: e_range, efermi_shift, sigma :: see energy_window
+#      [float]       :: points_per_ev :: grid points per eV of the smeared arrays
+#      [string]      :: quadrature    :: "cubature", "gauss" or "analytic"
+#      [list]        :: grid_order    :: gauss: radial points, angular degree;
+#                                        analytic: radial points
+#      [bool]        :: ao_projection :: gauss only: AOs projected once (kept in the
+#                                        cache per center, see cache_dir)
+#      [bool]        :: real_sh       :: projection onto real harmonics
+#      [string]      :: evaluator     :: "orbkit" or "native" (not used by "analytic")
+#      [int]         :: numproc       :: number of worker processes
+#      [int]         :: threads       :: cubature with the native evaluator: threads
+#                                        per process for the points of the integrand
+#      [int]         :: mo_block      :: MOs evaluated at once (0 -> all)
+#      [float]       :: max_memory    :: peak memory of the buffers of all processes [MB]
+#                                        (0 -> unlimited); projection.MemoryBudgetError
+#                                        if one block does not fit
+#      [float]       :: abserr, relerr :: cubature only: requested absolute and relative
+#                                        error of every integral (None -> adaptive.abserr,
+#                                        adaptive.relerr)
+#      [string]      :: norm          :: cubature only: error norm of the MOs of one
+#                                        integral, one of adaptive.norms ("paired"
+#                                        needs complex harmonics)
+#      [int]         :: max_eval      :: cubature only: integrand evaluations per
+#                                        integral (0 -> unlimited)
+#      [bool]        :: converge      :: cubature only: MOs which converge early are
+#                                        retired from the integrals
+#      [string]      :: input_file    :: file qc was read from; with cache_dir
+#      [string]      :: cache_dir     :: the projection cache is used (None -> not used)
+#      [string]      :: reader        :: reader of input_file, part of the cache key;
+#                                        only used without qc (else taken from qc)
+#      [float]       :: cache_size    :: size limit of the cache [MB]
+#      [Profile]     :: profile       :: None or profiling.Profile; stage times and
+#                                        integrand counters are added
+#      Returns a dictionary with the entries
+#        'all_c'          [center, radius, l, mo] cumulative coefficients
+#        'centers'        [center, xyz], 'radii' [radius], 'lmax'
+#        'selected_MO'    1-based numbers of the projected MOs
+#        'energies'       [mo] MO energies [a.u.], 'syms' [mo] symmetry labels
+#        'mo_energies', 'mo_occupations', 'mo_syms'  the same of all MOs of the file
+#        'spin_polarized', 'E_Fermi', 'emin', 'emax' [eV]
+#        'x'              [x] energy grid [eV] minus E_Fermi
+#        'smeared'        [channel, x, center, l] Gaussian smeared all_c at the
+#                         largest radius (channels: 1, or alpha and beta)
+#        'from_cache'     true if all_c was taken from the cache
+#        'error'          cubature only [center, radius, l, mo]: estimated error of
+#                         all_c (None for the other quadratures)
+#        'angular_error'  cubature only [center, mo]: largest estimated error of
+#                         the angular integrals \varphi_{i,lm}(r) (or None)
+#      Without qc, None is returned if the projection is not in the cache
+#      or there are no MOs in the energy window.
+#
+#   :: coefficients(qc, e_range, efermi_shift, sigma, points_per_ev)
+#      Returns a dictionary with 'coeff' [mo, atom, l] (\sum |MO coefficients|,
+#      l = s,...,i), 'selected_MO', 'energies', 'E_Fermi', 'x' and
+#      'smeared' [channel, x, atom, l]; same data as the files of --coeff
+#
+#  Comments
+#  :: The command-line program (cli.py) reads the input with load and
+#     writes the arrays of project to the output files.
+#  :: orbkit, cubature and scipy are only imported when they are used.
+#
+#  Last edited
+#  17.10.2026 :: itype passed to orbkit's main_read by keyword (orbkit 1.x)
+#  17.10.2026 :: estimated errors from the cache
+#  17.10.2026 :: paired norm only with complex harmonics
+#  17.10.2026 :: --max-memory for all quadratures
+#  17.10.2026 :: AO projections in the cache
+#  17.10.2026 :: cache lookup without qc; reader in the cache key
+#  17.10.2026 :: threads
+#  17.10.2026 :: tolerances of the cubature and estimated errors
+#  17.10.2026 :: analytic quadrature
+#  17.10.2026 :: profile
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import numpy
+
+from . import arghandler
+from . import molden
+
+ev = 27.21138602
+
+#--------------------------------------
+# Parameters for orbkit initialization
+#--------------------------------------
+def quiet_orbkit():
+  from orbkit import options
+  options.quiet = True                                          #: No output by orbkit
+  options.no_log = True                                         #: no log-file will be made
+
+
+#--------------------------------------------
+# Reads the wave function
+#--------------------------------------------
+def load(input_file, itype="molden", reader="orbkit", sidecar=True):
+  if reader == "native":
+    if itype != "molden":
+      raise ValueError("the native reader reads molden files only")
+    return molden.MoldenQC(input_file, sidecar)                 #: MO coefficients are read on first use
+  from orbkit import read
+  quiet_orbkit()
+  return read.main_read(input_file, itype=itype, all_mo=True)
+
+
+#--------------------------------------------
+# MOs in the energy window and E_Fermi
+#--------------------------------------------
+def energy_window(qc, e_range=None, efermi_shift=True, sigma=0.1):
+  return select_window(molden.mo_arrays(qc), e_range, efermi_shift, sigma)
+
+
+def select_window(mo_arrays, e_range=None, efermi_shift=True, sigma=0.1):
+  mo_energies, mo_occupations, mo_syms = mo_arrays              #: energies in a.u.
+  if e_range is None:
+    e_range = (0., 0.)
+  emin, emax = min(e_range), max(e_range)
+  energy_range_is_set = not (abs(emin) < 0.001 and abs(emax) < 0.001)
+
+  #---------------------------------------
+  # E_HOMO (~E_Fermi) for comparison with
+  # solid state values
+  #---
+  if efermi_shift:
+    occupied = mo_occupations > 0.0001
+    E_Fermi = mo_energies.min()                                 #: init E_Fermi with lowest energy
+    if occupied.any():
+      E_Fermi = max(E_Fermi, mo_energies[occupied].max())       #: highest occupied MO
+    E_Fermi = E_Fermi*ev
+  else:
+    E_Fermi = 0.0
+
+  emin += E_Fermi
+  emax += E_Fermi
+  if not energy_range_is_set:                                   #: The full energy range is taken
+    emin = mo_energies.min()*ev - 2.*sigma*ev
+    emax = mo_energies.max()*ev + 2.*sigma*ev
+
+  in_range = (mo_energies >= emin/ev-0.001) & (mo_energies <= emax/ev+0.001)
+  return {'selected_MO': [int(i)+1 for i in numpy.flatnonzero(in_range)],
+          'E_Fermi': E_Fermi, 'emin': emin, 'emax': emax,
+          'energy_range_is_set': energy_range_is_set}
+
+
+#--------------------------------------------
+# Centers of the expansion
+#--------------------------------------------
+def expansion_centers(qc, center, centers):
+  if centers is None:
+    return numpy.array([center], dtype=float)
+  if isinstance(centers, str) and centers == arghandler.all_atoms:
+    return numpy.array(qc.geo_spec, dtype=float)               #: orbkit keeps the geometry in a.u.
+  return numpy.array(centers, dtype=float).reshape(-1, 3)
+
+
+#--------------------------------------------
+# Projection onto spherical harmonics
+#--------------------------------------------
+def project(qc, center=(0., 0., 0.), radius=5., lmax=6, centers=None, radii=None,
+            e_range=None, efermi_shift=True, sigma=0.1, points_per_ev=50.,
+            quadrature="cubature", grid_order=(64, 31), ao_projection=False, real_sh=False,
+            evaluator="orbkit", numproc=1, mo_block=0, max_memory=0.,
+            abserr=None, relerr=None, norm="individual", max_eval=0, converge=False,
+            input_file=None, cache_dir=None, cache_size=512., profile=None, threads=1,
+            reader="orbkit"):
+  from . import projection
+  from . import adaptive
+  from . import analytic
+  from . import gaussians
+  from . import smearing
+  from . import cache
+  from . import profiling
+
+  if qc is None and (cache_dir is None or input_file is None):
+    raise ValueError("without qc, the projection is taken from the cache (input_file and cache_dir)")
+  if ao_projection and quadrature != "gauss":
+    raise ValueError("the AO projection requires the fixed grid (quadrature = 'gauss')")
+  if norm not in adaptive.norms:
+    raise ValueError("unknown error norm '%s' (%s)" % (norm, ", ".join(adaptive.norms)))
+  if norm == "paired" and real_sh:
+    raise ValueError("the paired error norm needs complex harmonics (real_sh = False)")
+  settings = adaptive.default_settings()
+  settings.update({'norm': norm, 'max_eval': max_eval, 'converge': converge})
+  if abserr is not None:
+    settings['abserr'] = abserr
+  if relerr is not None:
+    settings['relerr'] = relerr
+  if radii is None:
+    radii = numpy.array([radius], dtype=float)
+  radii = numpy.array(radii, dtype=float)
+  cutoff_r = radii[-1]                                          #: the largest radius is the cutoff radius
+
+  if qc is not None:
+    reader = "native" if isinstance(qc, molden.MoldenQC) else "orbkit"
+
+  #---------------------------
+  # Projection cache: everything which changes
+  # all_c is part of the key; sigma, points/eV,
+  # E-range and E_Fermi shift are not. The
+  # centers are the argument (all atoms are
+  # known from the file)
+  # ---
+  entry = None
+  use_cache = cache_dir is not None and input_file is not None
+  if use_cache:
+    if isinstance(centers, str) and centers == arghandler.all_atoms:
+      key_centers = centers
+    else:
+      key_centers = expansion_centers(None, center, centers)
+    cache_settings = [('radii', radii), ('centers', key_centers), ('lmax', lmax), ('real_sh', real_sh),
+                      ('quadrature', quadrature), ('evaluator', evaluator), ('reader', reader)]
+    if quadrature == "gauss":
+      cache_settings += [('n_radial', grid_order[0]), ('ang_order', grid_order[1]), ('ao_projection', ao_projection)]
+    elif quadrature == "analytic":
+      cache_settings += [('n_radial', grid_order[0])]
+    else:
+      cache_settings += [('abserr', settings['abserr']), ('relerr', settings['relerr']), ('norm', settings['norm']),
+                         ('max_eval', settings['max_eval']), ('converge', settings['converge'])]
+    with profiling.stage(profile, "projection/cache"):
+      cache_key = cache.projection_key(input_file, cache_settings)
+      entry = cache.load(cache_dir, cache_key)
+
+  if qc is not None:
+    mo_arrays = molden.mo_arrays(qc)
+    centers = expansion_centers(qc, center, centers)
+  elif entry is None:
+    return None
+  else:
+    mo_arrays = (entry['mo_energies'], entry['mo_occupations'], [str(sym) for sym in entry['mo_syms']])
+    centers = entry['centers']
+
+  window = select_window(mo_arrays, e_range, efermi_shift, sigma)
+  selected_MO = window['selected_MO']
+  if not selected_MO:
+    if qc is None:
+      return None
+    raise ValueError("there are no orbitals in the energy range %.2f to %.2f eV" % (window['emin'], window['emax']))
+  mo_energies, mo_occupations, mo_syms = mo_arrays
+  energies = numpy.array([mo_energies[i-1] for i in selected_MO])
+  syms = [mo_syms[i-1] for i in selected_MO]
+  spin_polarized = any("_b" in sym for sym in mo_syms)         #: Orbkit classifies spin down/up orbitals with _b / _a in the symmetry
+
+  all_c = None
+  error = None
+  angular_error = None
+  if entry is not None:
+    all_c = cache.select(entry, selected_MO)
+    error = cache.select(entry, selected_MO, 'error')
+    angular_error = cache.select(entry, selected_MO, 'angular_error')
+  if all_c is None and qc is None:
+    return None
+  from_cache = all_c is not None
+
+  if all_c is None:
+    if evaluator == "orbkit" and quadrature != "analytic":
+      quiet_orbkit()
+
+    #---------------------------
+    # wave function of the selected MOs
+    # for orbkit or the native evaluator
+    # ---
+    qc_select = qc.todict()
+    qc_select['mo_spec'] = [qc.mo_spec[i-1] for i in selected_MO]
+    coeffs = None
+    if quadrature == "analytic":
+      qc_eval = gaussians.native_qc(qc, qc_select['mo_spec'])   #: basis set and MO coefficients only
+    elif evaluator == "native":
+      qc_eval = gaussians.native_qc(qc, qc_select['mo_spec'])
+      if ao_projection:
+        coeffs = qc_eval['coeffs']
+    else:
+      qc_eval = qc_select
+      if ao_projection:
+        coeffs = projection.coefficient_matrix(qc_select['mo_spec'])
+
+    with profiling.stage(profile, "projection/integration"):
+      if quadrature == "gauss":
+        qgrid = projection.fixed_grid(cutoff_r, lmax, grid_order[0], grid_order[1], real_sh, radii)
+        if ao_projection and use_cache:
+          #---------------------------
+          # AO projections of every center from the
+          # cache; only the missing centers are
+          # projected, every energy window is one
+          # transformation to the MOs
+          # ---
+          ao_settings = [('phi_ao', True), ('radii', radii), ('lmax', lmax), ('real_sh', real_sh),
+                         ('n_radial', grid_order[0]), ('ang_order', grid_order[1]),
+                         ('evaluator', evaluator), ('reader', reader)]
+          ao_keys = [cache.projection_key(input_file, ao_settings + [('center', c)]) for c in centers]
+          missing = [ic for ic in range(0, len(centers)) if not cache.has_entry(cache_dir, ao_keys[ic])]
+          projected = projection.ao_sweep(qc_eval, centers[missing], qgrid, numproc, max_memory)
+          all_c = []
+          for ic in range(0, len(centers)):
+            if ic in missing:
+              phi_ao = next(projected)
+            else:
+              phi_ao = cache.load_ao(cache_dir, ao_keys[ic])
+              if phi_ao is None:                                #: evicted by another run
+                phi_ao = next(projection.ao_sweep(qc_eval, centers[ic:ic+1], qgrid, numproc, max_memory))
+            if ic in missing or not cache.has_entry(cache_dir, ao_keys[ic]):
+              cache.store_ao(cache_dir, ao_keys[ic], phi_ao, int(cache_size*1024*1024))
+            all_c.append(projection.mo_sweep(phi_ao, coeffs, qgrid, max_memory))
+            del phi_ao                                          #: one center at a time
+          all_c = numpy.array(all_c)
+        else:
+          all_c = projection.scheduled_sweep(qc_eval, centers, qgrid, numproc, coeffs, mo_block, max_memory)
+        if profile is not None:
+          profile.info['grid_points'] = len(centers)*len(qgrid['r'])*len(qgrid['theta'])
+      elif quadrature == "analytic":
+        all_c = analytic.analytic_projection(qc_eval, centers, radii, lmax, grid_order[0], numproc,
+                                             real_sh, mo_block, max_memory)
+      else:
+        all_c, error, angular_error = adaptive.cubature_projection(qc_eval, centers, radii, lmax, numproc,
+                                                                   real_sh, mo_block, max_memory, profile,
+                                                                   settings, threads)
+
+    if use_cache:
+      with profiling.stage(profile, "projection/cache"):
+        cache.store(cache_dir, cache_key, all_c, selected_MO, centers, mo_arrays,
+                    spin_polarized, int(cache_size*1024*1024), error, angular_error)
+
+  #---------------------------
+  # Gaussian smearing of all centers
+  # at the largest radius
+  # ---
+  with profiling.stage(profile, "projection/smearing"):
+    x = smearing.energy_grid(window['emin'], window['emax'], points_per_ev)
+    channels, n_channels = smearing.spin_channels(syms, spin_polarized)
+    smeared = smearing.smear(x, energies*ev, all_c[:,-1].transpose(2, 0, 1), sigma, channels, n_channels)
+
+  return {'all_c': all_c, 'centers': centers, 'radii': radii, 'lmax': lmax,
+          'selected_MO': selected_MO, 'energies': energies, 'syms': syms,
+          'mo_energies': mo_energies, 'mo_occupations': mo_occupations, 'mo_syms': mo_syms,
+          'spin_polarized': spin_polarized, 'E_Fermi': window['E_Fermi'],
+          'emin': window['emin'], 'emax': window['emax'],
+          'x': x - window['E_Fermi'], 'smeared': smeared, 'from_cache': from_cache,
+          'error': error, 'angular_error': angular_error}
+
+
+#--------------------------------------------
+# |MO coefficients| per atom and l
+#--------------------------------------------
+def coefficients(qc, e_range=None, efermi_shift=True, sigma=0.1, points_per_ev=50.):
+  from . import mo_coefficients
+  from . import smearing
+
+  window = energy_window(qc, e_range, efermi_shift, sigma)
+  selected_MO = window['selected_MO']
+  mo_energies, mo_occupations, mo_syms = molden.mo_arrays(qc)
+  energies = numpy.array([mo_energies[i-1] for i in selected_MO])
+  syms = [mo_syms[i-1] for i in selected_MO]
+  spin_polarized = any("_b" in sym for sym in mo_syms)
+
+  coeff = mo_coefficients.atom_l_weights(qc, selected_MO)       #: coeff[mo, atom, l]
+  x = smearing.energy_grid(window['emin'], window['emax'], points_per_ev)
+  channels, n_channels = smearing.spin_channels(syms, spin_polarized)
+  return {'coeff': coeff, 'selected_MO': selected_MO, 'energies': energies, 'syms': syms,
+          'spin_polarized': spin_polarized, 'E_Fermi': window['E_Fermi'],
+          'x': x - window['E_Fermi'],
+          'smeared': smearing.smear(x, energies*ev, coeff, sigma, channels, n_channels)}
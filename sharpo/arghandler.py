@@ -0,0 +1,319 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   arghandler.py :: handels the command-line arguments
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#  Last edited
+#  17.10.2026 :: added quadrature, grid order, AO projection, lmax, real SH
+#                and multi-center options; --proc sets the process pool;
+#                evaluator option; projection cache options; radius sweep;
+#                MO blocks and memory limit; trajectory mode; native reader;
+#                arguments can be passed to get_parser (argv); output format;
+#                profile; analytic quadrature; tolerances, error norm,
+#                evaluation limit and convergence mode of the cubature;
+#                threads; returns the argparse Namespace instead of a list;
+#                --reader defaults to None (not set); --norm paired is
+#                rejected with --real-sh; --grid-order NANG >= 2*lmax
+#  20.01.2017 :: added E-Fermi shift option
+#  15.09.2016 :: added #ofPoints argument
+#  13.09.2016 :: completed
+#
+# ===========================================================
+
+
+from __future__ import print_function
+import sys
+import os.path
+import argparse
+import glob
+
+prog_description = '''
+This is sharpo (Spherical HARmonics - Projected Orbitals). 
+Copyright (C) 2016 Lukas Hammerschmidt. This program comes with ABSOLUTELY
+NO WARRANTY. This is free software, and you are welcome to redistribute it
+under certain conditions. Type "-l" for more details.
+'''
+
+prog_license = '''
+sharpo
+Lukas Hammerschmidt
+
+MacDiarmid Institute for Advanced Materials and Nanotechnology,
+Department of Physics, University of Auckland, Auckland, New Zealand
+
+sharpo is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as 
+published by the Free Software Foundation, either version 3 of 
+the License, or any later version.
+
+sharpo is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public 
+License along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+input_types = [ "molden", "gaussian.log", "aomix" ]
+input_units = [ "A", "au" ]
+all_atoms = "all-atoms"
+quadrature_types = [ "cubature", "gauss", "analytic" ]
+evaluator_types = [ "orbkit", "native" ]
+reader_types = [ "orbkit", "native" ]
+output_formats = [ "text", "hdf5", "npz" ]
+error_norms = [ "individual", "paired", "l2", "l1", "linf" ]   #: = adaptive.norms
+global args
+
+#------------------------------------------------
+# Reads centers (x y z per line) from a file;
+# also takes xyz-files (element symbol first)
+#------------------------------------------------
+def read_centers(filename):
+  centers = []
+  for line in open(filename):
+    words = line.split('#')[0].split()
+    if len(words) < 3:
+      continue
+    try:
+      centers.append([float(w) for w in words[-3:]])
+    except ValueError:
+      continue
+  if not centers:
+    raise argparse.ArgumentTypeError("No center coordinates found in %s!" % filename)
+  return centers
+
+#------------------------------------------------
+# --centers: list of coordinates, file or all-atoms
+#------------------------------------------------
+def parse_centers(values):
+  if values is None:
+    return None
+  if len(values) == 1 and values[0] == all_atoms:
+    return all_atoms
+  if len(values) == 1 and os.path.isfile(values[0]):
+    return read_centers(values[0])
+  try:
+    coords = [float(v) for v in values]
+  except ValueError:
+    raise argparse.ArgumentTypeError("--centers takes x y z [x y z ...], a file or %s!" % all_atoms)
+  if len(coords) % 3 != 0:
+    raise argparse.ArgumentTypeError("--centers needs three coordinates per center!")
+  return [coords[i:i+3] for i in range(0,len(coords),3)]
+
+#------------------------------------------------
+# --radii: list of radii or Rmin:Rmax:dR
+#------------------------------------------------
+def parse_radii(values):
+  if values is None:
+    return None
+  try:
+    if len(values) == 1 and ':' in values[0]:
+      rmin, rmax, dr = [float(v) for v in values[0].split(':')]
+      if dr <= 0.:
+        raise argparse.ArgumentTypeError("--radii: the step has to be > 0!")
+      radii = [rmin + i*dr for i in range(0, int((rmax - rmin)/dr + 1e-9) + 1)]
+    else:
+      radii = [float(v) for v in values]
+  except ValueError:
+    raise argparse.ArgumentTypeError("--radii takes R1 R2 ... or Rmin:Rmax:dR!")
+  radii = sorted(set(radii))
+  if not radii or radii[0] <= 0.:
+    raise argparse.ArgumentTypeError("--radii have to be > 0!")
+  return radii
+
+#------------------------------------------------
+# --trajectory: files and glob patterns, in order
+#------------------------------------------------
+def parse_trajectory(values, input_file):
+  if values is None:
+    return None
+  files = [input_file] if input_file is not None else []
+  for value in values:
+    matches = sorted(glob.glob(value))
+    if not matches:
+      raise argparse.ArgumentTypeError("--trajectory: no file matches %s!" % value)
+    files.extend(matches)
+  return files
+
+#------------------------------------------------
+# Here command-line arguments are defined and set
+# argparse is used for that. Returns the argparse
+# Namespace; centers, radii and trajectory are
+# parsed, energy_range_is_set is added
+#------------------------------------------------
+def get_parser(i_version, prog_info, argv=None):
+  
+  parser = argparse.ArgumentParser(prog="sharpo",description=prog_description)
+
+  parser.add_argument("-l", "--license", action="store_true", help="information about the license")
+  parser.add_argument('-v', '--version', action='version', version='%(prog)s '+i_version)
+  parser.add_argument("INPUT", type=str, nargs='?', help="Provide an input name.")
+  parser.add_argument("-r", "--radius", type=float, default="5.", help="Integration cut-off radius in [units (default=[A])]. Default=5.")
+  parser.add_argument('--radii', nargs='+', type=str, default=None, metavar="R",
+                      help="Radius sweep: cumulative coefficients at every radius \"R1 R2 ...\" or \"Rmin:Rmax:dR\" in [units] from one projection. The largest radius overrides --radius")
+  parser.add_argument('--trajectory', nargs='+', type=str, default=None, metavar="FILE",
+                      help="Trajectory mode: projects INPUT (optional) and all FILEs (lists or quoted glob patterns) with one grid and writes one table <output>.frames.dat. Molden files with several [Molden Format] blocks are split into frames. Requires --quadrature gauss")
+  parser.add_argument('-c', '--center', nargs=3, type=float, default=[0., 0., 0.],
+                      metavar=("x","y","z"), help='Sets the center for the SH expansion')
+  parser.add_argument('--centers', nargs='+', type=str, default=None, metavar="CENTERS",
+                      help='Projects onto several centers in one run: "x y z x y z ...", a file with one "x y z" per line (xyz-files work, too) or "%s". Overrides --center' % all_atoms)
+  parser.add_argument('-u', '--units', type=str, choices=input_units, default='A', help="Set length units to Ang or a.u. Default=[A]")
+  parser.add_argument("-t", "--type", type=str, nargs='?', choices=input_types,
+                    help="Provide the input type: " + ", ".join(input_types), 
+                    metavar='TYPE', default="molden")
+  parser.add_argument("-o", "--output", type=str, default='porb', help='Define output file name')
+  parser.add_argument("-s", "--sigma", type=float, default="0.1", help="Sigma. Smearing factor for Gaussian smearing of projected states")
+  parser.add_argument("-np", "--npoints", type=float, default="50.", help="#ofPoints/eV for the smeared output. (Default = 50p/eV)")
+  parser.add_argument('-nef', "--no-efermi", dest='efermi_shift', action='store_false', help='Prevents Sharpo from shifting the orbital energies by E-E_HOMO (default=True).')
+  parser.add_argument("--e-range", type=float, nargs = 2, default=[0., 0.], dest='e_range', metavar=("Emin", "Emax"), help='in [eV] - Lets you determine an energy range between which MOs are considered in the expansion. If 0. 0. is chosen, the whole energy range is scanned (default). The energy scale is set such that E_HOMO = 0 (E_F = 0) except if "--no-efermi" is set. Then the absolute energy values are taken.')
+  parser.add_argument("--mo-energies-only", action = 'store_true', dest='moe_only', help='Prints a list of the MO energies and stops.')
+  group = parser.add_mutually_exclusive_group()
+  group.add_argument('--coeff', dest='print_coeff', action='store_true', help='Print MO-coefficients')
+  #parser.add_argument('--coeff', dest='print_coeff', action='store_true', help='Print MO-coefficients')
+  group.add_argument('--coeff-only', dest='print_coeff_only', action='store_true', help='Print MO-coefficients and stop program')
+  parser.add_argument("-p", "--proc", type=int, help="Number of worker processes for the projection. The result does not depend on it.",
+                      metavar="NUM", default = 1)
+  parser.add_argument("--threads", type=int, default=1, metavar="NUM",
+                      help="Cubature with the native evaluator: threads per process for the points of the angular integrand (numpy releases the GIL). The result does not depend on it. Default = 1")
+  parser.add_argument("--mo-block", type=int, default=0, dest='mo_block', metavar="N",
+                      help="Evaluates and projects N MOs at a time, rounded up to a multiple of 32 (0 = all at once or as many as fit into --max-memory). Does not change the results. Default = 0")
+  parser.add_argument("--max-memory", type=float, default=0., dest='max_memory', metavar="MB",
+                      help="Peak memory of the grids, orbital values, projections and their temporaries of all processes in MB; sets the MO, AO and radial block sizes (0 = unlimited) and how many of the -p processes run at once. sharpo stops if not even one block fits. Default = 0")
+  parser.add_argument("--lmax", type=int, default=6, help="Highest angular momentum quantum number of the projection. Default = 6")
+  parser.add_argument("-q", "--quadrature", type=str, choices=quadrature_types, default="cubature",
+                      help="Integration scheme: adaptive 'cubature' (default), a fixed Gauss-Legendre x Gauss product grid 'gauss' on which all MOs are evaluated only once, or 'analytic': angular integrals of the Gaussian basis functions in closed form (modified spherical Bessel functions; needs SciPy), only the radial integral is numerical.")
+  parser.add_argument("--abserr", type=float, default=1e-3, metavar="TOL",
+                      help="Cubature only: requested absolute error of every integral (0 = not used). Default = 1e-3")
+  parser.add_argument("--relerr", type=float, default=1e-3, metavar="TOL",
+                      help="Cubature only: requested relative error of every integral (0 = not used). Default = 1e-3")
+  parser.add_argument("--norm", type=str, choices=error_norms, default="individual",
+                      help="Cubature only: how the errors of the MOs of one integral are combined: every MO on its own ('individual', default), real and imaginary part together ('paired', angular integrals with complex harmonics only; the radial integrals use 'individual') or the 'l2', 'l1' or 'linf' norm of the vector of all MOs.")
+  parser.add_argument("--max-eval", type=int, default=0, dest='max_eval', metavar="N",
+                      help="Cubature only: at most N integrand evaluations per integral (0 = unlimited); the error report shows what was reached. Default = 0")
+  parser.add_argument("--converge", action="store_true",
+                      help="Cubature only: every angular integral is first done on one region; MOs whose estimated error there is below 0.1 of the tolerance are retired and only the others are refined (the first region is not evaluated again). The radial integrals retire no MOs; all_c stays within --abserr of the run without --converge.")
+  parser.add_argument("--grid-order", type=int, nargs=2, default=[64, 31], dest='grid_order', metavar=("NR", "NANG"),
+                      help="Fixed grid only: NR radial Gauss-Legendre points and the polynomial degree NANG integrated exactly by the angular grid, at least 2*lmax. Analytic quadrature: NR radial points, NANG is not used. Default = 64 31")
+  parser.add_argument("--evaluator", type=str, choices=evaluator_types, default="orbkit",
+                      help="Evaluation of the orbitals: 'orbkit' (default) or sharpo's own 'native' Gaussian evaluator, which skips shells that cannot reach the integration sphere.")
+  parser.add_argument("--reader", type=str, choices=reader_types, default=None,
+                      help="Input reader: 'orbkit' or sharpo's own 'native' molden reader, which keeps the MO data in arrays, reads the coefficients only when needed and saves them to a binary sidecar INPUT.npz for the next run. Default = orbkit (native for --mo-energies-only of molden files)")
+  parser.add_argument("--no-sidecar", action="store_true", dest='no_sidecar',
+                      help="Native reader: neither reads nor writes the binary sidecar INPUT.npz.")
+  parser.add_argument("--ao-projection", action="store_true", dest='ao_projection',
+                      help="Fixed grid only: project the atomic orbitals once and obtain the MO projections from the MO coefficient matrix.")
+  parser.add_argument("--real-sh", action="store_true", dest='real_sh',
+                      help="Project onto real spherical harmonics. Gives the same coefficients with half the integrand length and no complex arithmetic.")
+  parser.add_argument("--cache-dir", type=str, default=None, dest='cache_dir', metavar="DIR",
+                      help="Directory of the projection cache. Default = ~/.cache/sharpo")
+  parser.add_argument("--cache-size", type=float, default=512., dest='cache_size', metavar="MB",
+                      help="Size limit of the projection cache in MB; least recently used projections are removed first. Default = 512")
+  parser.add_argument("--no-cache", action="store_true", dest='no_cache',
+                      help="Neither reads nor writes the projection cache.")
+  parser.add_argument("--format", type=str, choices=output_formats, default="text", dest='out_format',
+                      help="Output format: 'text' files (default) or one binary file <output>.h5 ('hdf5') or <output>.npz ('npz') with all projections, smeared projections, coefficient tables (--coeff), energies, spin labels and run metadata.")
+  parser.add_argument("--text-export", action="store_true", dest='text_export',
+                      help="Binary formats: writes the text files as well.")
+  parser.add_argument("--profile", type=str, default=None, metavar="FILE",
+                      help="Writes wall and CPU time of every stage, integrand calls and points, refinement rounds and time in the MO evaluation and in the spherical harmonics per (l,m) (cubature), and the peak memory as JSON to FILE.")
+  parser.add_argument("--info", action="store_true", 
+                      help="Prints important information about the compatibility of sharpo")
+  parser.set_defaults(print_coeff=False)
+
+  if argv is None:
+    argv = sys.argv[1:]
+  args = parser.parse_args(argv)
+
+  #----------------------
+  # license print
+  if args.license:
+    print(prog_license)
+    sys.exit(1)
+  
+  #----------------------
+  # Program info
+  if args.info:
+    print(prog_info)
+    sys.exit(1)
+
+  #----------------------
+  # No input > print help
+  if len(argv) == 0:
+    parser.print_help()
+    sys.exit(1)
+  
+  #----------------------
+  # trajectory: INPUT is the first frame
+  trajectory = parse_trajectory(args.trajectory, args.INPUT)
+  if trajectory is not None:
+    if args.quadrature != "gauss":
+      raise argparse.ArgumentTypeError("--trajectory requires the fixed grid (--quadrature gauss)!")
+    args.INPUT = trajectory[0]
+
+  #----------------------
+  # if file is not a file
+  if not os.path.isfile(args.INPUT):
+    print ("INPUT provided is not a file or doesn't exist!")
+    print
+    parser.print_help()
+    sys.exit(1)
+
+  #-------------------------------
+  # check emin, emax inputs
+  if (args.e_range[0] > args.e_range[1]):
+    tmpE = args.e_range[0]
+    args.e_range[0] = args.e_range[1]
+    args.e_range[1] = tmpE
+  if (abs(args.e_range[0] - args.e_range[1]) < 0.1 and abs(args.e_range[0]) > 0.001 and abs(args.e_range[1]) > 0.001):
+    raise argparse.ArgumentTypeError("Emin and Emax are too close to each other. Please choose larger energy range!")
+    sys.exit(1)
+  if args.lmax < 0:
+    raise argparse.ArgumentTypeError("lmax has to be >= 0!")
+  if args.threads < 1:
+    raise argparse.ArgumentTypeError("--threads has to be >= 1!")
+  if args.mo_block < 0 or args.max_memory < 0.:
+    raise argparse.ArgumentTypeError("--mo-block and --max-memory have to be >= 0!")
+  if args.norm == "paired" and args.real_sh:
+    raise argparse.ArgumentTypeError("--norm paired needs complex harmonics (not with --real-sh)!")
+  if args.reader == "native" and args.type != "molden":
+    raise argparse.ArgumentTypeError("--reader native reads molden files only!")
+  if args.abserr < 0. or args.relerr < 0. or args.max_eval < 0:
+    raise argparse.ArgumentTypeError("--abserr, --relerr and --max-eval have to be >= 0!")
+  if args.abserr == 0. and args.relerr == 0. and args.max_eval == 0:
+    raise argparse.ArgumentTypeError("--abserr = --relerr = 0 needs a limit --max-eval!")
+  if args.cache_size < 0.:
+    raise argparse.ArgumentTypeError("--cache-size has to be >= 0!")
+  if args.quadrature == "gauss" and 2*args.lmax > args.grid_order[1]:
+    raise argparse.ArgumentTypeError("--grid-order NANG has to be >= 2*lmax (%i) for the fixed grid!" % (2*args.lmax))
+  if args.ao_projection and args.quadrature != "gauss":
+    raise argparse.ArgumentTypeError("--ao-projection requires the fixed grid (--quadrature gauss)!")
+  if abs(args.e_range[0]) < 0.001 and abs(args.e_range[1]) < 0.001:
+    args.energy_range_is_set = False
+  else:
+    args.energy_range_is_set = True
+
+  #----------------------
+  # parsed values replace the strings
+  args.centers = parse_centers(args.centers)
+  args.radii = parse_radii(args.radii)
+  args.trajectory = trajectory
+  return args
+  
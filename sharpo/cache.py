@@ -0,0 +1,291 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   cache.py :: on-disk cache of the projection results, such
+#               that re-smearing and re-plotting do not solve
+#               the integrals again
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: file_hash(filename)
+#      Returns the sha1 hex digest of the contents of filename (computed
+#      once per file, size and modification time)
+#
+#   :: projection_key(input_file, settings)
+#      Parameters
+#      [string]  :: input_file :: wave function file
+#      [list]    :: settings   :: (name, value) pairs which change all_c
+#                                 (centers, radius, units, lmax, quadrature, reader, ...)
+#      Returns the cache key (hex string); the sharpo version and
+#      format_version are part of it
+#
+#   :: load(cache_dir, key)
+#      Returns the entry as dictionary: 'all_c' [center, radius, l, mo],
+#      'selected_MO' (1-based, as in sharpo), 'centers' [center, xyz],
+#      'spin_polarized', the MO energies [a.u.], occupations and
+#      symmetry labels of all MOs of the file ('mo_energies',
+#      'mo_occupations', 'mo_syms') and the estimated errors of the
+#      cubature ('error' [center, radius, l, mo], 'angular_error'
+#      [center, mo]; None for the other quadratures); None if there is
+#      no valid entry. A broken entry is removed
+#
+#   :: select(entry, selected_MO, name)
+#      Returns entry[name] (all_c, error or angular_error) of the MOs
+#      selected_MO or None if they are not (all) in the entry or there is
+#      no such array; marks the entry as used
+#
+#   :: store(cache_dir, key, all_c, selected_MO, centers, mo_arrays, spin_polarized, max_size,
+#            error, angular_error)
+#      Saves the projection (mo_arrays = molden.mo_arrays(qc)) and the
+#      estimated errors (or None) and evicts the least recently used
+#      entries until the cache is smaller than max_size bytes
+#
+#   :: has_entry(cache_dir, key)
+#      Returns true if there is an entry for key
+#
+#   :: load_ao(cache_dir, key)
+#      Returns phi_ao[ao, ir, lm] of one center or None (a broken entry
+#      is removed)
+#
+#   :: store_ao(cache_dir, key, phi_ao, max_size)
+#      Saves the AO projections of one center (see store)
+#
+#   :: evict(cache_dir, max_size)
+#      Removes least recently used entries until the cache is smaller
+#      than max_size bytes
+#
+#   :: remove(filename)
+#      Removes one entry (if no other run did)
+#
+#  Comments
+#  :: One uncompressed .npz file per key. It holds all_c[center, radius, l, mo],
+#     the (1-based) MO numbers, the centers, the spin flag and the MO
+#     energies, occupations and symmetry labels of the whole file, so
+#     the energy window of a run can be selected without reading the
+#     input file. A narrower energy range than the cached one is taken
+#     from the cache, a wider one is projected again and replaces the
+#     entry.
+#  :: AO projections (--ao-projection) are cached per center with the
+#     key of the file, the center and the grid; a new energy window
+#     only needs the transformation to the MOs (projection.mo_sweep).
+#  :: format_version changes with the layout of the entries; together
+#     with the sharpo version in the key, entries of other versions are
+#     never used (they are evicted as least recently used).
+#  :: The modification time of an entry is its last use (LRU).
+#  :: Entries are written to a temporary file and renamed, so parallel
+#     runs never read half written files. Entries which cannot be read
+#     anyway (a full disk, a killed copy) count as missing and are
+#     removed; entries removed by another run while the cache is
+#     evicted are skipped.
+#
+#  Last edited
+#  17.10.2026 :: estimated errors in the entries; broken entries are
+#                removed; eviction next to other runs
+#  17.10.2026 :: AO projections per center
+#  17.10.2026 :: version and format in the key; MO arrays of the file
+#                and centers in the entries
+#  17.10.2026 :: radius axis
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import numpy
+import zipfile
+import hashlib
+import errno
+import os
+
+from . import __version__
+
+default_dir  = os.path.join(os.path.expanduser("~"), ".cache", "sharpo")
+default_size = 512                                              #: [MB]
+suffix = ".npz"
+format_version = 3                                              #: layout of the entries
+broken = (IOError, OSError, ValueError, KeyError, EOFError, zipfile.BadZipfile)   #: an entry which cannot be read
+
+hashes = {}                                                     #: (file, size, mtime) -> file_hash
+
+#--------------------------------------------
+# Hash of the file contents
+#--------------------------------------------
+def file_hash(filename):
+  stat = os.stat(filename)
+  name = (os.path.abspath(filename), stat.st_size, stat.st_mtime)
+  if name not in hashes:
+    sha = hashlib.sha1()
+    with open(filename, "rb") as f:
+      for block in iter(lambda: f.read(1 << 20), b""):
+        sha.update(block)
+    hashes[name] = sha.hexdigest()
+  return hashes[name]
+
+
+#--------------------------------------------
+# Key of one projection
+#--------------------------------------------
+def projection_key(input_file, settings):
+  sha = hashlib.sha1()
+  sha.update(file_hash(input_file).encode("ascii"))
+  for name, value in [('sharpo', __version__), ('format', format_version)] + list(settings):
+    if isinstance(value, numpy.ndarray):
+      value = value.tolist()
+    sha.update(("%s=%r;" % (name, value)).encode("ascii"))     #: repr keeps all digits of floats
+  return sha.hexdigest()
+
+
+#--------------------------------------------
+# One entry of the cache
+#--------------------------------------------
+def load(cache_dir, key):
+  filename = os.path.join(cache_dir, key + suffix)
+  if not os.path.isfile(filename):
+    return None
+  try:
+    with numpy.load(filename) as data:
+      entry = dict((name, data[name]) for name in ('all_c', 'selected_MO', 'centers', 'spin_polarized',
+                                                   'mo_energies', 'mo_occupations', 'mo_syms'))
+      for name in ('error', 'angular_error'):
+        entry[name] = data[name] if name in data.files else None
+  except broken:                                                #: projected again
+    remove(filename)
+    return None
+  entry['spin_polarized'] = bool(entry['spin_polarized'])
+  entry['filename'] = filename
+  return entry
+
+
+#--------------------------------------------
+# Cached projection of the selected MOs
+#--------------------------------------------
+def select(entry, selected_MO, name='all_c'):
+  if entry.get(name) is None:
+    return None
+  cached_MO = entry['selected_MO']
+  idx = numpy.searchsorted(cached_MO, selected_MO)
+  if numpy.any(idx >= len(cached_MO)) or numpy.any(cached_MO[numpy.minimum(idx, len(cached_MO)-1)] != selected_MO):
+    return None
+  try:
+    os.utime(entry['filename'], None)                           #: last use
+  except OSError:                                               #: evicted by another run
+    pass
+  return entry[name][...,idx]
+
+
+#--------------------------------------------
+# Saves one projection
+#--------------------------------------------
+def store(cache_dir, key, all_c, selected_MO, centers, mo_arrays, spin_polarized, max_size,
+          error=None, angular_error=None):
+  try:
+    os.makedirs(cache_dir)
+  except OSError as exception:
+    if exception.errno != errno.EEXIST:
+      raise
+
+  mo_energies, mo_occupations, mo_syms = mo_arrays
+  filename = os.path.join(cache_dir, key + suffix)
+  tmp_name = os.path.join(cache_dir, "%s.%i.tmp" % (key, os.getpid()))
+  errors = {}
+  if error is not None:
+    errors = {'error': error, 'angular_error': angular_error}
+  with open(tmp_name, "wb") as f:
+    numpy.savez(f, all_c=all_c,
+                   selected_MO=numpy.array(selected_MO, dtype=int),
+                   centers=numpy.array(centers, dtype=float),
+                   spin_polarized=numpy.array(spin_polarized),
+                   mo_energies=numpy.array(mo_energies, dtype=float),
+                   mo_occupations=numpy.array(mo_occupations, dtype=float),
+                   mo_syms=numpy.array(mo_syms, dtype=str), **errors)
+  os.rename(tmp_name, filename)
+  evict(cache_dir, max_size)
+
+
+#--------------------------------------------
+# Entry exists
+#--------------------------------------------
+def has_entry(cache_dir, key):
+  return os.path.isfile(os.path.join(cache_dir, key + suffix))
+
+
+#--------------------------------------------
+# AO projections of one center
+#--------------------------------------------
+def load_ao(cache_dir, key):
+  filename = os.path.join(cache_dir, key + suffix)
+  if not has_entry(cache_dir, key):
+    return None
+  try:
+    with numpy.load(filename) as data:
+      phi_ao = data['phi_ao']
+  except broken:
+    remove(filename)
+    return None
+  try:
+    os.utime(filename, None)
+  except OSError:
+    pass
+  return phi_ao
+
+
+def store_ao(cache_dir, key, phi_ao, max_size):
+  try:
+    os.makedirs(cache_dir)
+  except OSError as exception:
+    if exception.errno != errno.EEXIST:
+      raise
+
+  filename = os.path.join(cache_dir, key + suffix)
+  tmp_name = os.path.join(cache_dir, "%s.%i.tmp" % (key, os.getpid()))
+  with open(tmp_name, "wb") as f:
+    numpy.savez(f, phi_ao=phi_ao)
+  os.rename(tmp_name, filename)
+  evict(cache_dir, max_size)
+
+
+#--------------------------------------------
+# Least recently used entries are removed
+#--------------------------------------------
+def evict(cache_dir, max_size):
+  entries = []
+  for name in os.listdir(cache_dir):
+    if name.endswith(suffix):
+      filename = os.path.join(cache_dir, name)
+      try:
+        stat = os.stat(filename)
+      except OSError:                                           #: removed by another run
+        continue
+      entries.append((stat.st_mtime, stat.st_size, filename))
+  entries.sort()
+
+  total = sum(entry[1] for entry in entries)
+  for mtime, size, filename in entries:
+    if total <= max_size:
+      break
+    remove(filename)
+    total -= size
+
+
+#--------------------------------------------
+# Removes one entry
+#--------------------------------------------
+def remove(filename):
+  try:
+    os.remove(filename)
+  except OSError:                                               #: removed by another run
+    pass
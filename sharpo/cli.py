@@ -0,0 +1,701 @@
+from __future__ import print_function
+
+prog_info = '''
+==========================================================================
+
+   SHarPO (Spherical Harmonics Projected molecular Orbitals)
+
+   License
+   :: Copyright (c) 2016 by Lukas Hammerschmidt
+      l.hammerschmidt@auckland.ac.nz
+
+   :: This program is free software: you can redistribute it and/or
+      modify it under the terms of the GNU Lesser General Public
+      License as published by the Free Software Foundation, either
+      version 3 of the License, or any later version.
+
+   :: This program is distributed in the hope that it will be useful,
+      but WITHOUT ANY WARRANTY; without even the implied warranty of
+      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+      GNU Lesser General Public License for more details. You should
+      have received a copy of the GNU Lesser General Public License
+      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+   Purpose
+   :: Projects the molecular orbitals onto spherical harmonics
+      according to suppl. info. of J. Phys. Chem. C Lett 2009,
+      113, 5035-5038
+
+   Comments
+   :: Runs currently only with Python 2.7 on my mashine. Not sure
+      what the problem is. Orbkit is supposed to run with Python 3.
+   :: This programs needs the modules: "Orbkit" and "Cubature
+      (for Python)" installed!!!
+
+   How to cite
+   :: This program uses "Orbkit" and "Cubature", which need to be
+      cited.
+      Orbkit :: G. Hermann, V. Pohl, J.C. Tremblay, B. Paulus,
+                H.-C. Hege, and A. Schild, "ORBKIT: A Modular Python
+                Toolbox for Cross-Platform Postprocessing of Quantum
+                Chemical Wavefunction Data", J. Comput. Chem. 2016,
+                DOI:10.1002/jcc.24358
+
+   Last Changed
+   17.10.2026 :: Fixed Gauss product grid projection (--quadrature gauss)
+                 AO projection + transformation to MOs (--ao-projection)
+                 lmax as option (--lmax), Ylm from recursion formulas
+                 real spherical harmonics (--real-sh)
+                 several centers in one run (--centers)
+                 process pool over (l,m), radial shells and centers (--proc)
+                 native Gaussian evaluator (--evaluator native)
+                 shared, vectorized Gaussian smearing
+                 projection cache (--cache-dir, --cache-size, --no-cache)
+                 radius sweep (--radii)
+                 MO blocks with preallocated buffers (--mo-block, --max-memory)
+                 trajectory mode (--trajectory)
+                 native molden reader with binary sidecar (--reader native)
+                 package with main(); orbkit, cubature and scipy are
+                 only imported where they are needed
+                 in-process API (sharpo.api) used by the command line
+                 binary output in one file (--format hdf5/npz, --text-export)
+                 stage timings and integrand counters (--profile)
+                 analytic angular projection (--quadrature analytic)
+                 cubature tolerances, error norm, evaluation limit and
+                 convergence mode (--abserr, --relerr, --norm, --max-eval,
+                 --converge); estimated errors per MO (.errors.dat)
+                 threads for the points of the cubature integrand (--threads)
+                 options read by name from the argparse Namespace
+                 cached projections are used without reading the input
+                 --max-memory as budget of all buffers
+   23.01.2017 :: Added MO coefficients and a whole other stuff
+   23.09.2016 :: No distinction between spin up,down in smearing <- fixed
+   15.09.2016 :: Changed start and end energies for g-smearing
+   14.09.2016 :: Gaussian smearing
+   13.09.2016 :: Comments + Parameter passing
+
+==========================================================================
+'''
+
+#---------------------------------
+# Only light modules are imported here:
+# orbkit, cubature, scipy and the projection
+# modules are imported by main() on the
+# paths which need them (--help, --info,
+# --license, --version and the MO energies
+# of molden files start without them)
+#---------------------------------
+import sys
+import time
+import os
+
+from . import __version__
+from . import arghandler
+
+
+#---------------------------------
+# PROGRAM VERSION::
+#---------------------------------
+version = __version__
+
+ev = 27.21138602
+ang2au = 1./0.52917720859
+# according to nist the value would be: 0.52917721067
+# I am taking the orbkit value for consistency :(
+
+
+#-------------------------------
+# Returns a string for given l
+#-------------------------------
+def l_to_string(l):
+  switcher = {
+    0: "s",
+    1: "p",
+    2: "d",
+    3: "f",
+    4: "g",
+    5: "h",
+    6: "i",
+    7: "j",
+    8: "k",
+    9: "l",
+    10: "m",
+    11: "n",
+    12: "o",
+  }
+  return switcher.get(l, " ")
+
+#-------------------------------
+# Function for writing output
+#-------------------------------
+def writeOutSmearedCoef(output_file, filename_ext, np_out, lmax):
+  import numpy
+  headerstring = ' Energy [eV]    ' + ''.join(['  C-%-9s' % l_to_string(l) for l in range(0,lmax+1)])
+  numpy.savetxt(output_file+filename_ext, np_out, fmt='%16.8f' + '  %.8f'*(lmax+1), header=headerstring)
+
+
+#---------------------------------
+# The sharpo program
+#---------------------------------
+def main(argv=None):
+
+  #---------------------------------
+  # Check arguments
+  #---------------------------------
+  args = arghandler.get_parser(version, prog_info, argv)
+
+  #---------------------------------
+  # --profile: written also if sharpo
+  # stops early (sys.exit)
+  #---------------------------------
+  profile = None
+  if args.profile is not None:
+    from . import profiling
+    profile = profiling.Profile({'version': version,
+                                 'command_line': " ".join(sys.argv[1:] if argv is None else argv),
+                                 'quadrature': args.quadrature, 'evaluator': args.evaluator,
+                                 'lmax': args.lmax, 'real_sh': args.real_sh,
+                                 'numproc': args.proc, 'threads': args.threads})
+  try:
+    run(args, argv, profile)
+  finally:
+    if profile is not None:
+      profile.write(args.profile)
+      print ("Profile saved to %s" % args.profile)
+
+
+#---------------------------------
+# One run of sharpo for the parsed
+# arguments
+#---------------------------------
+def run(args, argv=None, profile=None):
+  import numpy
+  from . import api
+  from . import molden
+  from . import cache
+  from . import profiling
+  from . import projection
+
+  input_file   = args.INPUT                #: input name
+  cutoff_r     = float(args.radius)        #: radius upto where will be integrated
+  itype        = args.type                 #: input type [molden, gaussian, ...]
+  numproc      = args.proc                 #: number of worker processes of the projection
+  center_shift = numpy.array(args.center, dtype=float)
+                                           #: center coordinates
+  output_file  = args.output               #: output file string
+  sigma        = args.sigma                #: smearing factor
+  pointsPerEv  = args.npoints              #: number of gaussian smearing grid points per 1 eV
+  print_coeff  = args.print_coeff          #: if true -> writes the coefficients into a folder
+  print_coeff_only  = args.print_coeff_only   #: if true -> writes the coefficients into a folder
+  efermi_shift = args.efermi_shift         #: if true -> writes the coefficients into a folder
+  emin         = args.e_range[0]           #: sets a minimum for the energy range of MOs to consider
+  emax         = args.e_range[1]           #: sets a maximum for the energy range of MOs to consider
+  energy_range_is_set = args.energy_range_is_set   #: True -> use Emax und Emin; False -> don't use them
+  mo_en_only   = args.moe_only             #: True -> prints MO energies and stops
+  quad_type    = args.quadrature           #: "cubature" (adaptive), "gauss" (fixed product grid) or "analytic"
+  n_radial     = args.grid_order[0]        #: number of radial points of the fixed grid
+  ang_order    = args.grid_order[1]        #: polynomial degree of the fixed angular grid
+  ao_mode      = args.ao_projection        #: True -> projects AOs once and transforms them to MOs
+  lmax         = args.lmax                 #: highest l of the projection
+  real_sh      = args.real_sh              #: True -> projection onto real spherical harmonics
+  centers      = args.centers              #: None, list of center coordinates or "all-atoms"
+  evaluator    = args.evaluator            #: "orbkit" or "native" evaluation of the orbitals
+  cache_dir    = args.cache_dir            #: directory of the projection cache (None -> default)
+  cache_size   = args.cache_size           #: size limit of the projection cache [MB]
+  use_cache    = not args.no_cache         #: False -> projection cache is neither read nor written
+  radii        = args.radii                #: None or ascending radii of a radius sweep
+  sweep        = radii is not None
+  mo_block     = args.mo_block             #: MOs evaluated at once (0 -> from max_memory or all)
+  max_memory   = args.max_memory           #: memory for the MO blocks of all processes [MB] (0 -> unlimited)
+  frame_files  = args.trajectory           #: None or the files of a trajectory
+  reader       = args.reader               #: "orbkit", "native" (molden only) or None (not set)
+  use_sidecar  = not args.no_sidecar       #: native reader: False -> no binary sidecar (.npz)
+  out_format   = args.out_format           #: "text", "hdf5" or "npz"
+  write_text   = out_format == "text" or args.text_export   #: text files (always for "text")
+  abserr       = args.abserr               #: cubature: requested absolute error of every integral
+  relerr       = args.relerr               #: cubature: requested relative error of every integral
+  err_norm     = args.norm                 #: cubature: error norm of the MOs of one integral
+  max_eval     = args.max_eval             #: cubature: integrand evaluations per integral (0 -> unlimited)
+  converge     = args.converge             #: cubature: True -> converged MOs are retired
+  threads      = args.threads              #: cubature, native evaluator: threads per process
+  if cache_dir is None:
+    cache_dir = cache.default_dir
+  if reader is None:                                              #: without --reader, the MO energies of molden
+    reader = "native" if (mo_en_only and itype == "molden") else "orbkit"   #  files come from the native reader (no orbkit)
+  multi_center = centers is not None
+  on_all_atoms = centers == arghandler.all_atoms
+
+  #---------------------------
+  # change float input to a.u.
+  #---
+  if args.units == "A":
+    center_shift = center_shift * ang2au
+    cutoff_r = cutoff_r * ang2au
+    if multi_center and not on_all_atoms:
+      centers = numpy.array(centers) * ang2au
+    if sweep:
+      radii = numpy.array(radii) * ang2au
+  if sweep:
+    radii = numpy.array(radii, dtype=float)
+    cutoff_r = radii[-1]                                          #: the largest radius is the cutoff radius
+  else:
+    radii = numpy.array([cutoff_r])
+
+  print ('')
+  print ('Input File          : %s' % input_file.strip())
+  print ('File Format         : %s' % itype.strip())
+  print ('Output File         : %s' % output_file)
+  print ('')
+  print ('Cutoff Radius [Ang] : %s' % str(cutoff_r/ang2au).strip())
+  if sweep:
+    print ('Radii               : %i (%.4f to %.4f Ang)' % (len(radii), radii[0]/ang2au, radii[-1]/ang2au))
+  if not multi_center:
+    print ('Center [Ang]        : %s %s %s' % (str(center_shift[0]/ang2au), str(center_shift[1]/ang2au), str(center_shift[2]/ang2au)))
+  elif on_all_atoms:
+    print ('Centers             : all atoms')
+  else:
+    print ('Centers             : %i' % len(centers))
+  print ('Smearing            : %s' % str(sigma))
+  print ('#ofSmPoints         : %s' % str(pointsPerEv))
+  print ('lmax                : %i' % lmax)
+  if real_sh:
+    print ('Spherical harmonics : real')
+  else:
+    print ('Spherical harmonics : complex')
+  if quad_type == "gauss":
+    print ('Quadrature          : gauss (%i radial x degree %i angular)' % (n_radial, ang_order))
+    if ao_mode:
+      print ('Projection basis    : AOs')
+  elif quad_type == "analytic":
+    print ('Quadrature          : analytic (%i radial points, Bessel expansion)' % n_radial)
+  else:
+    print ('Quadrature          : cubature (adaptive)')
+    print ('Tolerances          : abserr %g, relerr %g, norm %s%s%s' % (abserr, relerr, err_norm,
+           ', max. %i evaluations' % max_eval if max_eval > 0 else '', ', converge' if converge else ''))
+  if quad_type != "analytic":                                     #: the analytic projection evaluates no orbitals
+    print ('Evaluator           : %s' % evaluator)
+  if print_coeff_only:
+    print ('Print coefficients  : only')
+  else:
+    print ('Print coefficients  : %s' % str(print_coeff))
+
+  #--------------------------------------
+  # Parameters for time measurements
+  #--------------------------------------
+  elapsed_time = [.0,.0,.0]               # [0] : Calculation of integrals
+                                          # [1] : Writing to disc
+                                          # [2] : calculation of coefficients
+
+
+  #--------------------------------------------
+  # Trajectory mode: all frames share the grid
+  # and the Ylm table; one table and stop
+  #--------------------------------------------
+  if frame_files is not None:
+    from . import trajectory
+    if reader == "orbkit" or evaluator == "orbkit":
+      api.quiet_orbkit()
+    frames = trajectory.frame_list(frame_files, itype)
+    print ('Frames              : %i' % len(frames))
+    if not multi_center:
+      frame_centers = numpy.array([center_shift])
+    elif on_all_atoms:
+      frame_centers = arghandler.all_atoms
+    else:
+      frame_centers = numpy.array(centers, dtype=float)
+    print ("")
+    print ("I am solving integrals now...")
+    try:
+      trajectory.run(frames, {'itype':      itype,
+                              'reader':     reader,
+                              'sidecar':    use_sidecar,
+                              'qgrid':      projection.fixed_grid(cutoff_r, lmax, n_radial, ang_order, real_sh, radii),
+                              'centers':    frame_centers,
+                              'numproc':    numproc,
+                              'evaluator':  evaluator,
+                              'ao_mode':    ao_mode,
+                              'mo_block':   mo_block,
+                              'max_memory': max_memory,
+                              'emin':       emin,
+                              'emax':       emax,
+                              'efermi_shift': efermi_shift,
+                              'output_file': output_file})
+    except projection.MemoryBudgetError as error:
+      print (error)
+      sys.exit(1)
+    print ("")
+    print ("All done. Sweet.")
+    print ("")
+    sys.exit()
+
+
+  #--------------------------------------------
+  # Options of the projection (api.project)
+  #--------------------------------------------
+  project_options = {'centers':       centers if multi_center else None,
+                     'radii':         radii if sweep else None,
+                     'e_range':       (args.e_range[0], args.e_range[1]),
+                     'efermi_shift':  efermi_shift,
+                     'sigma':         sigma,
+                     'points_per_ev': pointsPerEv,
+                     'quadrature':    quad_type,
+                     'grid_order':    (n_radial, ang_order),
+                     'ao_projection': ao_mode,
+                     'real_sh':       real_sh,
+                     'evaluator':     evaluator,
+                     'numproc':       numproc,
+                     'mo_block':      mo_block,
+                     'max_memory':    max_memory,
+                     'abserr':        abserr,
+                     'relerr':        relerr,
+                     'norm':          err_norm,
+                     'max_eval':      max_eval,
+                     'converge':      converge,
+                     'input_file':    input_file,
+                     'cache_dir':     cache_dir if use_cache else None,
+                     'cache_size':    cache_size,
+                     'profile':       profile,
+                     'threads':       threads}
+
+  #--------------------------------------------
+  # A cached projection of the energy window
+  # is used without reading the input file
+  #--------------------------------------------
+  result = None
+  if use_cache and not (mo_en_only or print_coeff or print_coeff_only):
+    result = api.project(None, center_shift, cutoff_r, lmax, reader=reader, **project_options)
+
+  #--------------------------------------------
+  # orbkit reads input file
+  # wavefunction data is saved in object "qc"
+  #--------------------------------------------
+  if result is None:
+    with profiling.stage(profile, "read"):
+      qc = api.load(input_file, itype, reader, use_sidecar)
+    mo_energies, mo_occupations, mo_syms = molden.mo_arrays(qc)  #: energies in a.u.
+  else:
+    mo_energies, mo_occupations, mo_syms = result['mo_energies'], result['mo_occupations'], result['mo_syms']
+
+  #--------------------------------------------
+  # if this option is set, sharpo prints the
+  # MO energies only and stops
+  #--------------------------------------------
+  if (mo_en_only):
+    print ()
+    for i in range(0,len(mo_energies)):
+      print ("Orbital Number = %i    E[eV] = %.3f" % (i+1, mo_energies[i]*ev))
+    sys.exit()
+
+
+  #---------------------------------------
+  # E_HOMO (~E_Fermi) if set true and the
+  # selected Orbitals in the energy region
+  # between Emax and Emin
+  #---------------------------------------
+  if result is None:
+    with profiling.stage(profile, "energy_window"):
+      window = api.energy_window(qc, (emin, emax), efermi_shift, sigma)
+  else:
+    window = result                                               #: window of the cached projection
+  E_Fermi = window['E_Fermi']
+  emin = window['emin']
+  emax = window['emax']
+  selected_MO = window['selected_MO']
+  if efermi_shift:
+    print ('E_Fermi [eV]        : %.4f' % E_Fermi)
+  print ('E-range [eV]        : %.2f to %.2f' % (emin, emax))     #: if no range was set, automatically the highest
+                                                                  #  and lowest MO energies are taken as range
+
+  if not selected_MO:                                             #: if there are no MOs in the specified E-range
+    print ()                                                      #  sharpo prints the MO:energy list and stops
+    for i in range(0, len(mo_energies)):
+      print ("Orbital Number = %i    E[eV] = %.3f" % (i+1, mo_energies[i]*ev))
+    print ()
+    print ("There are no orbitals in your chosen energy range (Please see above!)")
+    print ("Either increase the energy range or don't specify it at all.")
+    print ()
+    sys.exit()
+  else:
+    print ()
+    print ("Found %i MOs in your energy range." % (len(selected_MO)))
+
+
+  #--------------------------------------------
+  # Check for open shell
+  #--------------------------------------------
+  spin_polarized = any("_b" in sym for sym in mo_syms)   #: Orbkit classifies spin down/up orbitals with _b / _a in the symmetry
+
+  if (spin_polarized):
+    print ("")
+    print ("Orbitals read successfully. Found spin!")
+  else:
+    print ("")
+    print ("Orbitals read successfully. No spin.")
+
+
+  #--------------------------------------------
+  # Metadata of the binary output
+  #--------------------------------------------
+  metadata = {'program':        'sharpo',
+              'version':        version,
+              'created':        time.strftime("%Y-%m-%d %H:%M:%S"),
+              'command_line':   " ".join(sys.argv[1:] if argv is None else argv),
+              'input_file':     os.path.abspath(input_file),
+              'input_type':     itype,
+              'lmax':           lmax,
+              'quadrature':     quad_type,
+              'evaluator':      evaluator,
+              'real_sh':        real_sh,
+              'sigma':          sigma,
+              'points_per_ev':  pointsPerEv,
+              'efermi_shift':   efermi_shift,
+              'E_Fermi':        E_Fermi,
+              'emin':           emin,
+              'emax':           emax,
+              'spin_polarized': spin_polarized,
+              'units':          'lengths a.u., energies a.u., x eV'}
+  if quad_type == "cubature":
+    metadata.update({'abserr': abserr, 'relerr': relerr, 'norm': err_norm,
+                     'max_eval': max_eval, 'converge': converge})
+  datasets = {}
+
+  #--------------------------------------------
+  # Coefficients:
+  #   calculated and written out if option is set
+  #--------------------------------------------
+  if (print_coeff == True or print_coeff_only == True):
+    from . import mo_coefficients
+    start_time = time.time()
+    if profile is not None:
+      profile.start("coefficients")
+    if out_format != "text":
+      from . import output
+      datasets.update(output.coefficient_datasets(api.coefficients(qc, (args.e_range[0], args.e_range[1]),
+                                                                   efermi_shift, sigma, pointsPerEv)))
+      if print_coeff_only:
+        print ("Output saved to %s" % output.write(output_file, out_format, datasets, metadata))
+        if not write_text:
+          print ("Elapsed time for coefficients: %.2f s" % (time.time()-start_time))
+          print ()
+          sys.exit()
+    if write_text:
+      mo_coefficients.Get_MO_Coefficients(qc,                     #: dev in mo_coefficients.py
+                                          print_coeff_only,
+                                          spin_polarized,
+                                          pointsPerEv,
+                                          sigma,
+                                          E_Fermi,
+                                          emin, emax,
+                                          selected_MO)
+    elapsed_time[2] += time.time() - start_time                   #: time till finished with the coefficients
+    if profile is not None:
+      profile.stop()
+
+
+  #---------------------------
+  # Integration till lmax (api.project):
+  # cache lookup, projection and smearing
+  # ---
+  start_time = time.time()
+  print("")
+  print("I am solving integrals now...")
+  if numproc > 1:
+    print("Using %i processes." % numproc)
+  if threads > 1:
+    if quad_type == "cubature" and evaluator == "native":
+      print("Using %i threads per process." % threads)
+    else:
+      print("--threads is used by the cubature with the native evaluator only.")
+
+  if result is None:
+    try:
+      result = api.project(qc, center_shift, cutoff_r, lmax, **project_options)
+    except projection.MemoryBudgetError as error:               #: --max-memory is too small
+      print (error)
+      sys.exit(1)
+  if result['from_cache']:
+    print("Projection taken from the cache in %s" % cache_dir)
+
+  print ("Projection completed for: l=0-%i" % lmax)
+  if result['error'] is not None:
+    print ("Largest estimated error: %.3e (C-l), %.3e (angular integrals)" % (result['error'][:,-1].max(),
+                                                                              result['angular_error'].max()))
+  centers       = result['centers']
+  all_c_sweep   = result['all_c']                               #: all_c_sweep[center,radius,l,mo]
+  all_c_centers = all_c_sweep[:,-1]                             #: all_c_centers[center,l,mo] at cutoff_r
+  all_c = all_c_centers[0]                                      #: all_c contains all coefficients for l=0-lmax for a given
+                                                                #  molecular orbital
+                                                                #: all_c[l,mo]
+  fdim = len(selected_MO)                                       #: number of projected MOs
+
+  print ("")
+  print ("Solved Integrals and will write out stuff now.")
+  elapsed_time[0] = time.time() - start_time
+  start_time = time.time()
+  if profile is not None:
+    profile.info.update({'n_mo': fdim, 'n_centers': len(centers), 'n_radii': len(result['radii']),
+                         'from_cache': result['from_cache']})
+    profile.start("output")
+
+
+  #-------------------------------------
+  # Binary output: everything in one file
+  #---
+  if out_format != "text":
+    from . import output
+    datasets.update(output.projection_datasets(result))
+    print ("Output saved to %s" % output.write(output_file, out_format, datasets, metadata))
+  if not write_text:
+    elapsed_time[1] += time.time() - start_time
+    print ()
+    print ("Elapsed Time")
+    print ("Solving integrals   : %.2f s" % elapsed_time[0])
+    print ("Writing to the disc : %.2f s" % elapsed_time[1])
+    if (print_coeff):
+      print ("MO coefficients     : %.2f s" % elapsed_time[2])
+    print ("")
+    print ("All done. Sweet.")
+    print ("")
+    sys.exit()
+
+
+  #---------------------------------------------------------------
+  # Integration is finshed. From here on the files are written out
+  # and the discrete orbital energies are smeared out by Gaussian
+  # functions for better comparison to solid state DOS. Both,
+  # smeared and unsmeared, data sets are written out.
+  #---------------------------------------------------------------
+
+  #-------------------------------------
+  # Cubature: estimated error of every
+  # MO at the cutoff radius (largest
+  # over the centers)
+  #---
+  if result['error'] is not None:
+    error = result['error'][:,-1].max(axis=0)                     #: error[l,mo]
+    angular_error = result['angular_error'].max(axis=0)           #: angular_error[mo]
+    outputstream = open(output_file+".errors.dat", "w+")
+    print('#   MO     Energy [a.u.]      Energy [eV]    ', end="", file=outputstream)
+    for l in range(0,lmax+1):
+      print('E-%-9s ' % l_to_string(l), end="", file=outputstream)
+    print('sum_E       angular     sym', file=outputstream)
+    for i_mos in range(0,fdim):
+      energy = mo_energies[selected_MO[i_mos]-1]
+      print ("%5i  %16.8f %16.8f    " % (selected_MO[i_mos], energy, energy*ev), end="", file=outputstream)
+      for l in range(0, lmax+1):
+        print ("%.3e  " % error[l, i_mos], end="", file=outputstream)
+      print ("%.3e  %.3e  %s" % (error[:, i_mos].sum(), angular_error[i_mos], mo_syms[selected_MO[i_mos]-1]),
+             file=outputstream)
+    outputstream.close()
+    print ("Output saved to %s" % (output_file+".errors.dat"))
+
+  #-------------------------------------
+  # Radius sweep: one line per center,
+  # radius and MO
+  #---
+  if sweep:
+    outputstream = open(output_file+".radii.dat", "w+")
+    print('# center    R [Ang]     MO     Energy [a.u.]      Energy [eV]    ', end="", file=outputstream)
+    for l in range(0,lmax+1):
+      print('C-%-9s ' % l_to_string(l), end="", file=outputstream)
+    print('sum_C       sym', file=outputstream)
+
+    for ic in range(0,len(centers)):
+      for ir in range(0,len(radii)):
+        for i_mos in range(0,fdim):
+          energy = mo_energies[selected_MO[i_mos]-1]
+          print ("%8i  %10.6f  %5i  %16.8f %16.8f    " % (ic+1, radii[ir]/ang2au, selected_MO[i_mos], energy, energy*ev),
+                 end="", file=outputstream)
+          for l in range(0, lmax+1):
+            print ("%.8f  " % all_c_sweep[ic, ir, l, i_mos], end="", file=outputstream)
+          print ("%.8f  %s" % (all_c_sweep[ic, ir, :, i_mos].sum(), mo_syms[selected_MO[i_mos]-1]), file=outputstream)
+    outputstream.close()
+    print ("Output saved to %s" % (output_file+".radii.dat"))
+
+  #-------------------------------------
+  # Several centers: one table for all
+  # centers and stop
+  #---
+  if multi_center:
+    outputstream = open(output_file+".centers.dat", "w+")
+    print('# center      x [Ang]       y [Ang]       z [Ang]     MO     Energy [a.u.]      Energy [eV]    ', end="", file=outputstream)
+    for l in range(0,lmax+1):
+      print('C-%-9s ' % l_to_string(l), end="", file=outputstream)
+    print('sum_C       sym', file=outputstream)
+
+    for ic in range(0,len(centers)):
+      for i_mos in range(0,fdim):
+        energy = mo_energies[selected_MO[i_mos]-1]
+        print ("%8i  %12.6f  %12.6f  %12.6f  %5i  %16.8f %16.8f    " % (ic+1, centers[ic,0]/ang2au, centers[ic,1]/ang2au, centers[ic,2]/ang2au,
+                                                                    selected_MO[i_mos], energy, energy*ev), end="", file=outputstream)
+        for l in range(0, lmax+1):
+          print ("%.8f  " % all_c_centers[ic, l, i_mos], end="", file=outputstream)
+        print ("%.8f  %s" % (all_c_centers[ic, :, i_mos].sum(), mo_syms[selected_MO[i_mos]-1]), file=outputstream)
+    outputstream.close()
+
+    elapsed_time[1] += time.time() - start_time
+    print ("Output saved to %s" % (output_file+".centers.dat"))
+    print ()
+    print ("Elapsed Time")
+    print ("Solving integrals   : %.2f s" % elapsed_time[0])
+    print ("Writing to the disc : %.2f s" % elapsed_time[1])
+    print ("")
+    print ("All done. Sweet.")
+    print ("")
+    sys.exit()
+
+  #-------------------------------------
+  # Discrete values are written here
+  #---
+  outputstream = open(output_file+".discrete.dat", "w+")
+  print('#   Energy [a.u.]          Energy [eV]     ',end="", file=outputstream)
+  for l in range(0,lmax+1):
+    if l == lmax:
+      print('C-%s      sum_C       MO' % (l_to_string(l)), file=outputstream)
+      break
+    else:
+      print('C-%s         ' % (l_to_string(l)), end="", file=outputstream)
+
+  en = numpy.zeros(len(all_c[0,:]))
+
+  for i_mos in range(0,len(all_c[0,:])):
+    en[i_mos] = mo_energies[selected_MO[i_mos]-1]
+    print ("%16.8f     %16.8f     " % (en[i_mos], en[i_mos]*ev), end="", file=outputstream)
+    for l in range(0, lmax+1):
+      print ("%.8f  " % all_c[l, i_mos], end="", file=outputstream)
+    print ("%.8f  %s" % (all_c[:,i_mos].sum(), mo_syms[selected_MO[i_mos]-1] ), file=outputstream)
+  outputstream.close()
+
+
+  #----------------------------------------------
+  # Values smeared by Gaussians are written here
+  #   closed shell: one file; open shell: alpha
+  #   and beta file (l-selective Gaussians
+  #   centred at the orbital energies)
+  #---
+  x = result['x']                                               #: energies minus E_Fermi
+  gx = result['smeared'][:,:,0,:]                               #: gx[channel, x, l]
+
+  if not spin_polarized:
+    writeOutSmearedCoef(output_file, '.smeared.dat', numpy.column_stack((x,gx[0])), lmax)
+    print ("Output saved to %s and %s" % (output_file+".discrete.dat", output_file+ ".smeared.dat"))
+  else:
+    writeOutSmearedCoef(output_file, '.smeared.a.dat', numpy.column_stack((x,gx[0])), lmax)
+    writeOutSmearedCoef(output_file, '.smeared.b.dat', numpy.column_stack((x,gx[1])), lmax)
+    print ("Output saved to %s, %s and %s" % (output_file+".discrete.dat", output_file+ ".smeared.a.dat", output_file+ ".smeared.b.dat"))
+
+  elapsed_time[1] += time.time() - start_time
+
+  #-----------------------------
+  # Done writing
+  # Shows elapsed time and ends
+  #---
+  print ()
+  print ("Elapsed Time")
+  print ("Solving integrals   : %.2f s" % elapsed_time[0])
+  print ("Writing to the disc : %.2f s" % elapsed_time[1])
+  if (print_coeff):
+    print ("MO coefficients     : %.2f s" % elapsed_time[2])
+  print ("")
+  print ("All done. Sweet.")
+  print ("")
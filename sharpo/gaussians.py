@@ -0,0 +1,291 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   gaussians.py :: evaluates contracted cartesian and spherical
+#                   Gaussian basis functions and the MOs built
+#                   from them, without orbkit's grid module
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: solid_harmonic(l, m)
+#      Returns the real solid harmonic S_lm(x,y,z) (Racah normalization,
+#      S_lm = sqrt(4 pi/(2l+1)) r^l Slm) as list of ((lx,ly,lz), coefficient)
+#
+#   :: basis_set(qc)
+#      Parameters
+#      [orbkit qc]  :: qc :: wave function (ao_spec, ao_spherical, geo_spec)
+#      Returns the basis as list of shells. Every shell is a dictionary
+#      with 'atom', 'center', 'l', 'exps', 'coeffs' (primitive normalization
+#      included) and 'aos': list of (AO index, polynomial)
+#
+#   :: native_qc(qc, mo_spec)
+#      Returns the dictionary used by projection.evaluate_mos for the
+#      native evaluator: 'native', 'basis', 'n_ao' and the MO coefficient
+#      matrix 'coeffs' of mo_spec (None -> the AOs are returned)
+#
+#   :: screen(basis, center, cutoff_r)
+#      Returns the shells which can reach the sphere of radius cutoff_r
+#      around center
+#
+#   :: evaluate(wfn, x, y, z, center, cutoff_r)
+#      Parameters
+#      [dictionary]   :: wfn      :: from native_qc
+#      [numpy arrays] :: x, y, z  :: cartesian grid points
+#      [numpy array]  :: center   :: center of the integration sphere or None
+#      [float]        :: cutoff_r :: radius of the integration sphere
+#      Returns MO values (n_MO, n_points), or AO values (n_AO, n_points)
+#      if wfn['coeffs'] is None
+#
+#   :: mo_product(coeffs, values)
+#      Returns numpy.dot(coeffs, values), made for the MOs
+#      mo_chunk*k <= i < mo_chunk*(k+1) one after the other
+#
+#  Comments
+#  :: Same conventions as orbkit: primitives are normalized per cartesian
+#     component, (2a/pi)^(3/4) (4a)^(l/2) / sqrt((2lx-1)!!(2ly-1)!!(2lz-1)!!),
+#     the contraction coefficients are taken as they are. Spherical
+#     functions are (2a/pi)^(3/4) (4a)^(l/2) / sqrt((2l-1)!!) S_lm(r-A)
+#     without Condon-Shortley phase (d+1 = xz, d-1 = yz, ...), in the
+#     order given by qc.ao_spherical.
+#  :: Cartesian components are taken from ao_spec[i]['lxlylz'] if orbkit
+#     provides them, otherwise in the molden order (see cartesian_exponents).
+#  :: Points are processed in blocks of block_size; the MOs of a block
+#     are matrix products with the coefficients of the active AOs, one
+#     for every mo_chunk MOs (mo_product). BLAS gives other rounding for
+#     an MO if the matrix has other rows, so an MO computed in a block of
+#     MOs would differ in the last bits from the same MO in the full
+#     product. With fixed chunks, a block of a multiple of mo_chunk MOs
+#     makes exactly the products of the full run.
+#
+#  Last edited
+#  17.10.2026 :: MOs in chunks of mo_chunk
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import numpy
+
+lquant = {'s': 0, 'p': 1, 'd': 2, 'f': 3, 'g': 4, 'h': 5, 'i': 6}
+block_size = 10000                                              #: points per block (as slice_length in orbkit)
+screening = 30.                                                 #: a_min * d^2 > screening -> shell is skipped (e^-30 ~ 1e-13)
+mo_chunk = 32                                                   #: MOs per matrix product; MO blocks are multiples of it
+
+#--------------------------------------------
+# Cartesian exponents in molden order
+#--------------------------------------------
+cartesian_exponents = {
+  0: [(0,0,0)],
+  1: [(1,0,0), (0,1,0), (0,0,1)],
+  2: [(2,0,0), (0,2,0), (0,0,2), (1,1,0), (1,0,1), (0,1,1)],
+  3: [(3,0,0), (0,3,0), (0,0,3), (1,2,0), (2,1,0), (2,0,1),
+      (1,0,2), (0,1,2), (0,2,1), (1,1,1)],
+  4: [(4,0,0), (0,4,0), (0,0,4), (3,1,0), (3,0,1), (1,3,0),
+      (0,3,1), (1,0,3), (0,1,3), (2,2,0), (2,0,2), (0,2,2),
+      (2,1,1), (1,2,1), (1,1,2)],
+}
+
+def exponents(l):
+  if l in cartesian_exponents:
+    return cartesian_exponents[l]
+  return [(lx, l-lx-lz, lz) for lx in range(l,-1,-1) for lz in range(0,l-lx+1)]
+
+
+#--------------------------------------------
+# Small helpers
+#--------------------------------------------
+def double_factorial(n):
+  result = 1
+  while n > 1:
+    result *= n
+    n -= 2
+  return result
+
+def binomial(n, k):
+  if k < 0 or k > n:
+    return 0
+  result = 1
+  for i in range(0, k):
+    result = result * (n-i) // (i+1)
+  return result
+
+def factorial(n):
+  result = 1
+  for i in range(2, n+1):
+    result *= i
+  return result
+
+
+#--------------------------------------------
+# Real solid harmonic as cartesian polynomial
+# (Helgaker, Joergensen, Olsen, eq. 6.4.47)
+#--------------------------------------------
+def solid_harmonic(l, m):
+  am = abs(m)
+  norm = numpy.sqrt(2.*factorial(l+am)*factorial(l-am)/(2. if m == 0 else 1.)) / (2**am * factorial(l))
+  terms = {}
+  for t in range(0, (l-am)//2+1):
+    for u in range(0, t+1):
+      #: v runs over v_m, v_m+1, ... with v_m = 0 (m >= 0) or 1/2 (m < 0); k = 2v
+      for k in range(0 if m >= 0 else 1, am+1, 2):
+        sign = (-1)**(t + (k - (0 if m >= 0 else 1))//2)
+        c = sign * 0.25**t * binomial(l,t) * binomial(l-t,am+t) * binomial(t,u) * binomial(am,k)
+        key = (2*t+am-2*u-k, 2*u+k, l-2*t-am)
+        terms[key] = terms.get(key, 0.) + norm*c
+  return [(key, terms[key]) for key in sorted(terms) if terms[key] != 0.]
+
+
+#--------------------------------------------
+# Basis set from orbkit's ao_spec
+#--------------------------------------------
+def basis_set(qc):
+  ao_spec  = qc['ao_spec'] if isinstance(qc, dict) else qc.ao_spec
+  geo_spec = qc['geo_spec'] if isinstance(qc, dict) else qc.geo_spec
+  ao_spherical = qc.get('ao_spherical') if isinstance(qc, dict) else qc.ao_spherical
+  geo_spec = numpy.array(geo_spec, dtype=float)
+
+  #-------------------------------------
+  # spherical: (l,m) of every AO per shell
+  #---
+  spherical = {}
+  if ao_spherical is not None and len(ao_spherical) > 0:
+    for i_ao, (i_shell, lm) in enumerate(ao_spherical):
+      spherical.setdefault(i_shell, []).append((i_ao, lm))
+
+  basis = []
+  counter = 0
+  for i in range(0, len(ao_spec)):
+    l = lquant[ao_spec[i]['type']]
+    exps   = numpy.array(ao_spec[i]['coeffs'], dtype=float)[:,0]
+    coeffs = numpy.array(ao_spec[i]['coeffs'], dtype=float)[:,1]
+    coeffs = coeffs * (2.*exps/numpy.pi)**0.75 * (4.*exps)**(0.5*l)
+
+    aos = []
+    if spherical:
+      for i_ao, (l_ao, m) in spherical.get(i, []):
+        poly = [(key, c/numpy.sqrt(double_factorial(2*l-1))) for key, c in solid_harmonic(l_ao, m)]
+        aos.append((i_ao, poly))
+    else:
+      lxlylz = ao_spec[i].get('lxlylz')
+      if lxlylz is None:
+        lxlylz = exponents(l)
+      for key in lxlylz:
+        key = tuple(int(k) for k in key)
+        c = 1./numpy.sqrt(double_factorial(2*key[0]-1)*double_factorial(2*key[1]-1)*double_factorial(2*key[2]-1))
+        aos.append((counter, [(key, c)]))
+        counter += 1
+
+    basis.append({'atom':   ao_spec[i]['atom'],
+                  'center': geo_spec[ao_spec[i]['atom']],
+                  'l':      l,
+                  'exps':   exps,
+                  'coeffs': coeffs,
+                  'aos':    aos})
+  return basis
+
+
+#--------------------------------------------
+# Wave function for the native evaluator
+#--------------------------------------------
+def native_qc(qc, mo_spec=None):
+  basis = basis_set(qc)
+  n_ao = 1 + max(i_ao for shell in basis for i_ao, poly in shell['aos'])
+  if mo_spec is None:
+    coeffs = None
+  else:
+    coeffs = numpy.array([item['coeffs'] for item in mo_spec], dtype=float)
+  return {'native': True, 'basis': basis, 'n_ao': n_ao, 'coeffs': coeffs}
+
+
+#--------------------------------------------
+# Shells which can reach the integration sphere
+#--------------------------------------------
+def screen(basis, center, cutoff_r):
+  if center is None:
+    return basis
+  active = []
+  for shell in basis:
+    d = max(0., numpy.linalg.norm(shell['center'] - center) - cutoff_r)
+    if shell['exps'].min() * d*d <= screening + shell['l']*numpy.log(max(d, 1.)):
+      active.append(shell)
+  return active
+
+
+#--------------------------------------------
+# AO values of a list of shells
+#--------------------------------------------
+def evaluate_aos(shells, x, y, z):
+  n_ao = sum(len(shell['aos']) for shell in shells)
+  ao = numpy.zeros((n_ao, len(x)))
+  i = 0
+  for shell in shells:
+    dx = x - shell['center'][0]
+    dy = y - shell['center'][1]
+    dz = z - shell['center'][2]
+    r2 = dx*dx + dy*dy + dz*dz
+    radial = numpy.dot(shell['coeffs'], numpy.exp(-numpy.outer(shell['exps'], r2)))
+
+    l = shell['l']
+    powers = [[numpy.ones_like(dx)], [numpy.ones_like(dy)], [numpy.ones_like(dz)]]
+    for k in range(0, l):
+      powers[0].append(powers[0][-1]*dx)
+      powers[1].append(powers[1][-1]*dy)
+      powers[2].append(powers[2][-1]*dz)
+
+    for i_ao, poly in shell['aos']:
+      for (lx, ly, lz), c in poly:
+        ao[i] += c * powers[0][lx] * powers[1][ly] * powers[2][lz]
+      ao[i] *= radial
+      i += 1
+  return ao
+
+
+#--------------------------------------------
+# MOs (or AOs) on the grid, block by block
+#--------------------------------------------
+def evaluate(wfn, x, y, z, center=None, cutoff_r=None):
+  shells = screen(wfn['basis'], center, cutoff_r)
+  active = numpy.array([i_ao for shell in shells for i_ao, poly in shell['aos']], dtype=int)
+
+  if wfn['coeffs'] is None:
+    out = numpy.zeros((wfn['n_ao'], len(x)))
+  else:
+    out = numpy.zeros((wfn['coeffs'].shape[0], len(x)))
+    coeffs = wfn['coeffs'][:, active]
+  if len(active) == 0:
+    return out
+
+  for i0 in range(0, len(x), block_size):
+    i1 = min(i0+block_size, len(x))
+    ao = evaluate_aos(shells, x[i0:i1], y[i0:i1], z[i0:i1])
+    if wfn['coeffs'] is None:
+      out[active, i0:i1] = ao
+    else:
+      out[:, i0:i1] = mo_product(coeffs, ao)
+  return out
+
+
+#--------------------------------------------
+# Coefficients times values in fixed chunks
+# of MOs
+#--------------------------------------------
+def mo_product(coeffs, values):
+  out = numpy.empty((coeffs.shape[0], values.shape[1]), dtype=numpy.result_type(coeffs, values))
+  for i0 in range(0, coeffs.shape[0], mo_chunk):
+    out[i0:i0+mo_chunk] = numpy.dot(coeffs[i0:i0+mo_chunk], values)
+  return out
@@ -0,0 +1,211 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   mo_coefficients.py :: intended to write out the absolute 
+#                         values of the MO-coefficients
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: make_sure_path_exists(path)
+#      Parameters
+#      [string]   :: path  :: folder to write into
+
+#   :: ao_index_map(qc)
+#      Returns atom and l of every AO (cartesian or spherical) as two arrays
+
+#   :: atom_l_weights(qc, selected_MO)
+#      Returns coeff_array[mo, atom, l] = \sum |MO coefficients| of the AOs of
+#      every atom and l (s,...,i) for the MOs selected_MO (1-based)
+
+#   :: Get_MO_Coefficients(qc, print_coeff_only, spin_polarized, pointsPerEv, sigma)
+#      Parameters
+#      [orbkit dictionary] :: qc               :: the wave function is saved in here
+#      [bool]              :: print_coeff_only :: true -> program stops after printing coeff
+#      [bool]              :: spin_polarized   :: true -> alpha and beta are evaluated seperately
+#      [int]               :: pointsPerEv      :: #of grid points per eV for smearing
+#      [float]             :: sigma            :: smearing factor
+
+#  Comments
+#  :: no comments
+#
+#  Last edited
+#  17.10.2026 :: scipy imported in atom_l_weights
+#  17.10.2026 :: atom_l_weights for the API
+#  17.10.2026 :: AO -> (atom, l) index map, one sparse product, h and i shells
+#  17.10.2026 :: smearing moved to smearing.py
+#  26.01.2017 :: Optimizations / adaption of emax and emin
+#  20.01.2017 :: Descriptions and finalization
+#
+# ===========================================================
+from __future__ import print_function
+
+import numpy
+import errno
+import time
+import os
+import sys
+
+from . import smearing
+
+l_labels = ['s', 'p', 'd', 'f', 'g', 'h', 'i']                 #: shell types known to orbkit
+
+#--------------------------------------------
+# Make sure a path exists
+#--------------------------------------------
+def make_sure_path_exists(path):
+  try:
+    os.makedirs(path)
+  except OSError as exception:
+    if exception.errno != errno.EEXIST:
+      raise
+
+
+#--------------------------------------------
+# (atom, l) of every AO, in the order of the
+# MO coefficients
+#--------------------------------------------
+def ao_index_map(qc):
+  ao_atom = []
+  ao_l = []
+  if qc.ao_spherical is not None and len(qc.ao_spherical) > 0:
+    for i_shell, (l, m) in qc.ao_spherical:                     #: one entry per spherical AO
+      ao_atom.append(qc.ao_spec[i_shell]['atom'])
+      ao_l.append(l)
+  else:
+    for shell in qc.ao_spec:
+      l = l_labels.index(shell['type'])
+      if shell.get('lxlylz') is not None:
+        n_cart = len(shell['lxlylz'])
+      else:
+        n_cart = (l+1)*(l+2)//2
+      ao_atom.extend([shell['atom']]*n_cart)
+      ao_l.extend([l]*n_cart)
+  return numpy.array(ao_atom, dtype=int), numpy.array(ao_l, dtype=int)
+
+
+#--------------------------------------------
+# |MO coefficients| summed per atom and l
+#--------------------------------------------
+def atom_l_weights(qc, selected_MO):
+  from scipy import sparse                                      #: only imported where it is needed
+
+  lmax = len(l_labels)
+  no_of_atoms = len(qc.geo_spec)
+
+  #: every AO belongs to one (atom, l); |coefficient| of all selected
+  #  MOs are summed per (atom, l) with one sparse matrix product
+  ao_atom, ao_l = ao_index_map(qc)
+  mo_coeffs = numpy.array([qc.mo_spec[selected_MO[mo]-1]['coeffs'] for mo in range(0,len(selected_MO))], dtype=float)
+  ao_to_atom_l = sparse.csr_matrix((numpy.ones(len(ao_atom)), (numpy.arange(len(ao_atom)), ao_atom*lmax + ao_l)),
+                                   shape=(len(ao_atom), no_of_atoms*lmax))
+  coeff_array = numpy.asarray(ao_to_atom_l.transpose().dot(numpy.abs(mo_coeffs).transpose()).transpose())
+  return coeff_array.reshape(len(selected_MO), no_of_atoms, lmax)
+
+
+#--------------------------------------------
+# Write out MO coefficients
+#--------------------------------------------
+def Get_MO_Coefficients(qc, print_coeff_only, spin_polarized, 
+                        pointsPerEv, sigma, E_fermi, emin, emax, selected_MO):
+  
+
+  lmax = len(l_labels)                                          #: s,p,d,f,g,h,i
+  no_of_atoms = len(qc.geo_spec)
+  xmin = emin                                                   #: as set in arguments
+  xmax = emax                                                   #: as set in arguments
+  x = smearing.energy_grid(xmin, xmax, pointsPerEv)             #: x[x-value]
+
+
+
+  
+  #---------------------------------------------------------
+  #: orbkit saves the AOs and MOs in the dictionary
+  #  qc.ao_spec and qc.mo_spec. Such that:
+  #  qc.mo_spec(i,'energy') gives the energy
+  #  of the i-th MO. For more infos please refer to the
+  #  orbkit documentation.
+  #: we use those data set to extract in the MO coefficients
+  #  for the individual atomic orbitals in the following
+  #---------------------------------------------------------
+  start_time = time.time()
+  
+  print ('')
+  print ('Reading and writing out smeared MO-coefficients between %.2f and %.2f eV' % (xmin, xmax))
+  
+  coeff_array = atom_l_weights(qc, selected_MO)                 #: coeff_array[mo][atom][s,p,d,f,g,h,i:|coefficient|]
+
+  #-----------------------------------------------------
+  # Calculates Gaussian smearing (like DOS in sol.state)
+  #   all atoms, l and spin channels in one pass
+  #---
+  energies = numpy.array([qc.mo_spec[selected_MO[mo]-1]['energy'] for mo in range(0,len(selected_MO))])*27.21138602
+  syms = [qc.mo_spec[selected_MO[mo]-1]['sym'] for mo in range(0,len(selected_MO))]
+  channels, n_channels = smearing.spin_channels(syms, spin_polarized)
+  gx_ch = smearing.smear(x, energies, coeff_array, sigma, channels, n_channels)   #: gx_ch[channel][x-value][no_of_atoms][s,...,i]
+  gx_all_ch = gx_ch.sum(axis=2)                                                     #: gx_all_ch[channel][x-value][s,...,i]
+
+  #--------------------------------------------
+  # Print MO-coefficients
+  #    for each atom a different file is created... this may be changed in the future
+  #    one file for all atoms is written out
+  #---
+  
+  #--------------------------------------------
+  # Discrete values are written to files here
+  #---
+  make_sure_path_exists('./pldos_data')
+  energies_au = energies/27.21138602
+  headerstring = "    E / a.u.         E / eV           " + "".join(["    c-%s         " % l for l in l_labels])
+  formatstring = ["%16.8f", "  %16.8f"] + ["  %13.8f"]*lmax
+  for na in range(0,no_of_atoms):
+    numpy.savetxt('./pldos_data/'+str(na)+'.dat', numpy.column_stack((energies_au, energies, coeff_array[:,na,:])),
+                  fmt=formatstring, delimiter='', header=headerstring)
+  numpy.savetxt('./pldos_data/all_atoms.dat', numpy.column_stack((energies_au, energies, coeff_array.sum(axis=1))),
+                fmt=formatstring, delimiter='', header=headerstring)
+
+
+  #--------------------------------------------
+  # Smeared values are written to files here
+  #---
+  
+  def writeOutSmearedCoef(output_filename, np_out):
+    headerstring = ' Energy [eV]    ' + ''.join(['  C-%-9s' % l for l in l_labels])
+    numpy.savetxt(output_filename, np_out, fmt='%16.8f' + '  %.8f'*lmax, header=headerstring)
+  
+  if not spin_polarized:
+    for na in range(0,no_of_atoms):
+      writeOutSmearedCoef('./pldos_data/'+str(na)+'.smeared.dat', numpy.column_stack((x-E_fermi,gx_ch[0,:,na,:])))
+    writeOutSmearedCoef('./pldos_data/all_atoms.smeared.dat', numpy.column_stack((x-E_fermi,gx_all_ch[0])))
+      
+  elif spin_polarized:
+    for na in range(0,no_of_atoms):
+      writeOutSmearedCoef('./pldos_data/'+str(na)+'.smeared.a.dat', numpy.column_stack((x-E_fermi,gx_ch[0,:,na,:])))
+      writeOutSmearedCoef('./pldos_data/'+str(na)+'.smeared.b.dat', numpy.column_stack((x-E_fermi,gx_ch[1,:,na,:])))
+    writeOutSmearedCoef('./pldos_data/all_atoms.smeared.a.dat', numpy.column_stack((x-E_fermi,gx_all_ch[0])))
+    writeOutSmearedCoef('./pldos_data/all_atoms.smeared.b.dat', numpy.column_stack((x-E_fermi,gx_all_ch[1])))
+         
+  #-------------------------------------------
+  # Sharpo stops if it was only to do the MO-c
+  #-------------------------------------------
+  if (print_coeff_only == True):
+    print ("Elapsed time for coefficients: %.2f s" % (time.time()-start_time))
+    print ()
+    sys.exit()
+  else:
+    print ("Sweet. Done with coefficients.")
\ No newline at end of file
@@ -0,0 +1,412 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   molden.py :: native reader for molden files; MO data is
+#                kept in numpy arrays and cached in a binary
+#                sidecar file
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Classes:
+#   :: MoldenQC(filename, sidecar)
+#      Parameters
+#      [string] :: filename :: molden file
+#      [bool]   :: sidecar  :: True -> reads/writes filename.npz
+#      Wave function with the attributes of orbkit's qc (geo_spec, geo_info,
+#      ao_spec, ao_spherical, mo_spec, todict()) plus the arrays
+#      mo_energies, mo_occupations, mo_spins (0 alpha, 1 beta), mo_syms
+#      and coefficients[mo, ao]. coefficients and mo_spec are read on
+#      first use
+#
+#   Contains Functions:
+#   :: mo_arrays(qc)
+#      Returns energies [a.u.], occupations and symmetry labels of the MOs
+#      of a MoldenQC or an orbkit qc as numpy arrays
+#
+#   :: read_text(wfn, filename)
+#      Parses atoms, basis set and MO headers of a molden file into wfn;
+#      the coefficients are parsed by read_coefficients
+#
+#   :: contraction_norms(shell_l, shell_pnum, primitives)
+#      Returns the self-overlap of every contracted shell (normalized
+#      primitives, as in orbkit's ao_spec)
+#
+#   :: read_coefficients(filename, blocks, n_mo, n_ao)
+#      Parses the coefficient blocks (byte ranges) into coefficients[mo, ao]
+#
+#   :: npz_memmap(filename)
+#      Returns the arrays of an uncompressed .npz file as read-only memory maps
+#
+#  Comments
+#  :: The sidecar is filename + ".npz" (uncompressed) and knows the size
+#     and modification time of the molden file; it is ignored as soon as
+#     the molden file changes. It is written when the coefficients are
+#     parsed for the first time, so --mo-energies-only never parses them.
+#  :: Only Gaussian basis sets ([GTO]) are read. sp shells are split into
+#     an s and a p shell. Spherical functions ([5D], [7F], [9G], ...) follow
+#     orbkit's ao_spherical convention (molden order 0, +1, -1, +2, -2, ...);
+#     a mix of spherical and cartesian shells is not supported.
+#  :: Symmetry labels get "_a"/"_b" if the file contains beta orbitals,
+#     as in orbkit.
+#  :: Contraction coefficients: if a shell's self-overlap is off by more
+#     than norm_tolerance (coefficients rounded in the file), all shells
+#     are renormalized, as orbkit's molden reader does. orbkit 1.x also
+#     rescales the MO coefficients of files with [6D]/[10F] flags in that
+#     case (CCA norm); this is not done here.
+#
+#  Last edited
+#  17.10.2026 :: contractions renormalized as in orbkit (sidecar version 2)
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import numpy
+import zipfile
+import struct
+import mmap
+import re
+import os
+
+lquant = {'s': 0, 'p': 1, 'd': 2, 'f': 3, 'g': 4, 'h': 5, 'i': 6}
+ang2au = 1./0.52917720859                                      #: as orbkit
+sidecar_version = 2
+norm_tolerance = 1e-5                                           #: as orbkit
+
+#--------------------------------------------
+# Cartesian exponents in molden order
+#--------------------------------------------
+cartesian_exponents = {
+  0: [(0,0,0)],
+  1: [(1,0,0), (0,1,0), (0,0,1)],
+  2: [(2,0,0), (0,2,0), (0,0,2), (1,1,0), (1,0,1), (0,1,1)],
+  3: [(3,0,0), (0,3,0), (0,0,3), (1,2,0), (2,1,0), (2,0,1),
+      (1,0,2), (0,1,2), (0,2,1), (1,1,1)],
+  4: [(4,0,0), (0,4,0), (0,0,4), (3,1,0), (3,0,1), (1,3,0),
+      (0,3,1), (1,0,3), (0,1,3), (2,2,0), (2,0,2), (0,2,2),
+      (2,1,1), (1,2,1), (1,1,2)],
+}
+
+def spherical_m(l):
+  return [0] + [s*m for m in range(1, l+1) for s in (1, -1)]   #: 0, +1, -1, +2, -2, ...
+
+def to_float(word):
+  return float(word.replace('D', 'E').replace('d', 'e'))         #: fortran exponents
+
+header_keys = re.compile(br'^[ \t]*(Sym|Ene|Spin|Occup)[ \t]*=[ \t]*(\S*)[ \t]*\r?$', re.M | re.I)
+section = re.compile(br'^[ \t]*\[([^\]]+)\](.*)$', re.M)
+
+
+#--------------------------------------------
+# MO arrays of any wave function
+#--------------------------------------------
+def mo_arrays(qc):
+  if isinstance(qc, MoldenQC):
+    return qc.mo_energies, qc.mo_occupations, qc.mo_syms
+  return (numpy.array([item['energy'] for item in qc.mo_spec], dtype=float),
+          numpy.array([item['occ_num'] for item in qc.mo_spec], dtype=float),
+          numpy.array([item['sym'] for item in qc.mo_spec], dtype=str))
+
+
+#--------------------------------------------
+# Arrays of an .npz file as memory maps
+#--------------------------------------------
+def npz_memmap(filename):
+  arrays = {}
+  with zipfile.ZipFile(filename) as archive:
+    with open(filename, "rb") as f:
+      for info in archive.infolist():
+        name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+        if info.compress_type != zipfile.ZIP_STORED:
+          raise ValueError("%s is compressed and cannot be memory-mapped" % filename)
+        f.seek(info.header_offset)
+        n_name, n_extra = struct.unpack("<HH", f.read(30)[26:30])
+        f.seek(info.header_offset + 30 + n_name + n_extra)
+        version = numpy.lib.format.read_magic(f)
+        if version == (1, 0):
+          shape, fortran, dtype = numpy.lib.format.read_array_header_1_0(f)
+        else:
+          shape, fortran, dtype = numpy.lib.format.read_array_header_2_0(f)
+        if dtype.hasobject:
+          raise ValueError("%s contains python objects" % filename)
+        if int(numpy.prod(shape)) == 0:
+          arrays[name] = numpy.zeros(shape, dtype=dtype)
+        else:
+          arrays[name] = numpy.memmap(filename, dtype=dtype, mode='r', offset=f.tell(),
+                                      shape=shape, order='F' if fortran else 'C')
+  return arrays
+
+
+#--------------------------------------------
+# Coefficients of all MOs
+#--------------------------------------------
+def read_coefficients(filename, blocks, n_mo, n_ao):
+  coefficients = numpy.zeros((n_mo, n_ao))
+  with open(filename, "rb") as f:
+    text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+      for i in range(0, n_mo):
+        block = text[blocks[i,0]:blocks[i,1]].replace(b'D', b'E').replace(b'd', b'e')
+        values = numpy.fromstring(block.decode("ascii"), sep=' ')   #: index, value, index, value, ...
+        coefficients[i, values[0::2].astype(int)-1] = values[1::2]
+    finally:
+      text.close()
+  return coefficients
+
+
+#--------------------------------------------
+# Self-overlap of the contracted shells
+#--------------------------------------------
+def contraction_norms(shell_l, shell_pnum, primitives):
+  norms = numpy.zeros(len(shell_l))
+  p0 = 0
+  for i in range(0, len(shell_l)):
+    exps, coeffs = primitives[p0:p0+shell_pnum[i]].T
+    p0 += shell_pnum[i]
+    overlap = (2.*numpy.sqrt(numpy.outer(exps, exps))/numpy.add.outer(exps, exps))**(shell_l[i] + 1.5)
+    norms[i] = numpy.dot(coeffs, numpy.dot(overlap, coeffs))
+  return norms
+
+
+#--------------------------------------------
+# Atoms, basis set and MO headers
+#--------------------------------------------
+def read_text(wfn, filename):
+  with open(filename, "rb") as f:
+    text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  try:
+    sections = {}
+    flags = []
+    matches = list(section.finditer(text))
+    for k in range(0, len(matches)):
+      name = matches[k].group(1).strip().lower().decode("ascii")
+      end = matches[k+1].start() if k+1 < len(matches) else len(text)
+      sections[name] = (matches[k].end(), end, matches[k].group(2).strip().lower().decode("ascii"))
+      flags.append(name)
+    for name in ('atoms', 'gto', 'mo'):
+      if name not in sections:
+        raise IOError("%s: no [%s] section (only molden files with [GTO] are supported)" % (filename, name.upper()))
+
+    #-------------------------------------
+    # [Atoms] Angs / AU
+    #---
+    start, end, unit = sections['atoms']
+    geo_info, geo_spec = [], []
+    for line in text[start:end].decode("ascii").splitlines():
+      words = line.split()
+      if len(words) >= 6:
+        geo_info.append([words[0], words[1], words[2]])
+        geo_spec.append([float(w) for w in words[3:6]])
+    geo_spec = numpy.array(geo_spec, dtype=float)
+    if not unit.startswith('au') and not unit.startswith('(au'):
+      geo_spec = geo_spec*ang2au
+
+    #-------------------------------------
+    # [GTO]: shells of every atom
+    #---
+    spherical_l = set()
+    if '5d' in flags or '5d7f' in flags or '5d10f' in flags:
+      spherical_l.add(2)
+    if '7f' in flags or '5d7f' in flags or ('5d' in flags and '5d10f' not in flags):
+      spherical_l.add(3)
+    if '9g' in flags:
+      spherical_l.update([4, 5, 6])
+
+    start, end, unit = sections['gto']
+    lines = text[start:end].decode("ascii").splitlines()
+    shells = []
+    atom = -1
+    i = 0
+    while i < len(lines):
+      words = lines[i].split()
+      i += 1
+      if len(words) == 2 and words[0].isdigit():
+        atom = int(words[0]) - 1
+      elif len(words) >= 2 and words[0].lower() in ('s', 'p', 'd', 'f', 'g', 'h', 'i', 'sp'):
+        pnum = int(words[1])
+        prims = numpy.array([[to_float(w) for w in lines[i+k].split()] for k in range(0, pnum)])
+        i += pnum
+        if words[0].lower() == 'sp':
+          shells.append((atom, 's', prims[:,[0,1]]))
+          shells.append((atom, 'p', prims[:,[0,2]]))
+        else:
+          shells.append((atom, words[0].lower(), prims[:,:2]))
+
+    shell_l = [lquant[shell[1]] for shell in shells]
+    spherical = [l in spherical_l for l in shell_l if l >= 2]
+    if any(spherical) and not all(spherical):
+      raise IOError("%s: mixed spherical and cartesian shells are not supported by the native reader" % filename)
+
+    #-------------------------------------
+    # [MO]: headers now, coefficient blocks
+    # as byte ranges for later
+    #---
+    start, end, unit = sections['mo']
+    energies, occupations, spins, syms, blocks = [], [], [], [], []
+    current = {}
+    block_start = None
+    for match in header_keys.finditer(text, start, end):
+      key = match.group(1).lower().decode("ascii")
+      if key in current:                                        #: next MO
+        blocks.append((block_start, match.start()))
+        energies.append(current.get('ene', 0.))
+        occupations.append(current.get('occup', 0.))
+        spins.append(current.get('spin', 0))
+        syms.append(current.get('sym', ''))
+        current = {}
+      value = match.group(2).decode("ascii")
+      if key == 'sym':
+        current[key] = value
+      elif key == 'spin':
+        current[key] = 1 if value.lower().startswith('beta') else 0
+      else:
+        current[key] = to_float(value)
+      block_start = match.end()
+    if current:
+      blocks.append((block_start, end))
+      energies.append(current.get('ene', 0.))
+      occupations.append(current.get('occup', 0.))
+      spins.append(current.get('spin', 0))
+      syms.append(current.get('sym', ''))
+  finally:
+    text.close()
+
+  spins = numpy.array(spins, dtype=int)
+  if numpy.any(spins == 1):
+    syms = [syms[i] + ('_b' if spins[i] else '_a') for i in range(0, len(syms))]
+
+  wfn.geo_spec = geo_spec
+  wfn.geo_info = numpy.array(geo_info, dtype=str)
+  wfn.shell_atom = numpy.array([shell[0] for shell in shells], dtype=int)
+  wfn.shell_l = numpy.array(shell_l, dtype=int)
+  wfn.shell_pnum = numpy.array([len(shell[2]) for shell in shells], dtype=int)
+  wfn.primitives = numpy.concatenate([shell[2] for shell in shells]) if shells else numpy.zeros((0,2))
+  norms = contraction_norms(wfn.shell_l, wfn.shell_pnum, wfn.primitives)
+  if len(norms) > 0 and numpy.abs(norms - 1.).max() > norm_tolerance:
+    wfn.primitives[:,1] /= numpy.repeat(numpy.sqrt(norms), wfn.shell_pnum)
+  wfn.spherical = bool(any(spherical))
+  wfn.mo_energies = numpy.array(energies, dtype=float)
+  wfn.mo_occupations = numpy.array(occupations, dtype=float)
+  wfn.mo_spins = spins
+  wfn.mo_syms = numpy.array(syms, dtype=str)
+  wfn.blocks = numpy.array(blocks, dtype=numpy.int64).reshape(-1, 2)
+
+
+#--------------------------------------------
+# Wave function from a molden file
+#--------------------------------------------
+class MoldenQC(object):
+  def __init__(self, filename, sidecar=True):
+    self.filename = filename
+    self.sidecar = filename + ".npz" if sidecar else None
+    self._coefficients = None
+    self._mo_spec = None
+
+    stat = os.stat(filename)
+    self.source = numpy.array([stat.st_size, stat.st_mtime, sidecar_version], dtype=float)
+    if self.sidecar is None or not self.load_sidecar():
+      read_text(self, filename)
+    self.build_basis()
+
+  #-------------------------------------
+  # Sidecar: valid for this file only
+  #---
+  def load_sidecar(self):
+    if not os.path.isfile(self.sidecar):
+      return False
+    try:
+      arrays = npz_memmap(self.sidecar)
+    except (IOError, OSError, ValueError, KeyError, zipfile.BadZipfile):
+      return False
+    if 'source' not in arrays or not numpy.array_equal(arrays['source'], self.source):
+      return False
+    for name in ('geo_spec', 'geo_info', 'shell_atom', 'shell_l', 'shell_pnum', 'primitives',
+                 'mo_energies', 'mo_occupations', 'mo_spins', 'mo_syms', 'blocks'):
+      setattr(self, name, arrays[name])
+    self.spherical = bool(arrays['spherical'])
+    self._coefficients = arrays['coefficients']                 #: memory map, read on use
+    return True
+
+  def write_sidecar(self):
+    tmp_name = "%s.%i.tmp" % (self.sidecar, os.getpid())
+    try:
+      with open(tmp_name, "wb") as f:
+        numpy.savez(f, source=self.source, geo_spec=self.geo_spec, geo_info=self.geo_info,
+                       shell_atom=self.shell_atom, shell_l=self.shell_l, shell_pnum=self.shell_pnum,
+                       primitives=self.primitives, spherical=numpy.array(self.spherical),
+                       mo_energies=self.mo_energies, mo_occupations=self.mo_occupations,
+                       mo_spins=self.mo_spins, mo_syms=self.mo_syms, blocks=self.blocks,
+                       coefficients=self._coefficients)
+      os.rename(tmp_name, self.sidecar)
+    except (IOError, OSError):                                  #: e.g. read-only directory; not needed
+      if os.path.isfile(tmp_name):
+        os.remove(tmp_name)
+
+  #-------------------------------------
+  # orbkit's ao_spec and ao_spherical
+  #---
+  def build_basis(self):
+    self.ao_spec = []
+    self.ao_spherical = [] if self.spherical else None
+    p0 = 0
+    for i in range(0, len(self.shell_l)):
+      l = int(self.shell_l[i])
+      shell = {'atom':   int(self.shell_atom[i]),
+               'type':   'spdfghi'[l],
+               'pnum':   int(self.shell_pnum[i]),
+               'coeffs': numpy.array(self.primitives[p0:p0+self.shell_pnum[i]], dtype=float)}
+      p0 += self.shell_pnum[i]
+      if self.spherical:
+        if l == 1:
+          self.ao_spherical.extend([[i, (1, m)] for m in (1, -1, 0)])   #: px, py, pz
+        else:
+          self.ao_spherical.extend([[i, (l, m)] for m in spherical_m(l)])
+      elif l in cartesian_exponents:
+        shell['lxlylz'] = numpy.array(cartesian_exponents[l], dtype=int)
+      self.ao_spec.append(shell)
+    if self.spherical:
+      self.n_ao = len(self.ao_spherical)
+    else:
+      self.n_ao = sum((l+1)*(l+2)//2 for l in self.shell_l)
+
+  #-------------------------------------
+  # Coefficients and mo_spec on first use
+  #---
+  @property
+  def coefficients(self):
+    if self._coefficients is None:
+      self._coefficients = read_coefficients(self.filename, self.blocks, len(self.mo_energies), self.n_ao)
+      if self.sidecar is not None:
+        self.write_sidecar()
+    return self._coefficients
+
+  @property
+  def mo_spec(self):
+    if self._mo_spec is None:
+      coefficients = self.coefficients
+      self._mo_spec = [{'coeffs':  coefficients[i],
+                        'energy':  float(self.mo_energies[i]),
+                        'occ_num': float(self.mo_occupations[i]),
+                        'sym':     str(self.mo_syms[i])} for i in range(0, len(self.mo_energies))]
+    return self._mo_spec
+
+  def todict(self):
+    return {'geo_spec':     self.geo_spec,
+            'geo_info':     self.geo_info,
+            'ao_spec':      self.ao_spec,
+            'ao_spherical': self.ao_spherical,
+            'mo_spec':      list(self.mo_spec)}
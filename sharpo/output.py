@@ -0,0 +1,166 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   output.py :: binary output (HDF5 or npz) of a sharpo run in
+#                one file
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: spin_labels(syms, spin_polarized)
+#      Returns "a", "b" or "" for every MO
+#
+#   :: projection_datasets(result)
+#      Returns the datasets of a result of api.project
+#
+#   :: coefficient_datasets(coeff)
+#      Returns the datasets of a result of api.coefficients
+#
+#   :: write(output_file, out_format, datasets, metadata)
+#      Parameters
+#      [string]     :: output_file :: output file string; the extension
+#                                     (.h5 or .npz) is added
+#      [string]     :: out_format  :: "hdf5" or "npz"
+#      [dictionary] :: datasets    :: name -> numpy array; "/" in the names
+#                                     are HDF5 groups
+#      [dictionary] :: metadata    :: name -> number or string (run settings)
+#      Returns the file name
+#
+#   :: write_hdf5(filename, datasets, metadata)
+#   :: write_npz(filename, datasets, metadata)
+#
+#  Comments
+#  :: Layout (both formats):
+#       projection/all_c        [center, radius, l, mo] cumulative coefficients
+#       projection/discrete     [center, l, mo] at the cutoff radius
+#       projection/smeared      [channel, x, center, l]
+#       projection/x            [x] energies [eV] minus E_Fermi
+#       projection/centers      [center, xyz] (a.u.), projection/radii [radius] (a.u.)
+#       projection/selected_MO, energies [a.u.], syms, spin   [mo]
+#       projection/error        [center, radius, l, mo] estimated error of all_c
+#                               (cubature only)
+#       projection/angular_error [center, mo] largest error of the angular
+#                               integrals (cubature only)
+#       coefficients/coeff      [mo, atom, l] (--coeff; l = s,...,i)
+#       coefficients/smeared    [channel, x, atom, l]
+#       coefficients/x, selected_MO, energies, syms, spin
+#     The metadata are attributes of the root group (HDF5) or the JSON
+#     string "metadata" (npz).
+#  :: HDF5: every array is a chunked, gzip compressed dataset (with the
+#     shuffle filter). h5py is imported only for this format.
+#  :: npz: zip-deflate compressed; npz has no chunks.
+#
+#  Last edited
+#  17.10.2026 :: estimated errors of the cubature
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import numpy
+import json
+import os
+
+from . import smearing
+
+extensions = {"hdf5": ".h5", "npz": ".npz"}
+compression_level = 4                                           #: gzip level of the HDF5 datasets
+
+#--------------------------------------------
+# Spin label of every MO
+#--------------------------------------------
+def spin_labels(syms, spin_polarized):
+  channels, n_channels = smearing.spin_channels(syms, spin_polarized)
+  if not spin_polarized:
+    return numpy.array([""]*len(syms))
+  return numpy.array([["a", "b", ""][c] for c in channels])     #: channel -1 -> ""
+
+
+#--------------------------------------------
+# Datasets of api.project
+#--------------------------------------------
+def projection_datasets(result):
+  datasets = {'projection/all_c':       result['all_c'],
+              'projection/discrete':    result['all_c'][:,-1],
+              'projection/smeared':     result['smeared'],
+              'projection/x':           result['x'],
+              'projection/centers':     result['centers'],
+              'projection/radii':       result['radii'],
+              'projection/selected_MO': numpy.array(result['selected_MO'], dtype=int),
+              'projection/energies':    result['energies'],
+              'projection/syms':        numpy.array(result['syms'], dtype=str),
+              'projection/spin':        spin_labels(result['syms'], result['spin_polarized'])}
+  if result.get('error') is not None:
+    datasets['projection/error'] = result['error']
+    datasets['projection/angular_error'] = result['angular_error']
+  return datasets
+
+
+#--------------------------------------------
+# Datasets of api.coefficients
+#--------------------------------------------
+def coefficient_datasets(coeff):
+  return {'coefficients/coeff':       coeff['coeff'],
+          'coefficients/smeared':     coeff['smeared'],
+          'coefficients/x':           coeff['x'],
+          'coefficients/selected_MO': numpy.array(coeff['selected_MO'], dtype=int),
+          'coefficients/energies':    coeff['energies'],
+          'coefficients/syms':        numpy.array(coeff['syms'], dtype=str),
+          'coefficients/spin':        spin_labels(coeff['syms'], coeff['spin_polarized'])}
+
+
+#--------------------------------------------
+# One HDF5 file
+#--------------------------------------------
+def write_hdf5(filename, datasets, metadata):
+  import h5py
+  with h5py.File(filename, "w") as f:
+    for name in sorted(datasets):
+      data = numpy.asarray(datasets[name])
+      if data.dtype.kind == "U":
+        data = numpy.char.encode(data, "utf-8")                 #: HDF5 stores fixed length byte strings
+      if data.ndim == 0 or data.size == 0:
+        f.create_dataset(name, data=data)
+      else:
+        f.create_dataset(name, data=data, chunks=True, shuffle=True,
+                         compression="gzip", compression_opts=compression_level)
+    for key in sorted(metadata):
+      f.attrs[key] = metadata[key]
+
+
+#--------------------------------------------
+# One npz file
+#--------------------------------------------
+def write_npz(filename, datasets, metadata):
+  arrays = dict((name, numpy.asarray(data)) for name, data in datasets.items())
+  arrays['metadata'] = numpy.array(json.dumps(metadata, sort_keys=True))
+  with open(filename, "wb") as f:
+    numpy.savez_compressed(f, **arrays)
+
+
+#--------------------------------------------
+# Binary output of one run
+#--------------------------------------------
+def write(output_file, out_format, datasets, metadata):
+  filename = output_file + extensions[out_format]
+  tmp_name = "%s.%i.tmp" % (filename, os.getpid())
+  if out_format == "hdf5":
+    write_hdf5(tmp_name, datasets, metadata)
+  else:
+    write_npz(tmp_name, datasets, metadata)
+  os.rename(tmp_name, filename)                                 #: never a half written file
+  return filename
@@ -0,0 +1,122 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   parallel.py :: distributes independent work units of the
+#                  projection over a pool of processes, and
+#                  blocks of points over a pool of threads
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: run(task, units, nproc, data)
+#      Parameters
+#      [function]   :: task  :: module level function task(unit); reads the
+#                               shared data from parallel.worker_data
+#      [list]       :: units :: work units, e.g. (center, l, m) tuples
+#      [int]        :: nproc :: number of worker processes
+#      [dictionary] :: data  :: data every worker needs (wave function,
+#                               grids, ...); sent once per worker
+#      Returns the list of results in the order of units
+#
+#   :: point_blocks(n_points, block)
+#      Returns the blocks [(p0, p1), ...] of block points (the last one shorter)
+#
+#   :: map_threads(task, items, threads)
+#      Parameters
+#      [function]   :: task    :: task(item); must be thread-safe
+#      [list]       :: items   :: arguments of task
+#      [int]        :: threads :: number of threads (1 -> in this thread)
+#      Returns the list of results in the order of items
+#
+#  Comments
+#  :: The results always come back in the order of units and the
+#     caller reduces them in that order. As long as the units do not
+#     depend on nproc, the output is bit-identical for any number of
+#     workers (nproc = 1 runs the same units in this process).
+#  :: Workers are forked and the tasks are module level functions of
+#     the sharpo package (projection.projection_unit, adaptive.cubature_unit).
+#  :: Threads share the memory of their process (no pickling, no copies
+#     of the wave function). They only pay off for tasks whose work is
+#     in numpy/BLAS calls which release the GIL. The thread pool of a
+#     process is kept for later calls and made anew in forked workers.
+#     As for the processes, the blocks must not depend on the number of
+#     threads to give the same result for any number of them.
+#
+#  Last edited
+#  17.10.2026 :: thread pool (map_threads)
+#  17.10.2026 :: tasks live in the package modules
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import multiprocessing
+import multiprocessing.pool
+import os
+
+worker_data = {}                                                #: shared data of the current process
+thread_pool = {}                                                #: 'pool', 'threads' and 'pid' of the thread pool of this process
+
+#--------------------------------------------
+# Pool initializer: data arrives once per worker
+#--------------------------------------------
+def init_worker(data):
+  worker_data.clear()
+  worker_data.update(data)
+
+
+#--------------------------------------------
+# Runs task for all units on nproc processes
+#--------------------------------------------
+def run(task, units, nproc, data=None):
+  if data is None:
+    data = {}
+  units = list(units)
+
+  if nproc <= 1 or len(units) <= 1:
+    init_worker(data)
+    return [task(unit) for unit in units]
+
+  pool = multiprocessing.Pool(min(nproc, len(units)), initializer=init_worker, initargs=(data,))
+  try:
+    results = pool.map(task, units, chunksize=1)
+  finally:
+    pool.close()
+    pool.join()
+  return results
+
+
+#--------------------------------------------
+# Blocks of a fixed number of points
+#--------------------------------------------
+def point_blocks(n_points, block):
+  return [(p0, min(p0+block, n_points)) for p0 in range(0, n_points, block)]
+
+
+#--------------------------------------------
+# Runs task for all items on a pool of threads
+#--------------------------------------------
+def map_threads(task, items, threads):
+  items = list(items)
+  if threads <= 1 or len(items) <= 1:
+    return [task(item) for item in items]
+
+  if thread_pool.get('pid') != os.getpid() or thread_pool.get('threads') != threads:
+    if thread_pool.get('pid') == os.getpid():
+      thread_pool['pool'].close()
+    thread_pool.update({'pool': multiprocessing.pool.ThreadPool(threads), 'threads': threads, 'pid': os.getpid()})
+  return thread_pool['pool'].map(task, items, chunksize=1)
@@ -0,0 +1,179 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   profiling.py :: stage timings, integrand counters and peak
+#                   memory of one run (--profile)
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: cpu_time(children)
+#      Returns the CPU time (user + system) of this process [s];
+#      children = True adds the finished child processes (workers)
+#
+#   :: peak_memory()
+#      Returns the peak resident set size of this process and of the
+#      finished child processes [MB] (None without the resource module)
+#
+#   :: stage(profile, name)
+#      Context manager; adds the wall and CPU time of the block to
+#      profile (nothing is done for profile = None)
+#
+#   :: Profile()
+#      Collects the profile of one run
+#      :: add_stage(name, wall, cpu)
+#      :: start(name), stop() -> stage which ends at stop(), the next
+#                                start() or report()
+#      :: add_units(units)   -> integrand counters of the work units
+#      :: report()           -> dictionary (see Comments)
+#      :: write(filename)    -> report as JSON
+#
+#  Comments
+#  :: report() = {'stages':  [{'name', 'wall', 'cpu'}, ...] in the order of the run,
+#                 'units':   [{'center', 'l', 'm', ...counters}, ...] adaptive
+#                            projection only, one entry per (center, l, m),
+#                 'lm':      counters summed over the centers, key "l,m",
+#                 'totals':  counters summed over all units,
+#                 'info':    run settings, 'peak_memory_mb'}
+#  :: Counters of one unit (adaptive.cubature_unit):
+#       func_calls, func_points     :: calls of the angular integrand and points
+#       func2_calls, func2_points   :: calls of the radial integrand and radii
+#       angular_integrals           :: cubatures over (theta, phi) (= func2_points
+#                                      without --converge)
+#       retired, retired_lm         :: --converge: MOs retired after the first
+#                                      pass of an angular integral, and angular
+#                                      integrals in which all MOs were retired
+#       max_depth_angular/_radial   :: largest number of refinement rounds of
+#                                      one cubature (integrand calls - 1; the
+#                                      h-adaptive cubature evaluates every round
+#                                      of bisected regions in one vectorized call)
+#       t_evaluate, t_ylm           :: wall time in the MO evaluation (orbkit
+#                                      rho_compute or native) and in sh.sh / sh.rsh
+#       wall, cpu                   :: wall and CPU time of the unit (worker)
+#  :: Stage CPU times include the finished workers of parallel.run.
+#
+#  Last edited
+#  17.10.2026 :: counters of --converge
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import contextlib
+import json
+import time
+import sys
+import os
+try:
+  import resource
+except ImportError:                                             #: not on Windows
+  resource = None
+
+counter_names = ['func_calls', 'func_points', 'func2_calls', 'func2_points', 'angular_integrals',
+                 'retired', 'retired_lm', 'max_depth_angular', 'max_depth_radial',
+                 't_evaluate', 't_ylm', 'wall', 'cpu']
+
+#--------------------------------------------
+# CPU time of this process (and its workers)
+#--------------------------------------------
+def cpu_time(children=True):
+  t = os.times()
+  if children:
+    return t[0] + t[1] + t[2] + t[3]
+  return t[0] + t[1]
+
+
+#--------------------------------------------
+# Peak resident set size [MB]
+#--------------------------------------------
+def peak_memory():
+  if resource is None:
+    return None
+  scale = 1. if sys.platform == "darwin" else 1024.               #: bytes on macOS, kB on Linux
+  own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+  return max(own, children)*scale/(1024.*1024.)
+
+
+#--------------------------------------------
+# Wall and CPU time of a block
+#--------------------------------------------
+@contextlib.contextmanager
+def stage(profile, name):
+  if profile is None:
+    yield
+    return
+  wall0 = time.time()
+  cpu0 = cpu_time()
+  try:
+    yield
+  finally:
+    profile.add_stage(name, time.time() - wall0, cpu_time() - cpu0)
+
+
+#--------------------------------------------
+# Profile of one run
+#--------------------------------------------
+class Profile(object):
+
+  def __init__(self, info=None):
+    self.stages = []
+    self.units = []
+    self.info = dict(info or {})
+    self.running = None                                         #: (name, wall, cpu) of the open stage
+
+  def add_stage(self, name, wall, cpu):
+    self.stages.append({'name': name, 'wall': wall, 'cpu': cpu})
+
+  def start(self, name):
+    self.stop()
+    self.running = (name, time.time(), cpu_time())
+
+  def stop(self):
+    if self.running is not None:
+      name, wall0, cpu0 = self.running
+      self.running = None
+      self.add_stage(name, time.time() - wall0, cpu_time() - cpu0)
+
+  def add_units(self, units):
+    self.units.extend(units)
+
+  def report(self):
+    self.stop()
+    lm = {}
+    totals = dict((name, 0) for name in counter_names)
+    for unit in self.units:
+      key = "%i,%i" % (unit['l'], unit['m'])
+      if key not in lm:
+        lm[key] = dict((name, 0) for name in counter_names)
+      for name in counter_names:
+        if name.startswith('max_'):
+          lm[key][name] = max(lm[key][name], unit[name])
+          totals[name] = max(totals[name], unit[name])
+        else:
+          lm[key][name] += unit[name]
+          totals[name] += unit[name]
+    return {'info': self.info,
+            'stages': self.stages,
+            'units': self.units,
+            'lm': lm,
+            'totals': totals,
+            'peak_memory_mb': peak_memory()}
+
+  def write(self, filename):
+    with open(filename, "w") as f:
+      json.dump(self.report(), f, indent=1, sort_keys=True)
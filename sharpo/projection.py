@@ -0,0 +1,633 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   projection.py :: non-adaptive projection of the molecular
+#                    orbitals onto spherical harmonics on a
+#                    fixed spherical product grid
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: evaluate_mos(qc, x, y, z, numproc, center, cutoff_r)
+#      Parameters
+#      [orbkit qc]    :: qc       :: wave function (only the MOs in qc.mo_spec are evaluated)
+#                                    or native wave function from gaussians.native_qc
+#      [numpy arrays] :: x, y, z  :: cartesian grid points
+#      [int]          :: numproc  :: number of subprocesses within orbkit
+#      [numpy array]  :: center   :: native only: center of the integration sphere
+#      [float]        :: cutoff_r :: native only: radius of the integration sphere
+#      Returns the MO values with shape (n_MO, n_points)
+#
+#   :: n_functions(qc)
+#      Returns the number of functions (MOs, or AOs for the AO projection)
+#      evaluate_mos returns for qc
+#
+#   :: mo_subset(qc, i0, i1)
+#      Returns a wave function with the MOs i0 <= i < i1 of qc only
+#
+#   :: mo_select(qc, indices)
+#      Returns a wave function with the MOs indices of qc only
+#
+#   :: block_size(n, fixed, per_item, max_memory, what)
+#      Returns the largest number of items (n or a multiple of
+#      gaussians.mo_chunk) with fixed + items*per_item bytes within
+#      max_memory [MB] (0 -> n). Raises MemoryBudgetError if not even
+#      smallest_block(n) items (what, e.g. "MO") fit
+#
+#   :: smallest_block(n)
+#      Returns the fewest items of a block: gaussians.mo_chunk, or n if
+#      there are fewer
+#
+#   :: chunked_block(n_block, n)
+#      Returns n_block rounded up to a multiple of gaussians.mo_chunk (<= n)
+#
+#   :: mo_block_size(n_mo, n_points, mo_block, max_memory, fixed)
+#      Parameters
+#      [int]          :: n_mo       :: number of MOs
+#      [int]          :: n_points   :: number of grid points evaluated at once
+#      [int]          :: mo_block   :: MOs per block (0 -> from max_memory;
+#                                        rounded up by chunked_block)
+#      [float]        :: max_memory :: memory budget [MB] (0 -> unlimited)
+#      [float]        :: fixed      :: bytes of the other buffers within max_memory
+#      Returns the number of MOs evaluated at once (block_size)
+#
+#   :: evaluator_bytes(qc, n_points)
+#      Returns the memory of the AO values and temporaries of the evaluator
+#      for n_points grid points [bytes]
+#
+#   :: sweep_shells(qc, qgrid, n_centers, n_func, nproc, max_memory, ao_mode)
+#      Returns the radial shells per work unit of scheduled_sweep, the
+#      memory of every worker [MB] and the number of workers (<= nproc)
+#      under the budget max_memory of all processes (radial_block, 0 and
+#      nproc without budget). Shells and worker memory do not depend on
+#      nproc
+#
+#   :: ylm_table(lmax, theta, phi, w_ang, real_sh)
+#      Returns conj(Ylm) * w_ang for all (l,m) with l <= lmax, shape (n_lm, n_ang);
+#      row index = l**2 + l + m. For real_sh = True the real harmonics Slm
+#      are taken instead and the table is float64
+#
+#   :: fixed_grid(cutoff_r, lmax, n_r, order, real_sh, radii)
+#      Parameters
+#      [float]        :: cutoff_r :: integration radius (a.u.)
+#      [int]          :: lmax     :: highest l of the projection
+#      [int]          :: n_r      :: number of radial Gauss-Legendre points
+#      [int]          :: order    :: degree of the angular Gauss product grid,
+#                                    at least 2*lmax (ValueError otherwise)
+#      [bool]         :: real_sh  :: projection onto real harmonics (no complex arithmetic)
+#      [list]         :: radii    :: None or ascending radii (a.u.) of a radius sweep;
+#                                    radii[-1] replaces cutoff_r
+#      Returns the quadrature grid as dictionary qgrid with the entries
+#      'r', 'w_rad' (= w_r * r**2), 'theta', 'phi', 'ylm', 'lmax', 'cutoff_r',
+#      'radii' and 'w_panel' (w_rad split into the shells between the radii,
+#      shape (n_radii, n_r)).
+#      qgrid does not depend on the center and is shared by all centers
+#
+#   :: gauss_projection(qc, center, qgrid, numproc)
+#      Parameters
+#      [orbkit qc]    :: qc       :: wave function
+#      [numpy array]  :: center   :: center of the expansion (a.u.)
+#      [dictionary]   :: qgrid    :: quadrature grid from fixed_grid
+#      [int]          :: numproc  :: number of subprocesses within orbkit
+#      Returns all_c[l,mo]
+#
+#   :: angular_projection(qc, center, qgrid, numproc, ir0, ir1, mo_block, max_memory, fixed)
+#      Integral [2] on the fixed grid for the radial shells ir0 <= ir < ir1
+#      (default: all); returns philm[mo, ir, lm]. The MOs are evaluated
+#      in blocks (see mo_block_size); fixed are the bytes of the buffers
+#      of the work unit (unit_bytes)
+#
+#   :: unit_bytes(qc, qgrid, n_func, n_shells, ao_mode)
+#      Returns the memory of a work unit of n_shells radial shells [bytes]:
+#      Ylm table, evaluator, coordinates, philm and the density temporaries
+#      (without the MO values of the blocks)
+#
+#   :: radial_sum(philm, w_rad, lmax)
+#      Integral [1] and the sum over m; returns all_c[l,mo]
+#      (= sum_over_m(density_lm(philm, w_rad), lmax))
+#
+#   :: scheduled_projection(qc, centers, qgrid, nproc, coeffs)
+#      Parameters
+#      [orbkit qc]    :: qc       :: wave function
+#      [numpy array]  :: centers  :: centers[center, xyz] (a.u.)
+#      [dictionary]   :: qgrid    :: quadrature grid from fixed_grid
+#      [int]          :: nproc    :: number of worker processes
+#      [numpy array]  :: coeffs   :: None or MO coefficients -> AO projection
+#      Returns all_c[center,l,mo] at the radius qgrid['cutoff_r']
+#
+#   :: scheduled_sweep(qc, centers, qgrid, nproc, coeffs, mo_block, max_memory)
+#      Same parameters as scheduled_projection plus the MO blocking
+#      (max_memory is the budget of all processes). Returns the cumulative
+#      all_c[center,radius,l,mo] at every radius of qgrid['radii']. The
+#      work is split into blocks of radial shells (per center) and
+#      distributed with parallel.run
+#
+#   :: ao_sweep(qc, centers, qgrid, nproc, max_memory)
+#      The work units of scheduled_sweep for the AOs of qc; yields
+#      phi_ao[ao, ir, lm] on all shells of qgrid center by center (with a
+#      budget max_memory, one center is projected after the other)
+#
+#   :: mo_sweep(phi_ao, coeffs, qgrid, max_memory)
+#      Returns all_c[radius,l,mo] of one center for the MOs coeffs[mo, ao]
+#      from phi_ao of ao_sweep (same result as scheduled_sweep with
+#      coeffs); the MOs are transformed in blocks within max_memory
+#
+#   :: ao_projection(qc, center, qgrid, numproc)
+#      Same parameters as gauss_projection. Projects every contracted AO
+#      instead of the MOs and returns phi_ao[ao, ir, lm]
+#
+#   :: mo_projection(phi_ao, coeffs, qgrid)
+#      Parameters
+#      [numpy array]  :: phi_ao   :: AO projections from ao_projection
+#      [numpy array]  :: coeffs   :: MO coefficient matrix coeffs[mo, ao]
+#      [dictionary]   :: qgrid    :: quadrature grid from fixed_grid
+#      Returns all_c[l,mo]
+#
+#   :: mo_philm(phi_ao, coeffs)
+#      Returns philm[mo, ir, lm] from the AO projections
+#
+#   :: coefficient_matrix(mo_spec)
+#      Returns the MO coefficients of an orbkit mo_spec as coeffs[mo, ao]
+#
+#  Comments
+#  :: Solves the same two integrals as the cubature path (adaptive.py)
+#       [1] c_{i,l}(R_0) = \sum_m  \int_0^{R_0} r^2 | \varphi_{i,lm}(r) |^2 dr
+#       [2] \varphi_{i,lm}(r) = \int Y_{lm}(\theta,\phi)* \psi_i(r,\theta,\phi) d\Omega
+#     but all MOs are evaluated only once on the product grid and
+#     every (l,m) is obtained from one contraction with the Ylm table.
+#  :: scheduled_projection uses a fixed number of shells per work unit
+#     (radial_block) and adds the partial sums in the order of the units,
+#     so the result does not depend on the number of workers.
+#  :: ao_projection + mo_projection: \varphi_{i,lm}(r) is linear in the
+#     MO coefficients, \varphi_{i,lm}(r) = \sum_\mu C_{i\mu} \varphi_{\mu,lm}(r).
+#     The quadrature is done once for the AOs; every set of MOs (e.g. a
+#     new energy window) only needs one matrix product. api.project keeps
+#     phi_ao of every center in the projection cache (ao_sweep, mo_sweep).
+#  :: The Ylm table is orthogonal on the angular grid only for
+#     2*lmax <= order (quadrature.py); with a lower order the
+#     coefficients of high l take in other l, so fixed_grid refuses it.
+#  :: Radius sweep: the radial grid consists of Gauss-Legendre panels
+#     between the radii. [1] is summed per panel and accumulated, so
+#     all radii cost about as much as the largest one alone.
+#  :: MO blocks: the orbital values and their temporaries take about
+#     bytes_per_value bytes per MO and grid point. The blocks are
+#     multiples of gaussians.mo_chunk, the MOs of the native evaluator and
+#     mo_philm are made in these chunks (gaussians.mo_product), and the
+#     contractions with the Ylm table and the radial weights are done
+#     element by element. So every element of philm is computed exactly
+#     as without blocks and the results do not depend on the block size
+#     (orbkit's MOs may differ in the last bits). The AOs of the AO
+#     projection are split in the same way.
+#  :: --max-memory is a budget of the peak memory of all processes: the
+#     Ylm table, the evaluator, philm / phi_ao, the density temporaries
+#     and the partial sums kept for the reduction are counted, and the
+#     MO (AO) blocks get the rest. If a work unit of radial_block shells
+#     does not fit, the units get fewer shells (the partial sums are then
+#     added in another order, which changes the last digits). If not even
+#     one shell with one MO fits, MemoryBudgetError is raised. The
+#     memory of python, numpy and the input itself is not counted.
+#  :: The units and the memory of a worker are chosen as for one worker
+#     (a worker never gets more than its unit needs with all MOs in one
+#     block); -p only sets how many of them run at once within the
+#     budget. So the result is the same for any -p with --max-memory too.
+#
+#  Last edited
+#  17.10.2026 :: fixed_grid requires 2*lmax <= order
+#  17.10.2026 :: MO blocks of whole chunks (gaussians.mo_chunk)
+#  17.10.2026 :: units under --max-memory do not depend on -p
+#  17.10.2026 :: --max-memory as budget of all buffers
+#  17.10.2026 :: ao_sweep and mo_sweep
+#  17.10.2026 :: mo_select
+#  17.10.2026 :: orbkit imported on first use
+#  17.10.2026 :: MO blocks
+#  17.10.2026 :: radius sweep
+#  17.10.2026 :: native Gaussian evaluator
+#  17.10.2026 :: work units for the process pool
+#  17.10.2026 :: quadrature grid shared between centers
+#  17.10.2026 :: real harmonics
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import numpy
+
+from . import sh
+from . import quadrature
+from . import parallel
+from . import gaussians
+
+radial_block = 8                                                #: radial shells per work unit
+bytes_per_value = 32                                            #: memory per MO and grid point of one block
+megabyte = 1024.*1024.
+
+
+#--------------------------------------------
+# --max-memory is too small for one block
+#--------------------------------------------
+class MemoryBudgetError(ValueError):
+  pass
+
+
+#--------------------------------------------
+# MO values on an arbitrary set of points
+#--------------------------------------------
+def evaluate_mos(qc, x, y, z, numproc, center=None, cutoff_r=None):
+  if isinstance(qc, dict) and qc.get('native'):
+    return gaussians.evaluate(qc, x, y, z, center, cutoff_r)
+
+  from orbkit import core, grid                                 #: only loaded if orbkit evaluates
+  grid.x = numpy.array(x, copy=True)
+  grid.y = numpy.array(y, copy=True)
+  grid.z = numpy.array(z, copy=True)
+  grid.is_initialized = True
+
+  return core.rho_compute(qc,
+                          calc_mo=True,
+                          slice_length=1e4,
+                          drv=None,
+                          numproc=numproc)
+
+
+#--------------------------------------------
+# Number of functions evaluate_mos returns
+#--------------------------------------------
+def n_functions(qc):
+  if isinstance(qc, dict) and qc.get('native'):
+    return qc['n_ao'] if qc['coeffs'] is None else qc['coeffs'].shape[0]
+  if isinstance(qc, dict):
+    return len(qc['mo_spec'])
+  return len(qc.mo_spec)
+
+
+#--------------------------------------------
+# Wave function with a block of MOs
+#--------------------------------------------
+def mo_subset(qc, i0, i1):
+  if isinstance(qc, dict) and qc.get('native'):
+    sub = dict(qc)
+    if qc['coeffs'] is None:                                    #: block of AOs
+      sub['coeffs'] = numpy.identity(qc['n_ao'])[i0:i1]
+    else:
+      sub['coeffs'] = qc['coeffs'][i0:i1]
+    return sub
+  sub = dict(qc) if isinstance(qc, dict) else qc.todict()
+  sub['mo_spec'] = sub['mo_spec'][i0:i1]
+  return sub
+
+
+#--------------------------------------------
+# Wave function with a selection of MOs
+#--------------------------------------------
+def mo_select(qc, indices):
+  indices = [int(i) for i in indices]
+  if isinstance(qc, dict) and qc.get('native'):
+    sub = dict(qc)
+    sub['coeffs'] = qc['coeffs'][indices]
+    return sub
+  sub = dict(qc) if isinstance(qc, dict) else qc.todict()
+  if isinstance(sub['mo_spec'], list):
+    sub['mo_spec'] = [sub['mo_spec'][i] for i in indices]
+  else:
+    sub['mo_spec'] = sub['mo_spec'][indices]                    #: orbkit's MOClass
+  return sub
+
+
+#--------------------------------------------
+# Items per block within the memory budget
+#--------------------------------------------
+def block_size(n, fixed, per_item, max_memory, what="MO"):
+  if max_memory <= 0.:
+    return max(1, n)
+  n_min = smallest_block(n)
+  n_block = int((max_memory*megabyte - fixed) // max(per_item, 1.))
+  if n_block < n_min:
+    raise MemoryBudgetError("--max-memory %.3f MB is too small: a block of %i %ss needs %.3f MB"
+                            % (max_memory, n_min, what, (fixed + n_min*per_item)/megabyte))
+  if n_block >= n:
+    return max(1, n)
+  return n_block - n_block % gaussians.mo_chunk                 #: whole chunks only
+
+
+def smallest_block(n):
+  return max(1, min(gaussians.mo_chunk, n))
+
+
+def chunked_block(n_block, n):
+  return max(1, min(n, -(-n_block // gaussians.mo_chunk) * gaussians.mo_chunk))
+
+
+#--------------------------------------------
+# MOs per block
+#--------------------------------------------
+def mo_block_size(n_mo, n_points, mo_block=0, max_memory=0., fixed=0.):
+  if mo_block > 0:
+    return chunked_block(mo_block, n_mo)
+  return block_size(n_mo, fixed, bytes_per_value*max(n_points, 1), max_memory)
+
+
+#--------------------------------------------
+# AO values and temporaries of the evaluator
+# (one block of points)
+#--------------------------------------------
+def evaluator_bytes(qc, n_points):
+  n_points = min(n_points, gaussians.block_size)
+  if isinstance(qc, dict) and qc.get('native'):
+    n_prim = max(len(shell['exps']) for shell in qc['basis'])
+    l_max = max(shell['l'] for shell in qc['basis'])
+    return 8.*n_points*(qc['n_ao'] + n_prim + 3*(l_max+1) + 5)  #: AOs, primitives, powers, dx, dy, dz, r2, radial
+  mo_spec = qc['mo_spec'] if isinstance(qc, dict) else qc.mo_spec
+  return 16.*n_points*len(mo_spec[0]['coeffs'])                 #: orbkit: AOs and their temporaries
+
+
+#--------------------------------------------
+# conj(Ylm) times angular weights
+#--------------------------------------------
+def ylm_table(lmax, theta, phi, w_ang, real_sh=False):
+  if real_sh:
+    return sh.rsh_all(lmax, theta, phi) * w_ang
+  return numpy.conj(sh.sh_all(lmax, theta, phi)) * w_ang
+
+
+#--------------------------------------------
+# MO coefficients as a matrix coeffs[mo, ao]
+#--------------------------------------------
+def coefficient_matrix(mo_spec):
+  return numpy.array([item['coeffs'] for item in mo_spec], dtype=float)
+
+
+#--------------------------------------------
+# Quadrature grid and Ylm table
+#--------------------------------------------
+def fixed_grid(cutoff_r, lmax, n_r, order, real_sh=False, radii=None):
+  if 2*lmax > order:
+    raise ValueError("the angular grid of degree %i is exact up to lmax = %i only, not %i"
+                     % (order, order//2, lmax))
+  if radii is None:
+    radii = [cutoff_r]
+  radii = numpy.array(radii, dtype=float)
+  r, w_r, panel = quadrature.panel_grid(n_r, radii)
+  theta, phi, w_ang = quadrature.angular_grid(order)
+
+  w_rad = w_r * r**2
+  w_panel = numpy.zeros((len(radii), len(r)))                   #: w_panel[radius, ir]
+  w_panel[panel, numpy.arange(len(r))] = w_rad
+
+  return {'r':     r,
+          'w_rad': w_rad,
+          'w_panel': w_panel,
+          'theta': theta,
+          'phi':   phi,
+          'ylm':   ylm_table(lmax, theta, phi, w_ang, real_sh),
+          'lmax':  lmax,
+          'radii': radii,
+          'cutoff_r': radii[-1]}
+
+
+#--------------------------------------------
+# [2] on the fixed grid for all functions in qc
+#--------------------------------------------
+def angular_projection(qc, center, qgrid, numproc, ir0=0, ir1=None, mo_block=0, max_memory=0., fixed=0.):
+  r = qgrid['r'][ir0:ir1]
+  x, y, z = quadrature.product_grid(r, qgrid['theta'], qgrid['phi'], center)
+
+  n_mo = n_functions(qc)
+  n_block = mo_block_size(n_mo, len(x), mo_block, max_memory, fixed)
+
+  #-------------------------------------
+  # all orbitals once on all grid points,
+  # every (l,m) in one contraction
+  #---
+  if n_block >= n_mo:
+    orb = evaluate_mos(qc, x, y, z, numproc, center, qgrid['cutoff_r'])
+    orb = orb.reshape(-1, len(r), len(qgrid['theta']))        #: orb[mo, ir, iang]
+    return numpy.dot(orb, qgrid['ylm'].T)                       #: philm[mo, ir, lm]
+
+  #-------------------------------------
+  # the same block by block
+  #---
+  philm = numpy.empty((n_mo, len(r), qgrid['ylm'].shape[0]), dtype=qgrid['ylm'].dtype)
+  for i0 in range(0, n_mo, n_block):
+    i1 = min(i0+n_block, n_mo)
+    orb = evaluate_mos(mo_subset(qc, i0, i1), x, y, z, numproc, center, qgrid['cutoff_r'])
+    philm[i0:i1] = numpy.dot(orb.reshape(i1-i0, len(r), len(qgrid['theta'])), qgrid['ylm'].T)
+  return philm
+
+
+#--------------------------------------------
+# Memory of one work unit without the MO
+# values: Ylm table, evaluator, x, y, z,
+# philm, conj(philm)*philm, its real part
+# and the partial c_lm
+#--------------------------------------------
+def unit_bytes(qc, qgrid, n_func, n_shells, ao_mode):
+  n_lm, n_ang = qgrid['ylm'].shape
+  n_points = n_shells*n_ang
+  philm = float(n_func*n_shells*n_lm*qgrid['ylm'].itemsize)
+  fixed = qgrid['ylm'].nbytes + evaluator_bytes(qc, n_points) + 24.*n_points
+  if ao_mode:
+    return fixed + philm
+  return fixed + 3.*philm + 8.*n_func*n_lm*(n_shells + len(qgrid['radii']))
+
+
+#--------------------------------------------
+# Radial shells per work unit, memory per
+# worker and workers within max_memory
+#--------------------------------------------
+def sweep_shells(qc, qgrid, n_centers, n_func, nproc, max_memory, ao_mode):
+  nproc = max(nproc, 1)
+  if max_memory <= 0.:
+    return radial_block, 0., nproc
+  n_lm, n_ang = qgrid['ylm'].shape
+  n_r = len(qgrid['r'])
+  needed = []
+  for n_shells in range(min(radial_block, n_r), 0, -1):
+    if ao_mode:                                                 #: unit results and phi_ao
+      parent = 2.*n_centers*n_func*n_r*n_lm*qgrid['ylm'].itemsize
+    else:                                                       #: partial c_lm of all units
+      parent = 8.*n_centers*((n_r + n_shells - 1)//n_shells)*len(qgrid['radii'])*n_func*n_lm
+    fixed = unit_bytes(qc, qgrid, n_func, n_shells, ao_mode)
+    needed.append(max(parent + fixed + bytes_per_value*n_shells*n_ang*smallest_block(n_func),
+                      3.*qgrid['ylm'].nbytes))                  #: 3 tables while the table is made
+    if needed[-1] <= max_memory*megabyte:
+      worker = min(max_memory*megabyte - parent, fixed + bytes_per_value*n_shells*n_ang*n_func)  #: at most all MOs at once
+      workers = int((max_memory*megabyte - parent) // worker)
+      return n_shells, worker/megabyte, max(1, min(nproc, workers))
+  raise MemoryBudgetError("--max-memory %.3f MB is too small: one work unit with a block of %i %ss needs %.3f MB"
+                          % (max_memory, smallest_block(n_func), "AO" if ao_mode else "MO", min(needed)/megabyte))
+
+
+#--------------------------------------------
+# [1] radial integral and sum over m
+#--------------------------------------------
+def density_lm(philm, w_rad):
+  if numpy.iscomplexobj(philm):
+    return numpy.dot(w_rad, numpy.real(numpy.conj(philm)*philm))  #: c_lm[mo, lm]
+  return numpy.dot(w_rad, philm*philm)
+
+
+def sum_over_m(c_lm, lmax):
+  all_c = numpy.zeros(c_lm.shape[:-2] + (lmax+1, c_lm.shape[-2]))
+  for l in range(0, lmax+1):
+    all_c[...,l,:] = c_lm[..., l*l:(l+1)**2].sum(axis=-1)
+  return all_c
+
+
+def radial_sum(philm, w_rad, lmax):
+  return sum_over_m(density_lm(philm, w_rad), lmax)
+
+
+#--------------------------------------------
+# Projection of the MOs on the fixed grid
+#--------------------------------------------
+def gauss_projection(qc, center, qgrid, numproc):
+  philm = angular_projection(qc, center, qgrid, numproc)
+  return radial_sum(philm, qgrid['w_rad'], qgrid['lmax'])
+
+
+#--------------------------------------------
+# Projection of the AOs on the fixed grid
+#--------------------------------------------
+def ao_projection(qc, center, qgrid, numproc):
+  return angular_projection(ao_qc(qc), center, qgrid, numproc)
+
+
+#--------------------------------------------
+# every AO is written as an "MO" with
+# unit coefficients, so orbkit handles
+# cartesian and spherical AOs alike
+#--------------------------------------------
+def ao_qc(qc):
+  if isinstance(qc, dict) and qc.get('native'):
+    qc_ao = dict(qc)
+    qc_ao['coeffs'] = None                                      #: native evaluator returns the AOs
+    return qc_ao
+  if isinstance(qc, dict):
+    qc_ao = dict(qc)
+    n_ao = len(qc['mo_spec'][0]['coeffs'])
+  else:
+    qc_ao = qc.todict()
+    n_ao = len(qc.mo_spec[0]['coeffs'])
+  unit = numpy.identity(n_ao)
+  qc_ao['mo_spec'] = [{'coeffs': unit[mu], 'energy': 0., 'occ_num': 0., 'sym': '%i.ao' % (mu+1)}
+                      for mu in range(0, n_ao)]
+  return qc_ao
+
+
+#--------------------------------------------
+# MOs from the AO projections: one GEMM
+#--------------------------------------------
+def mo_philm(phi_ao, coeffs):
+  n_ao = phi_ao.shape[0]
+  philm = gaussians.mo_product(coeffs, phi_ao.reshape(n_ao, -1))   #: philm[mo, ir*lm]
+  return philm.reshape((coeffs.shape[0],) + phi_ao.shape[1:])
+
+
+def mo_projection(phi_ao, coeffs, qgrid):
+  return radial_sum(mo_philm(phi_ao, coeffs), qgrid['w_rad'], qgrid['lmax'])
+
+
+#--------------------------------------------
+# One work unit: a block of radial shells
+# around one center
+#--------------------------------------------
+def projection_unit(unit):
+  ic, ir0, ir1 = unit
+  data  = parallel.worker_data
+  qgrid = data['qgrid']
+  qc    = data['qc']
+  fixed = unit_bytes(qc, qgrid, n_functions(qc), ir1-ir0, data['ao_mode'])
+  philm = angular_projection(qc, data['centers'][ic], qgrid, 1, ir0, ir1,
+                             data['mo_block'], data['max_memory'], fixed)
+  if data['ao_mode']:
+    return philm                                                #: AO projections of these shells
+  return density_lm(philm, qgrid['w_panel'][:, ir0:ir1])       #: partial c_lm[radius, mo, lm]
+
+
+#--------------------------------------------
+# All centers at the largest radius
+#--------------------------------------------
+def scheduled_projection(qc, centers, qgrid, nproc, coeffs=None, mo_block=0, max_memory=0.):
+  return scheduled_sweep(qc, centers, qgrid, nproc, coeffs, mo_block, max_memory)[:,-1]
+
+
+#--------------------------------------------
+# All centers and radii, distributed over
+# nproc workers
+#--------------------------------------------
+def scheduled_sweep(qc, centers, qgrid, nproc, coeffs=None, mo_block=0, max_memory=0.):
+  if coeffs is not None:
+    return numpy.array([mo_sweep(phi_ao, coeffs, qgrid, max_memory)
+                        for phi_ao in ao_sweep(qc, centers, qgrid, nproc, max_memory)])
+
+  results, units = sweep_units(qc, centers, qgrid, nproc, False, mo_block, max_memory)
+
+  #-------------------------------------
+  # deterministic reduction in unit order
+  #---
+  all_c = []
+  for ic in range(0, len(centers)):
+    blocks = [results[i] for i in range(0, len(units)) if units[i][0] == ic]
+    c_lm = numpy.array(blocks[0], copy=True)
+    for block in blocks[1:]:
+      c_lm += block
+    all_c.append(sum_over_m(numpy.cumsum(c_lm, axis=0), qgrid['lmax']))  #: all_c[radius, l, mo]
+  return numpy.array(all_c)
+
+
+def sweep_units(qc, centers, qgrid, nproc, ao_mode, mo_block, max_memory):
+  n_r = len(qgrid['r'])
+  n_shells, worker_memory, workers = sweep_shells(qc, qgrid, len(centers), n_functions(qc), nproc, max_memory, ao_mode)
+  units = [(ic, ir0, min(ir0+n_shells, n_r))
+           for ic in range(0, len(centers)) for ir0 in range(0, n_r, n_shells)]
+  results = parallel.run(projection_unit, units, workers,
+                         {'qc': qc, 'centers': centers, 'qgrid': qgrid, 'ao_mode': ao_mode,
+                          'mo_block': mo_block, 'max_memory': worker_memory})
+  return results, units
+
+
+#--------------------------------------------
+# AO projections, center by center
+#--------------------------------------------
+def ao_sweep(qc, centers, qgrid, nproc, max_memory=0.):
+  qc = ao_qc(qc)
+  batches = [numpy.arange(len(centers))] if max_memory <= 0. else [[ic] for ic in range(0, len(centers))]
+  for batch in batches:
+    results, units = sweep_units(qc, centers[batch], qgrid, nproc, True, 0, max_memory)
+    for ic in range(0, len(batch)):
+      phi_ao = numpy.concatenate([results[i] for i in range(0, len(units)) if units[i][0] == ic], axis=1)
+      if ic == len(batch)-1:
+        del results                                             #: only phi_ao is kept
+      yield phi_ao
+
+
+#--------------------------------------------
+# MOs of one center from the AO projections,
+# in blocks of MOs within max_memory
+#--------------------------------------------
+def mo_sweep(phi_ao, coeffs, qgrid, max_memory=0.):
+  n_mo = coeffs.shape[0]
+  n_r, n_lm = phi_ao.shape[1:]
+  n_radii = len(qgrid['radii'])
+  all_c = numpy.zeros((n_radii, qgrid['lmax']+1, n_mo))
+  per_mo = n_r*n_lm*(3.*phi_ao.itemsize + 8.) + 8.*n_radii*n_lm*2    #: philm, conj(philm)*philm, c_lm and its cumsum
+  n_block = block_size(n_mo, float(phi_ao.nbytes + all_c.nbytes), per_mo, max_memory)
+  for i0 in range(0, n_mo, n_block):
+    i1 = min(i0+n_block, n_mo)
+    c_lm = density_lm(mo_philm(phi_ao, coeffs[i0:i1]), qgrid['w_panel'])
+    all_c[:, :, i0:i1] = sum_over_m(numpy.cumsum(c_lm, axis=0), qgrid['lmax'])
+  return all_c
@@ -0,0 +1,177 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   quadrature.py :: fixed (non-adaptive) quadrature grids for
+#                    the projection onto spherical harmonics
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: radial_grid(n_r, cutoff_r)
+#      Parameters
+#      [int]    :: n_r      :: number of Gauss-Legendre points in r
+#      [float]  :: cutoff_r :: upper integration limit (a.u.)
+#      Returns r and the weights w_r on [0, cutoff_r]
+#
+#   :: panel_grid(n_r, radii, splits)
+#      Parameters
+#      [int]    :: n_r      :: number of Gauss-Legendre points on [0, radii[-1]]
+#      [list]   :: radii    :: ascending radii (a.u.)
+#      [list]   :: splits   :: None or further panel edges (a.u.), most
+#                              important first; the points keep the panel
+#                              (shell) of radii they lie in
+#      Returns r, w_r and the panel of every point; panel k is the
+#      shell radii[k-1] < r < radii[k] (radii[-1] = 0)
+#
+#   :: merge_splits(edges, splits, max_splits)
+#      Returns the edges and the first max_splits splits inside them,
+#      sorted; splits on an edge already taken are dropped
+#
+#   :: share_points(n, lengths)
+#      Returns the points of every sub-panel: n in total,
+#      min_panel_points each and the rest by length
+#
+#   :: angular_grid(order)
+#      Parameters
+#      [int]    :: order    :: polynomial degree on the unit sphere
+#                              which is integrated exactly
+#      Returns theta, phi and the weights w_ang (sum(w_ang) = 4 pi)
+#
+#   :: product_grid(r, theta, phi, center)
+#      Returns the cartesian coordinates x, y, z of all points of
+#      the spherical product grid; radial index runs slowest
+#
+#  Comments
+#  :: The angular grid is a Gauss product grid: Gauss-Legendre in
+#     cos(theta) times an equidistant trapezoidal rule in phi. It
+#     integrates all Ylm * Yl'm' exactly as long as l + l' <= order.
+#     Lebedev grids would need ~2/3 of the points but require large
+#     tabulated data sets.
+#
+#  :: Without splits, panel_grid gives every panel n_r points times its
+#     share of radii[-1] (at least min_panel_points). For one radius it
+#     is the same grid as radial_grid.
+#  :: splits: edges at the distances of the atoms from the center put
+#     the cusp-like peaks of tight functions at the panel ends, where
+#     Gauss-Legendre resolves them (analytic.py). With splits, all
+#     sub-panels share n_r points: min_panel_points each and the rest
+#     by length, so the first n_r/min_panel_points - len(radii) splits
+#     are taken and the grid does not grow with their number.
+#
+#  Last edited
+#  17.10.2026 :: splits share the points of their panel
+#  17.10.2026 :: further panel edges (splits)
+#  17.10.2026 :: radial panels for several radii
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import numpy
+
+min_panel_points = 4                                            #: Gauss-Legendre points of the shortest panels
+
+#--------------------------------------------
+# Gauss-Legendre grid for the radial part
+#--------------------------------------------
+def radial_grid(n_r, cutoff_r):
+  x, w = numpy.polynomial.legendre.leggauss(int(n_r))
+  r   = 0.5*cutoff_r*(x + 1.)                                   #: maps [-1,1] onto [0,cutoff_r]
+  w_r = 0.5*cutoff_r*w
+  return r, w_r
+
+
+#--------------------------------------------
+# Gauss-Legendre panels between the radii
+#--------------------------------------------
+def panel_grid(n_r, radii, splits=None):
+  edges = [0.] + [float(radius) for radius in radii]
+  if splits is None:
+    sub_edges = edges
+    counts = [max(min_panel_points, int(numpy.ceil(n_r*(edges[k+1] - edges[k])/edges[-1] - 1e-9)))
+              for k in range(0, len(radii))]
+  else:
+    n_r = max(n_r, min_panel_points*len(radii))
+    sub_edges = merge_splits(edges, splits, n_r//min_panel_points - len(radii))
+    counts = share_points(n_r, numpy.diff(sub_edges))
+  r, w_r, panel = [], [], []
+  for j in range(0, len(sub_edges)-1):
+    length = sub_edges[j+1] - sub_edges[j]
+    x, w = numpy.polynomial.legendre.leggauss(counts[j])
+    r.append(sub_edges[j] + 0.5*length*(x + 1.))
+    w_r.append(0.5*length*w)
+    panel.append(numpy.repeat(numpy.searchsorted(edges, sub_edges[j], side='right') - 1, counts[j]))
+  return numpy.concatenate(r), numpy.concatenate(w_r), numpy.concatenate(panel)
+
+
+#--------------------------------------------
+# Edges plus at most max_splits splits;
+# earlier splits take precedence
+#--------------------------------------------
+def merge_splits(edges, splits, max_splits):
+  kept = list(edges)
+  for s in splits:
+    s = float(s)
+    if len(kept) - len(edges) >= max_splits:
+      break
+    if edges[0] < s < edges[-1] and min(abs(s - e) for e in kept) > 1e-6*edges[-1]:
+      kept.append(s)
+  return sorted(kept)
+
+
+#--------------------------------------------
+# n points over sub-panels of the given
+# lengths, at least min_panel_points each
+#--------------------------------------------
+def share_points(n, lengths):
+  lengths = numpy.asarray(lengths, dtype=float)
+  target = (n - min_panel_points*len(lengths))*lengths/lengths.sum()
+  counts = min_panel_points + numpy.floor(target + 1e-9).astype(int)
+  while counts.sum() < n:                                       #: largest remainders
+    counts[numpy.argmax(min_panel_points + target - counts)] += 1
+  return [int(c) for c in counts]
+
+
+#--------------------------------------------
+# Gauss product grid on the unit sphere
+#--------------------------------------------
+def angular_grid(order):
+  n_theta = int(order)//2 + 1                                   #: exact for cos(theta)^k, k <= 2*n_theta-1
+  n_phi   = int(order) + 1                                      #: exact for exp(i*m*phi), |m| <= order
+
+  x, w = numpy.polynomial.legendre.leggauss(n_theta)
+  theta_1d = numpy.arccos(x)
+  phi_1d   = 2.*numpy.pi*numpy.arange(n_phi)/float(n_phi)
+
+  theta = numpy.repeat(theta_1d, n_phi)                         #: theta runs slowest
+  phi   = numpy.tile(phi_1d, n_theta)
+  w_ang = numpy.repeat(w, n_phi) * 2.*numpy.pi/float(n_phi)     #: sin(theta) is absorbed by d(cos(theta))
+  return theta, phi, w_ang
+
+
+#--------------------------------------------
+# Cartesian coordinates of the product grid
+#--------------------------------------------
+def product_grid(r, theta, phi, center):
+  ux = numpy.sin(theta)*numpy.cos(phi)
+  uy = numpy.sin(theta)*numpy.sin(phi)
+  uz = numpy.cos(theta)
+
+  x = (numpy.outer(r, ux) + center[0]).ravel()
+  y = (numpy.outer(r, uy) + center[1]).ravel()
+  z = (numpy.outer(r, uz) + center[2]).ravel()
+  return x, y, z
@@ -21,20 +21,47 @@
 #      have received a copy of the GNU Lesser General Public License
 #      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
 
-#   Parameters
-#   [int]         :: l     :: angular momentum quantum number
-#   [int]         :: m     :: magnetic quantum number
-#   [numpy array] :: theta :: contains the theta angle grid
-#   [numpy array] :: phi   :: contains the phi angle grid
+#   Contains Functions:
+#   :: sh(l, m, theta, phi)
+#      Parameters
+#      [int]         :: l     :: angular momentum quantum number
+#      [int]         :: m     :: magnetic quantum number
+#      [numpy array] :: theta :: contains the theta angle grid
+#      [numpy array] :: phi   :: contains the phi angle grid
+#      Returns Ylm on the grid
+#
+#   :: sh_lm(l, m, theta, phi)
+#      Same as sh, but from the recursion formulas for any l
+#
+#   :: sh_all(lmax, theta, phi)
+#      Parameters
+#      [int]         :: lmax  :: highest angular momentum quantum number
+#      [numpy array] :: theta :: contains the theta angle grid
+#      [numpy array] :: phi   :: contains the phi angle grid
+#      Returns all Ylm with l <= lmax as one complex array of shape
+#      ((lmax+1)**2, n_points); row index = l**2 + l + m
+#
+#   :: rsh(l, m, theta, phi)
+#   :: rsh_all(lmax, theta, phi)
+#      Real spherical harmonics, same parameters and layout as sh_lm
+#      and sh_all but float64:
+#        S_l0 = Y_l0
+#        S_lm = sqrt(2) (-1)^m Re(Y_l|m|)  (m > 0)
+#        S_lm = sqrt(2) (-1)^m Im(Y_l|m|)  (m < 0)
 #
 #  Comments
-#  :: Couldn't be bothered to figure out how to implement the
-#     recursion formulars for Plm in python. So all spherical
-#     harmonics are explicitely typed in. Change at some point
-#     maybe.
-#  :: lmax == 6 at the moment!!!
+#  :: All spherical harmonics up to l = 6 are explicitely typed in.
+#     Higher l are obtained from the recursion formulas of the
+#     normalized associated Legendre functions (Condon-Shortley
+#     phase, same convention as the explicit ones).
+#  :: sh_all shares sin(theta), cos(theta) and exp(i*phi)**m between
+#     all (l,m) and should be used whenever more than one Ylm is needed.
+#  :: The real harmonics span the same space as the complex ones for
+#     every l, so \sum_m |<Ylm|psi>|^2 = \sum_m |<Slm|psi>|^2.
 #
 #  Last edited
+#  17.10.2026 :: real spherical harmonics rsh, rsh_all
+#  17.10.2026 :: recursion formulas, sh_all, fixed Y_{2,2}
 #  13.09.2016 :: Descriptions and finalization
 #
 # ===========================================================
@@ -68,7 +95,7 @@ def sh(l,m,theta,phi):
   if l == 2 and m == 1:
     return -(1./2.) * np.sqrt(15./(2.*np.pi)) * np.exp(1.j*phi) * np.sin(theta)*np.cos(theta)
   if l == 2 and m == 2:
-    return (1./4.) * np.sqrt(15./(2.*np.pi)) * np.exp(-2.j*phi) * np.sin(theta)**2.
+    return (1./4.) * np.sqrt(15./(2.*np.pi)) * np.exp(2.j*phi) * np.sin(theta)**2.
   #-----------------------------------
   # l = 3 (f-type) spherical harmonics
   #-----------------------------------
@@ -162,15 +189,119 @@ def sh(l,m,theta,phi):
   if l == 6 and m == 6:
     return (1./64.) * np.sqrt(3003./np.pi) * np.exp(6.j*phi) * np.sin(theta)**6.
   #-----------------------------------
-  # l = 7 (j-type) spherical harmonics
+  # l > 6 from the recursion formulas
   #-----------------------------------
-  # ...
+  return sh_lm(l,m,theta,phi)
+
+
+#-----------------------------------
+# Normalized associated Legendre functions
+#   P[l,m] * exp(i*m*phi) = Ylm  (m >= 0)
+# for one m and all l = |m|..lmax
+#-----------------------------------
+def plm_column(lmax,m,cos_t,pmm):
+  # pmm :: P[m,m] on the grid
+  column = [pmm]
+  if lmax > m:
+    column.append(np.sqrt(2.*m+3.) * cos_t * pmm)
+  for l in range(m+2,lmax+1):
+    a = np.sqrt((4.*l*l-1.)/(l*l-m*m))
+    b = np.sqrt(((l-1.)**2-m*m)/(4.*(l-1.)**2-1.))
+    column.append(a * (cos_t*column[-1] - b*column[-2]))
+  return column
+
+
+#-----------------------------------
+# Single Ylm for any l
+#-----------------------------------
+def sh_lm(l,m,theta,phi):
+  theta = np.asarray(theta, dtype=float)
+  phi   = np.asarray(phi, dtype=float)
+  am    = abs(m)
+  sin_t = np.sin(theta)
+
+  pmm = np.full(theta.shape, 0.5*np.sqrt(1./np.pi))
+  for k in range(1,am+1):
+    pmm = -np.sqrt((2.*k+1.)/(2.*k)) * sin_t * pmm
+  plm = plm_column(l,am,np.cos(theta),pmm)[l-am]
 
+  ylm = plm * np.exp(1.j*am*phi)
+  if m < 0:
+    return (-1)**am * np.conj(ylm)
+  return ylm
 
 
 #-----------------------------------
-# Real linear combinations: (for test purposes only!)
+# All Ylm up to lmax at once
 #-----------------------------------
-# possible extention
-# ...
+def sh_all(lmax,theta,phi):
+  theta = np.asarray(theta, dtype=float)
+  phi   = np.asarray(phi, dtype=float)
+  sin_t = np.sin(theta)
+  cos_t = np.cos(theta)
+  eiphi = np.exp(1.j*phi)
+
+  ylm  = np.empty(((lmax+1)**2,) + theta.shape, dtype=np.complex128)
+  pmm  = np.full(theta.shape, 0.5*np.sqrt(1./np.pi))
+  eimp = np.ones(theta.shape, dtype=np.complex128)              #: exp(i*m*phi)
+  for m in range(0,lmax+1):
+    if m > 0:
+      pmm  = -np.sqrt((2.*m+1.)/(2.*m)) * sin_t * pmm
+      eimp = eimp * eiphi
+    for l, plm in enumerate(plm_column(lmax,m,cos_t,pmm), m):
+      ylm[l*l+l+m] = plm * eimp
+      if m > 0:
+        ylm[l*l+l-m] = (-1)**m * np.conj(ylm[l*l+l+m])
+  return ylm
+
+
+
+#-----------------------------------
+# Real linear combinations
+#-----------------------------------
+def rsh(l,m,theta,phi):
+  theta = np.asarray(theta, dtype=float)
+  phi   = np.asarray(phi, dtype=float)
+  am    = abs(m)
+  sin_t = np.sin(theta)
+
+  pmm = np.full(theta.shape, 0.5*np.sqrt(1./np.pi))
+  for k in range(1,am+1):
+    pmm = np.sqrt((2.*k+1.)/(2.*k)) * sin_t * pmm           #: (-1)^m already removed
+  plm = plm_column(l,am,np.cos(theta),pmm)[l-am]
+
+  if m > 0:
+    return np.sqrt(2.) * plm * np.cos(am*phi)
+  if m < 0:
+    return np.sqrt(2.) * plm * np.sin(am*phi)
+  return plm
+
+
+#-----------------------------------
+# All real Slm up to lmax at once
+#-----------------------------------
+def rsh_all(lmax,theta,phi):
+  theta = np.asarray(theta, dtype=float)
+  phi   = np.asarray(phi, dtype=float)
+  sin_t = np.sin(theta)
+  cos_t = np.cos(theta)
+  cos_p = np.cos(phi)
+
+  slm = np.empty(((lmax+1)**2,) + theta.shape)
+  pmm = np.full(theta.shape, 0.5*np.sqrt(1./np.pi))
+  cos_mp = [np.ones(theta.shape), cos_p]                       #: cos(m*phi), cos((m-1)*phi) ...
+  sin_mp = [np.zeros(theta.shape), np.sin(phi)]                #: ... by the Chebyshev recursion
+  for m in range(0,lmax+1):
+    if m > 0:
+      pmm = np.sqrt((2.*m+1.)/(2.*m)) * sin_t * pmm
+    if m > 1:
+      cos_mp = [cos_mp[1], 2.*cos_p*cos_mp[1] - cos_mp[0]]
+      sin_mp = [sin_mp[1], 2.*cos_p*sin_mp[1] - sin_mp[0]]
+    for l, plm in enumerate(plm_column(lmax,m,cos_t,pmm), m):
+      if m == 0:
+        slm[l*l+l] = plm
+      else:
+        slm[l*l+l+m] = np.sqrt(2.) * plm * cos_mp[1]
+        slm[l*l+l-m] = np.sqrt(2.) * plm * sin_mp[1]
+  return slm
 
@@ -0,0 +1,121 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   smearing.py :: Gaussian smearing of discrete (MO energy,
+#                  weight) pairs onto an energy grid
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: energy_grid(emin, emax, pointsPerEv)
+#      Returns the ipolpt+1 energies from emin to emax (both included),
+#      ipolpt = int((emax-emin)*pointsPerEv)+1
+#
+#   :: spin_channels(syms, spin_polarized)
+#      Parameters
+#      [list]   :: syms           :: orbkit symmetry labels of the MOs
+#      [bool]   :: spin_polarized :: true -> alpha (_a) and beta (_b) channels
+#      Returns the channel of every MO (0 / 1, -1 = none) and the number of channels
+#
+#   :: smear(x, energies, weights, sigma, channels, n_channels)
+#      Parameters
+#      [numpy array] :: x          :: energy grid [eV] (equidistant)
+#      [numpy array] :: energies   :: MO energies [eV], shape (n_MO)
+#      [numpy array] :: weights    :: weights[mo, ...] e.g. all_c.T or coeff_array
+#      [float]       :: sigma      :: smearing factor [eV]
+#      [numpy array] :: channels   :: channel of every MO (see spin_channels)
+#      [int]         :: n_channels :: number of channels
+#      Returns gx[channel, x, ...] = \sum_mo weights[mo, ...] g(x - E_mo)
+#      with the normalized Gaussian g of width sigma
+#
+#  Comments
+#  :: Every Gaussian is only evaluated within +- window*sigma around
+#     its MO energy (exp(-window^2/2) ~ 1e-14 for window = 8). The
+#     Gaussians are collected in one sparse (x, MO) matrix and all
+#     weights of a channel are smeared with one matrix product.
+#  :: scipy is imported in smear, not with the module.
+#
+#  Last edited
+#  17.10.2026 :: scipy imported in smear
+#  17.10.2026 :: first version, replaces the loops in sharpo and mo_coefficients
+#
+# ===========================================================
+
+import numpy
+
+window = 8.                                                     #: Gaussians are cut at +- window*sigma
+
+#--------------------------------------------
+# Energy grid of the smeared output
+#--------------------------------------------
+def energy_grid(emin, emax, pointsPerEv):
+  ipolpt = int((emax - emin)*pointsPerEv)+1                     #: number of grid points
+  return numpy.linspace(emin, emax, ipolpt+1)
+
+
+#--------------------------------------------
+# Spin channel of every MO
+#--------------------------------------------
+def spin_channels(syms, spin_polarized):
+  if not spin_polarized:
+    return numpy.zeros(len(syms), dtype=int), 1
+  channels = -numpy.ones(len(syms), dtype=int)
+  for i in range(0, len(syms)):
+    if "_a" in syms[i]:                                         #: orbkit labels alpha/beta with _a/_b
+      channels[i] = 0
+    elif "_b" in syms[i]:
+      channels[i] = 1
+  return channels, 2
+
+
+#--------------------------------------------
+# Gaussian smearing
+#--------------------------------------------
+def smear(x, energies, weights, sigma, channels=None, n_channels=1):
+  from scipy import sparse                                      #: only imported where it is needed
+
+  energies = numpy.asarray(energies, dtype=float)
+  weights  = numpy.asarray(weights, dtype=float)
+  if channels is None:
+    channels = numpy.zeros(len(energies), dtype=int)
+  n_x = len(x)
+
+  #-------------------------------------
+  # window of grid points of every MO
+  #---
+  dx = (x[-1] - x[0])/float(n_x - 1) if n_x > 1 else 1.
+  half = int(numpy.ceil(window*sigma/dx))
+  i0 = numpy.floor((energies - x[0])/dx).astype(int) - half
+  idx = i0[:,None] + numpy.arange(2*half+2)[None,:]            #: idx[mo, k]
+  mo  = numpy.repeat(numpy.arange(len(energies)), idx.shape[1]).reshape(idx.shape)
+  valid = (idx >= 0) & (idx < n_x)
+  idx = idx[valid]
+  mo  = mo[valid]
+
+  g = (1./(sigma*numpy.sqrt(2.*numpy.pi))) * numpy.exp(-(1./(2.*sigma**2.))*(x[idx] - energies[mo])**2.)
+
+  #-------------------------------------
+  # one sparse product per channel
+  #---
+  flat = weights.reshape(len(energies), -1)
+  gx = numpy.zeros((n_channels, n_x, flat.shape[1]))
+  for ic in range(0, n_channels):
+    use = channels[mo] == ic
+    gmat = sparse.csr_matrix((g[use], (idx[use], mo[use])), shape=(n_x, len(energies)))
+    gx[ic] = gmat.dot(flat)
+  return gx.reshape((n_channels, n_x) + weights.shape[1:])
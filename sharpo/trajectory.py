@@ -0,0 +1,265 @@
+# ===========================================================
+#
+#   Module for sharpo
+#   trajectory.py :: projection of a sequence of frames (MD
+#                    snapshots) with one quadrature grid and
+#                    Ylm table for all frames
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This module is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+
+#   Contains Functions:
+#   :: frame_list(files, itype)
+#      Returns the frames of all files as (label, filename, offsets);
+#      offsets = None for a file with one frame, else the byte range
+#      of the frame in a multi-frame molden file
+#
+#   :: frame_offsets(filename)
+#      Returns the byte offsets of all "[Molden Format]" lines
+#
+#   :: read_frame(frame, itype, tmp_dir, reader, sidecar)
+#      Reads one frame with api.load (reader "orbkit" or "native"); frames
+#      of multi-frame files are written to tmp_dir first (no sidecar)
+#
+#   :: prefetched(frames, itype, reader, sidecar, background)
+#      Generator of (frame, qc); with background = True the next frame
+#      is read in a background thread while the current one is projected
+#
+#   :: project_frame(qc, selected_MO, centers, setup)
+#      Returns all_c[center, radius, l, mo] of one frame
+#
+#   :: run(frames, setup)
+#      Parameters
+#      [list]       :: frames :: from frame_list
+#      [dictionary] :: setup  :: 'itype', 'reader', 'sidecar',
+#                                'qgrid' (projection.fixed_grid),
+#                                'centers' (a.u. or arghandler.all_atoms),
+#                                'numproc', 'evaluator', 'ao_mode', 'mo_block',
+#                                'max_memory', 'emin', 'emax', 'efermi_shift',
+#                                'output_file'
+#      Projects all frames and writes <output_file>.frames.dat
+#
+#  Comments
+#  :: Only the fixed grid (--quadrature gauss) is supported: qgrid with
+#     the radial panels and the Ylm table is built once and used for
+#     every frame and every center.
+#  :: The table is written frame by frame, so an interrupted run keeps
+#     the finished frames.
+#  :: The MOs of every frame are selected by api.energy_window, as in a
+#     single projection.
+#  :: Frames are read ahead only with -p 1: the projection of -p > 1
+#     forks its workers (parallel.run), and a fork while another thread
+#     reads a file can deadlock the workers. With -p > 1 every frame is
+#     read in the main thread before its projection.
+#
+#  Last edited
+#  17.10.2026 :: --reader reaches read_frame; no read-ahead thread with -p > 1
+#  17.10.2026 :: api.energy_window; --reader native
+#  17.10.2026 :: orbkit imported on first use
+#  17.10.2026 :: first version
+#
+# ===========================================================
+from __future__ import print_function
+
+import numpy
+import threading
+import tempfile
+import shutil
+import time
+import os
+try:
+  import queue
+except ImportError:                                             #: python 2.7
+  import Queue as queue
+
+from . import projection
+from . import gaussians
+from . import arghandler
+from . import molden
+from . import api
+
+marker = "[molden format]"                                      #: first line of every molden frame
+ev = 27.21138602
+ang2au = 1./0.52917720859
+
+#--------------------------------------------
+# Byte offsets of the frames of a molden file
+#--------------------------------------------
+def frame_offsets(filename):
+  offsets = []
+  with open(filename, "rb") as f:
+    position = 0
+    for line in f:
+      if line.strip().lower() == marker.encode("ascii"):
+        offsets.append(position)
+      position += len(line)
+  return offsets
+
+
+#--------------------------------------------
+# All frames of all files
+#--------------------------------------------
+def frame_list(files, itype):
+  frames = []
+  for filename in files:
+    offsets = frame_offsets(filename) if itype == "molden" else []
+    if len(offsets) <= 1:
+      frames.append((filename, filename, None))
+      continue
+    offsets.append(os.path.getsize(filename))
+    for k in range(0, len(offsets)-1):
+      frames.append(("%s:%i" % (filename, k+1), filename, (offsets[k], offsets[k+1])))
+  return frames
+
+
+#--------------------------------------------
+# Reads one frame
+#--------------------------------------------
+def read_frame(frame, itype, tmp_dir, reader="orbkit", sidecar=True):
+  label, filename, offsets = frame
+  if offsets is None:
+    qc = api.load(filename, itype, reader, sidecar)
+    qc.mo_spec                                                  #: native: coefficients are read here, not in the projection
+    return qc
+
+  tmp_name = os.path.join(tmp_dir, "frame.molden")
+  with open(filename, "rb") as f:
+    f.seek(offsets[0])
+    text = f.read(offsets[1] - offsets[0])
+  with open(tmp_name, "wb") as f:
+    f.write(text)
+  try:
+    qc = api.load(tmp_name, itype, reader, False)
+    qc.mo_spec                                                  #: native: read before the file is removed
+    return qc
+  finally:
+    os.remove(tmp_name)
+
+
+#--------------------------------------------
+# Frames read ahead in a background thread
+#--------------------------------------------
+def prefetched(frames, itype, reader="orbkit", sidecar=True, background=True):
+  tmp_dir = tempfile.mkdtemp(prefix="sharpo-")
+  if not background:
+    try:
+      for frame in frames:
+        yield frame, read_frame(frame, itype, tmp_dir, reader, sidecar)
+    finally:
+      shutil.rmtree(tmp_dir, ignore_errors=True)
+    return
+
+  ahead = queue.Queue(maxsize=1)                                #: one frame waits while the next is read
+
+  def read_ahead():
+    for frame in frames:
+      try:
+        ahead.put((frame, read_frame(frame, itype, tmp_dir, reader, sidecar), None))
+      except Exception as error:                                #: re-raised in the main thread
+        ahead.put((frame, None, error))
+        return
+
+  thread = threading.Thread(target=read_ahead)
+  thread.daemon = True
+  thread.start()
+  try:
+    for i in range(0, len(frames)):
+      frame, qc, error = ahead.get()
+      if error is not None:
+        raise error
+      yield frame, qc
+  finally:
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+#--------------------------------------------
+# Projection of one frame
+#--------------------------------------------
+def project_frame(qc, selected_MO, centers, setup):
+  mo_spec = [qc.mo_spec[i-1] for i in selected_MO]
+  coeffs = None
+  if setup['evaluator'] == "native":
+    wfn = gaussians.native_qc(qc, mo_spec)
+    if setup['ao_mode']:
+      coeffs = wfn['coeffs']
+  else:
+    wfn = qc.todict()
+    wfn['mo_spec'] = mo_spec
+    if setup['ao_mode']:
+      coeffs = projection.coefficient_matrix(mo_spec)
+  return projection.scheduled_sweep(wfn, centers, setup['qgrid'], setup['numproc'], coeffs,
+                                    setup['mo_block'], setup['max_memory'])
+
+
+#--------------------------------------------
+# All frames into one table
+#--------------------------------------------
+def run(frames, setup):
+  qgrid = setup['qgrid']
+  lmax  = qgrid['lmax']
+  l_labels = "spdfghijklmno"                               #: as cli.l_to_string
+  filename = setup['output_file'] + ".frames.dat"
+
+  outputstream = open(filename, "w+")
+  for k in range(0, len(frames)):
+    print('# frame %5i : %s' % (k+1, frames[k][0]), file=outputstream)
+  print('#  frame  center    R [Ang]     MO     Energy [a.u.]      Energy [eV]    ', end="", file=outputstream)
+  for l in range(0, lmax+1):
+    print('C-%-9s ' % (l_labels[l] if l < len(l_labels) else str(l)), end="", file=outputstream)
+  print('sum_C       sym', file=outputstream)
+
+  start_time = time.time()
+  wait_time = 0.
+  t0 = time.time()
+  for k, (frame, qc) in enumerate(prefetched(frames, setup['itype'], setup['reader'], setup['sidecar'],
+                                             setup['numproc'] <= 1)):  #: no thread alive when the workers fork
+    wait_time += time.time() - t0
+
+    selected_MO = api.energy_window(qc, (setup['emin'], setup['emax']), setup['efermi_shift'])['selected_MO']
+    if not selected_MO:
+      print ("Frame %i (%s): no MOs in the energy range" % (k+1, frame[0]))
+      t0 = time.time()
+      continue
+
+    if isinstance(setup['centers'], str) and setup['centers'] == arghandler.all_atoms:
+      centers = numpy.array(qc.geo_spec, dtype=float)           #: the atoms of this frame
+    else:
+      centers = setup['centers']
+
+    all_c = project_frame(qc, selected_MO, centers, setup)      #: all_c[center, radius, l, mo]
+    mo_energies, mo_occupations, mo_syms = molden.mo_arrays(qc)
+
+    for ic in range(0, len(centers)):
+      for ir in range(0, len(qgrid['radii'])):
+        for i_mos in range(0, len(selected_MO)):
+          energy = mo_energies[selected_MO[i_mos]-1]
+          print ("%8i  %6i  %10.6f  %5i  %16.8f %16.8f    " % (k+1, ic+1, qgrid['radii'][ir]/ang2au, selected_MO[i_mos],
+                                                              energy, energy*ev), end="", file=outputstream)
+          for l in range(0, lmax+1):
+            print ("%.8f  " % all_c[ic, ir, l, i_mos], end="", file=outputstream)
+          print ("%.8f  %s" % (all_c[ic, ir, :, i_mos].sum(), mo_syms[selected_MO[i_mos]-1]), file=outputstream)
+    outputstream.flush()
+    print ("Frame %i of %i done (%s, %i MOs)" % (k+1, len(frames), frame[0], len(selected_MO)))
+    t0 = time.time()
+  outputstream.close()
+
+  print ("")
+  print ("Output saved to %s" % filename)
+  print ("")
+  print ("Elapsed Time")
+  print ("All frames          : %.2f s" % (time.time() - start_time))
+  print ("Waiting for input   : %.2f s" % wait_time)
@@ -0,0 +1,85 @@
+# ===========================================================
+#
+#   Tests for sharpo
+#   conftest.py :: molden files shared by the tests
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Contains Fixtures:
+#   :: molden_file
+#      Path of example/h2o.molden (cartesian d) or of a synthetic molecule
+#      (benchmarks/synthetic.py) with cartesian or spherical ([5D7F]) d
+#      and f functions, closed or open shell; one test per file
+#
+#   :: reference
+#      Arrays of tests/reference/orbkit.npz of the molden_file (written
+#      by orbkit_reference.py): the tests against orbkit without orbkit
+#
+#   :: orbkit_qc
+#      The molden_file read by orbkit; skipped without orbkit and with
+#      orbkit 1.x (sharpo reads orbkit 0.x: qc.ao_spherical, _a/_b labels)
+#
+#  Last edited
+#  17.10.2026 :: reference and orbkit_qc
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import os
+import sys
+
+import numpy
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+sys.path.insert(0, os.path.join(root, "benchmarks"))
+import synthetic
+
+molecules = [("h2o", None),                                     #: (name, (atoms, basis, spin, spherical))
+             ("cartesian", (3, "tzp", "closed", False)),
+             ("cartesian-open", (3, "dzp", "open", False)),
+             ("spherical", (3, "tzp", "closed", True)),
+             ("spherical-open", (4, "dzp", "open", True))]
+
+
+@pytest.fixture(params=molecules, ids=[name for name, settings in molecules])
+def molden_file(request, tmpdir):
+  name, settings = request.param
+  if settings is None:
+    return os.path.join(root, "example", "h2o.molden")
+  filename = str(tmpdir.join(name + ".molden"))
+  synthetic.write_molden(filename, *settings)
+  return filename
+
+
+@pytest.fixture
+def reference(molden_file):
+  name = os.path.splitext(os.path.basename(molden_file))[0]
+  with numpy.load(os.path.join(root, "tests", "reference", "orbkit.npz")) as arrays:
+    return dict((key[len(name)+1:], arrays[key]) for key in arrays.files if key.startswith(name + "."))
+
+
+@pytest.fixture
+def orbkit_qc(molden_file):
+  pytest.importorskip("orbkit")
+  from sharpo import api
+  qc = api.load(molden_file)
+  if not hasattr(qc, 'ao_spherical'):
+    pytest.skip("orbkit 1.x; sharpo reads orbkit 0.x (the reference tests cover orbkit 1.1)")
+  return qc
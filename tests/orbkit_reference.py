@@ -0,0 +1,124 @@
+#! /usr/bin/env python2.7
+# ===========================================================
+#
+#   Tests for sharpo
+#   orbkit_reference.py :: writes the orbkit reference of
+#                          test_gaussians.py and test_molden.py
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python tests/orbkit_reference.py (needs orbkit)
+#
+#  Comments
+#  :: For every file of conftest.molden_file, orbkit reads the file and
+#     evaluates the MOs (projection.evaluate_mos) on n_points random
+#     points within 3 a.u. of the atoms. The synthetic MOs are random
+#     combinations of all AOs, so every AO enters the values.
+#  :: tests/reference/orbkit.npz holds per file (keys "<file>.<name>"):
+#     points[xyz, point], mo_values[mo, point], geo_spec (bohr, as orbkit
+#     converts it), energies, occupations, coefficients, syms, spins
+#     (0 alpha, 1 beta or closed shell) and the orbkit version.
+#  :: The committed file was written with orbkit 1.1.0 (the release on
+#     PyPI), which converts Angstrom with a newer bohr radius than sharpo
+#     and orbkit 0.x and keeps the spin in mo_spec['spin'] only.
+#
+#  Last edited
+#  17.10.2026 :: first version
+#
+# ===========================================================
+from __future__ import print_function
+
+import os
+import sys
+import tempfile
+import shutil
+
+import numpy
+
+tests = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, tests)
+import conftest
+import synthetic
+from sharpo import api
+from sharpo import projection
+
+reference_file = os.path.join(tests, "reference", "orbkit.npz")
+n_points = 100
+
+
+#--------------------------------------------
+# Random points within 3 a.u. of the atoms
+#--------------------------------------------
+def points(geo_spec, n=n_points):
+  rng = numpy.random.RandomState(1)
+  geo_spec = numpy.array(geo_spec, dtype=float)
+  xyz = geo_spec[rng.randint(0, len(geo_spec), n)] + rng.uniform(-3., 3., (n, 3))
+  return xyz.T.copy()
+
+
+#--------------------------------------------
+# Spins of orbkit's MOs (0 alpha, 1 beta)
+#--------------------------------------------
+def orbkit_spins(qc):
+  spins = []
+  for item in qc.mo_spec:
+    spin = str(item.get('spin', ''))
+    spins.append(int(spin.lower().startswith('beta') or item['sym'].endswith('_b')))
+  return numpy.array(spins, dtype=int)
+
+
+#--------------------------------------------
+# Reference of one molden file
+#--------------------------------------------
+def reference(filename):
+  import orbkit
+  qc = api.load(filename)
+  xyz = points(qc.geo_spec)
+  energies, occupations, syms = [numpy.array(a) for a in zip(*[(item['energy'], item['occ_num'], str(item['sym']))
+                                                               for item in qc.mo_spec])]
+  return {'points':       xyz,
+          'mo_values':    projection.evaluate_mos(qc, xyz[0], xyz[1], xyz[2], 1),
+          'geo_spec':     numpy.array(qc.geo_spec, dtype=float),
+          'energies':     energies.astype(float),
+          'occupations':  occupations.astype(float),
+          'coefficients': numpy.array([item['coeffs'] for item in qc.mo_spec], dtype=float),
+          'syms':         syms,
+          'spins':        orbkit_spins(qc),
+          'version':      numpy.array(str(getattr(orbkit, '__version__', 'unknown')))}
+
+
+if __name__ == "__main__":
+  tmp = tempfile.mkdtemp()
+  arrays = {}
+  try:
+    for name, settings in conftest.molecules:
+      if settings is None:
+        filename = os.path.join(conftest.root, "example", "h2o.molden")
+      else:
+        filename = os.path.join(tmp, name + ".molden")
+        synthetic.write_molden(filename, *settings)
+      for key, value in reference(filename).items():
+        arrays["%s.%s" % (name, key)] = value
+      print("%-16s %4i MOs" % (name, len(arrays[name + ".energies"])))
+  finally:
+    shutil.rmtree(tmp)
+  if not os.path.isdir(os.path.dirname(reference_file)):
+    os.makedirs(os.path.dirname(reference_file))
+  numpy.savez_compressed(reference_file, **arrays)
+  print("Reference saved to %s" % reference_file)
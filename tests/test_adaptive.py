@@ -0,0 +1,63 @@
+# ===========================================================
+#
+#   Tests for sharpo
+#   test_adaptive.py :: the cubature projection with retired MOs
+#                       (--converge)
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python -m pytest tests (skipped without cubature)
+#
+#  Comments
+#  :: example/h2o.molden with the native reader and evaluator, the MOs
+#     below 0 eV, radius 1.5 a.u., lmax = 3, abserr 1e-3 (relerr 0).
+#  :: MOs retired after the first region of an angular integral
+#     (adaptive.retire_factor) must leave all_c within abserr of the run
+#     which refines every MO (measured: 8e-5), and MOs must be retired.
+#
+#  Last edited
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import os
+import sys
+
+import numpy
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+from sharpo import api
+from sharpo import profiling
+
+abserr = 1e-3
+
+
+def test_converge_stays_within_abserr():
+  pytest.importorskip("cubature")
+  qc = api.load(os.path.join(root, "example", "h2o.molden"), reader="native", sidecar=False)
+  settings = {'radius': 1.5, 'lmax': 3, 'e_range': (-30., 0.), 'evaluator': "native", 'abserr': abserr, 'relerr': 0.}
+
+  profile = profiling.Profile()
+  retiring = api.project(qc, converge=True, profile=profile, **settings)['all_c']
+  refined = api.project(qc, converge=False, **settings)['all_c']
+  assert profile.report()['totals']['retired'] > 0
+  assert numpy.abs(refined).max() > 0.1
+  numpy.testing.assert_allclose(retiring, refined, rtol=0., atol=abserr)
@@ -0,0 +1,89 @@
+# ===========================================================
+#
+#   Tests for sharpo
+#   test_analytic.py :: the analytic projection against the fixed
+#                       grid
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python -m pytest tests
+#
+#  Comments
+#  :: example/h2o.molden (s, p and cartesian d shells) with the native
+#     evaluator; centers on the oxygen and off the nuclei, radii 1 and 2
+#     a.u., lmax = 4.
+#  :: The analytic projection with NR = 128 agrees with NR = 512 to
+#     1e-9, so the difference is the error of the fixed grid (64 radial
+#     points, angular degree 91): 9e-5 at most, from the oxygen core
+#     seen from the center off the nuclei. The tolerance is 2e-4.
+#  :: All MOs and every d AO on its own (l_basis = 2: the Bessel terms
+#     of a shell with l > 1 and its angular table).
+#  :: benchmarks/analytic_check.py compares more molecules and the
+#     cubature path.
+#
+#  Last edited
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import os
+import sys
+
+import numpy
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+from sharpo import analytic
+from sharpo import api
+from sharpo import gaussians
+from sharpo import projection
+
+tolerance = 2e-4
+radii = [1., 2.]
+lmax = 4
+
+
+@pytest.fixture(scope="module")
+def wfn():
+  qc = api.load(os.path.join(root, "example", "h2o.molden"), reader="native", sidecar=False)
+  centers = numpy.array([qc.geo_spec[1], [0.3, -0.5, 0.8]], dtype=float)
+  return gaussians.native_qc(qc, qc.mo_spec), centers
+
+
+def d_functions(wfn):
+  d_aos = [i_ao for shell in wfn['basis'] if shell['l'] == 2 for i_ao, poly in shell['aos']]
+  d_wfn = dict(wfn)
+  d_wfn['coeffs'] = numpy.eye(wfn['n_ao'])[d_aos]               #: one "MO" per d AO
+  return d_wfn
+
+
+@pytest.mark.parametrize("functions", ["mo", "d-ao"])
+@pytest.mark.parametrize("real_sh", [False, True], ids=["complex", "real"])
+def test_analytic_matches_fixed_grid(wfn, functions, real_sh):
+  qc, centers = wfn
+  if functions == "d-ao":
+    qc = d_functions(qc)
+    assert len(qc['coeffs']) == 6                               #: cartesian d of the oxygen
+
+  exact = analytic.analytic_projection(qc, centers, radii, lmax, 128, 1, real_sh)
+  grid = projection.scheduled_sweep(qc, centers, projection.fixed_grid(radii[-1], lmax, 64, 91, real_sh, radii), 1)
+  assert exact.shape == grid.shape == (len(centers), len(radii), lmax+1, len(qc['coeffs']))
+  assert numpy.abs(exact).max() > 0.1
+  numpy.testing.assert_allclose(exact, grid, rtol=0., atol=tolerance)
@@ -0,0 +1,143 @@
+# ===========================================================
+#
+#   Tests for sharpo
+#   test_cache.py :: hits, misses, broken entries and the LRU
+#                    eviction of the projection cache
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python -m pytest tests (the cubature run is skipped without
+#      cubature)
+#
+#  Comments
+#  :: Entries of random arrays under keys of a small input file; the
+#     cubature run of example/h2o.molden (native reader and evaluator)
+#     checks that a hit gives all_c and the estimated errors of the run.
+#  :: Broken entries: truncated and garbage files have to count as
+#     missing and be removed.
+#
+#  Last edited
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import os
+import sys
+
+import numpy
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+from sharpo import api
+from sharpo import cache
+
+mo_arrays = (numpy.linspace(-1., 0.5, 6), numpy.array([2., 2., 2., 0., 0., 0.]), ["1.1"]*6)
+
+
+@pytest.fixture
+def input_file(tmpdir):
+  filename = str(tmpdir.join("input.molden"))
+  with open(filename, "w") as f:
+    f.write("[Molden Format]\n")
+  return filename
+
+
+def store(cache_dir, key, max_size=1 << 30, errors=False):
+  rng = numpy.random.RandomState(len(key))
+  all_c = rng.uniform(size=(2, 1, 3, 4))
+  error, angular_error = (rng.uniform(size=all_c.shape), rng.uniform(size=(2, 4))) if errors else (None, None)
+  cache.store(cache_dir, key, all_c, [2, 3, 4, 5], numpy.zeros((2, 3)), mo_arrays, False, max_size,
+              error, angular_error)
+  return all_c, error, angular_error
+
+
+def test_miss_and_hit(tmpdir, input_file):
+  cache_dir = str(tmpdir.join("cache"))
+  key = cache.projection_key(input_file, [('lmax', 2)])
+  assert key != cache.projection_key(input_file, [('lmax', 3)])
+  assert cache.load(cache_dir, key) is None
+
+  all_c, error, angular_error = store(cache_dir, key, errors=True)
+  entry = cache.load(cache_dir, key)
+  numpy.testing.assert_array_equal(cache.select(entry, [2, 3, 4, 5]), all_c)
+  numpy.testing.assert_array_equal(cache.select(entry, [3, 5]), all_c[..., [1, 3]])
+  numpy.testing.assert_array_equal(cache.select(entry, [3, 5], 'error'), error[..., [1, 3]])
+  numpy.testing.assert_array_equal(cache.select(entry, [3, 5], 'angular_error'), angular_error[:, [1, 3]])
+  assert cache.select(entry, [1, 2]) is None                    #: MO 1 is not in the entry
+
+  store(cache_dir, key)                                         #: other quadratures: no errors
+  entry = cache.load(cache_dir, key)
+  assert entry['error'] is None and cache.select(entry, [2], 'error') is None
+
+
+@pytest.mark.parametrize("damage", ["truncated", "garbage", "empty"])
+def test_broken_entry_is_a_miss(tmpdir, damage):
+  cache_dir = str(tmpdir)
+  store(cache_dir, "mo")
+  cache.store_ao(cache_dir, "ao", numpy.ones((3, 4, 9)), 1 << 30)
+  for key in ("mo", "ao"):
+    filename = os.path.join(cache_dir, key + cache.suffix)
+    with open(filename, "rb") as f:
+      text = f.read()
+    with open(filename, "wb") as f:
+      f.write({'truncated': text[:len(text)//2], 'garbage': b"no zip file" * 10, 'empty': b""}[damage])
+
+  assert cache.load(cache_dir, "mo") is None
+  assert cache.load_ao(cache_dir, "ao") is None
+  assert not cache.has_entry(cache_dir, "mo") and not cache.has_entry(cache_dir, "ao")
+
+
+def test_least_recently_used_are_evicted(tmpdir):
+  cache_dir = str(tmpdir)
+  for k, key in enumerate(["a", "b", "c"]):
+    store(cache_dir, key)
+    os.utime(os.path.join(cache_dir, key + cache.suffix), (1000.+k, 1000.+k))
+  size = os.path.getsize(os.path.join(cache_dir, "a" + cache.suffix))
+
+  cache.select(cache.load(cache_dir, "a"), [2])                 #: "a" is used -> "b" is the oldest
+  cache.evict(cache_dir, 2*size)
+  assert [cache.has_entry(cache_dir, key) for key in ["a", "b", "c"]] == [True, False, True]
+
+  store(cache_dir, "d", max_size=2*size)                        #: store evicts too
+  assert [cache.has_entry(cache_dir, key) for key in ["a", "c", "d"]] == [True, False, True]
+
+
+def test_evict_skips_entries_removed_by_other_runs(tmpdir, monkeypatch):
+  cache_dir = str(tmpdir)
+  store(cache_dir, "a")
+  listdir = os.listdir
+  monkeypatch.setattr(cache.os, "listdir", lambda path: listdir(path) + ["removed" + cache.suffix])
+  cache.evict(cache_dir, 0)
+  assert not cache.has_entry(cache_dir, "a")
+
+
+def test_cubature_hit_keeps_the_errors(tmpdir):
+  pytest.importorskip("cubature")
+  filename = os.path.join(root, "example", "h2o.molden")
+  qc = api.load(filename, reader="native", sidecar=False)
+  settings = {'radius': 1., 'lmax': 1, 'evaluator': "native", 'reader': "native", 'abserr': 1e-3, 'relerr': 1e-3,
+              'input_file': filename, 'cache_dir': str(tmpdir)}
+
+  computed = api.project(qc, **settings)
+  cached = api.project(None, **settings)
+  assert not computed['from_cache'] and cached['from_cache']
+  assert computed['error'] is not None
+  for name in ('all_c', 'error', 'angular_error'):
+    numpy.testing.assert_array_equal(cached[name], computed[name])
@@ -0,0 +1,99 @@
+# ===========================================================
+#
+#   Tests for sharpo
+#   test_gaussians.py :: the native Gaussian evaluator against
+#                        orbkit
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python -m pytest tests (the comparison with orbkit itself is
+#      skipped without orbkit 0.x)
+#
+#  Comments
+#  :: Files (conftest.molden_file): example/h2o.molden (cartesian d) and
+#     synthetic molecules with cartesian and with spherical ([5D7F]) d
+#     and f functions, i.e. both orderings of the AOs in molden files.
+#  :: Against the reference: the MOs of the native reader, on orbkit's
+#     geometry, on the points of tests/reference/orbkit.npz (MO values of
+#     orbkit 1.1.0, see orbkit_reference.py), with and without the
+#     screening of the shells at a center (they agree to 6e-16 of the
+#     largest value).
+#  :: Against orbkit: both evaluators get the wave function read by
+#     orbkit; the MOs are compared on random points around the molecule.
+#
+#  Last edited
+#  17.10.2026 :: against the committed orbkit reference
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import os
+import sys
+
+import numpy
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sharpo import api
+from sharpo import gaussians
+from sharpo import projection
+
+
+#--------------------------------------------
+# Random points within 3 a.u. of the atoms
+#--------------------------------------------
+def points(geo_spec, n=400):
+  rng = numpy.random.RandomState(1)
+  geo_spec = numpy.array(geo_spec, dtype=float)
+  xyz = geo_spec[rng.randint(0, len(geo_spec), n)] + rng.uniform(-3., 3., (n, 3))
+  return xyz[:,0], xyz[:,1], xyz[:,2]
+
+
+#--------------------------------------------
+# Native MOs against reference MOs, also with
+# the shells screened at the first atom
+#---
+def check_native(wfn, geo_spec, x, y, z, reference):
+  native = projection.evaluate_mos(wfn, x, y, z, 1)
+  assert native.shape == reference.shape
+  scale = numpy.abs(reference).max()
+  numpy.testing.assert_allclose(native, reference, rtol=1e-8, atol=1e-10*scale)
+
+  #------------------------------------------
+  # Screened shells only matter outside the
+  # sphere around the center
+  #---
+  center = numpy.array(geo_spec[0], dtype=float)
+  inside = (x - center[0])**2 + (y - center[1])**2 + (z - center[2])**2 <= 1.5**2
+  assert inside.any()
+  screened = projection.evaluate_mos(wfn, x[inside], y[inside], z[inside], 1, center, 1.5)
+  numpy.testing.assert_allclose(screened, reference[:, inside], rtol=1e-8, atol=1e-8*scale)
+
+
+def test_native_matches_orbkit_reference(molden_file, reference):
+  qc = api.load(molden_file, reader="native", sidecar=False)
+  wfn = gaussians.native_qc(dict(qc.todict(), geo_spec=reference['geo_spec']), qc.mo_spec)
+  x, y, z = reference['points']
+  check_native(wfn, reference['geo_spec'], x, y, z, reference['mo_values'])
+
+
+def test_native_matches_orbkit(orbkit_qc):
+  qc = orbkit_qc
+  x, y, z = points(qc.geo_spec)
+  check_native(gaussians.native_qc(qc, qc.mo_spec), qc.geo_spec, x, y, z, projection.evaluate_mos(qc, x, y, z, 1))
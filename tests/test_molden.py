@@ -0,0 +1,104 @@
+# ===========================================================
+#
+#   Tests for sharpo
+#   test_molden.py :: the native molden reader against orbkit
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python -m pytest tests (the comparison with orbkit itself is
+#      skipped without orbkit 0.x)
+#
+#  Comments
+#  :: Files: conftest.molden_file (cartesian and spherical, closed and
+#     open shell).
+#  :: MoldenQC has to give what orbkit gives: coefficients, energies,
+#     occupations, symmetry labels (with _a/_b for open shells) and
+#     spins, once from the text and once from the sidecar.
+#  :: Against the reference (tests/reference/orbkit.npz, orbkit 1.1.0):
+#     orbkit 1.x converts Angstrom with a newer bohr radius (geo_spec to
+#     1e-8) and keeps the spin of open shells in mo_spec['spin'], so the
+#     labels are compared without _a/_b.
+#  :: Against orbkit: orbkit 0.x marks the spin in the symmetry label
+#     (_a/_b) and, in newer versions, in mo_spec['spin'].
+#
+#  Last edited
+#  17.10.2026 :: against the committed orbkit reference
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import shutil
+import os
+import sys
+
+import numpy
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sharpo import api
+from sharpo import molden
+from orbkit_reference import orbkit_spins
+
+
+#--------------------------------------------
+# Native qc against orbkit's arrays
+#--------------------------------------------
+def check_arrays(native, energies, occupations, coefficients, spins):
+  numpy.testing.assert_allclose(native.mo_energies, energies, rtol=1e-12, atol=0.)
+  numpy.testing.assert_allclose(native.mo_occupations, occupations, rtol=1e-12, atol=0.)
+  numpy.testing.assert_array_equal(native.mo_spins, spins)
+
+  assert native.coefficients.shape == coefficients.shape
+  numpy.testing.assert_allclose(native.coefficients, coefficients, rtol=1e-12, atol=0.)
+  for item, expected in zip(native.mo_spec, coefficients):
+    numpy.testing.assert_allclose(item['coeffs'], expected, rtol=1e-12, atol=0.)
+
+
+def native_copy(molden_file, tmpdir):
+  filename = str(tmpdir.join("input.molden"))                   #: the sidecar goes next to the file
+  shutil.copy(molden_file, filename)
+  return filename
+
+
+def test_native_reader_matches_orbkit_reference(molden_file, reference, tmpdir):
+  filename = native_copy(molden_file, tmpdir)
+  strip = lambda syms: [str(sym)[:-2] if str(sym)[-2:] in ('_a', '_b') else str(sym) for sym in syms]
+
+  native = api.load(filename, reader="native")
+  numpy.testing.assert_allclose(native.geo_spec, reference['geo_spec'], rtol=1e-8)
+  for qc in (native, api.load(filename, reader="native")):     #: from the text, from the sidecar
+    check_arrays(qc, reference['energies'], reference['occupations'], reference['coefficients'], reference['spins'])
+    assert strip(qc.mo_syms) == strip(reference['syms'])
+    assert [item['sym'] for item in qc.mo_spec] == list(qc.mo_syms)
+  assert os.path.isfile(filename + ".npz")
+
+
+def test_native_reader_matches_orbkit(molden_file, orbkit_qc, tmpdir):
+  filename = native_copy(molden_file, tmpdir)
+  reference = orbkit_qc
+  energies, occupations, syms = molden.mo_arrays(reference)
+  coefficients = numpy.array([item['coeffs'] for item in reference.mo_spec], dtype=float)
+
+  native = api.load(filename, reader="native")
+  numpy.testing.assert_allclose(native.geo_spec, numpy.array(reference.geo_spec, dtype=float), rtol=1e-12)
+  for qc in (native, api.load(filename, reader="native")):     #: from the text, from the sidecar
+    check_arrays(qc, energies, occupations, coefficients, orbkit_spins(reference))
+    assert list(qc.mo_syms) == list(syms)
+    assert [item['sym'] for item in qc.mo_spec] == list(syms)
+  assert os.path.isfile(filename + ".npz")
@@ -0,0 +1,169 @@
+# ===========================================================
+#
+#   Tests for sharpo
+#   test_projection.py :: the fixed grid projection gives the same
+#                         bits for any number of processes
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python -m pytest tests (the cubature run is skipped without
+#      cubature)
+#
+#  Comments
+#  :: example/h2o.molden with the native reader and evaluator, two
+#     centers and two radii; 20 radial shells make three work units
+#     per center (projection.radial_block = 8).
+#  :: scheduled_sweep (MO projections, with and without MO blocks, and
+#     AO projections with the MOs made afterwards) has to give the
+#     same bits for -p 1, 2 and 3 (parallel.py: the units do not depend
+#     on nproc and are reduced in their order), also with --max-memory:
+#     a tight budget (fewer shells per unit, MO or AO blocks, one
+#     worker at a time) and a large one (three workers at a time).
+#  :: MO and AO blocks (--mo-block, or --max-memory with all shells in a
+#     unit) give the same bits as one block; a synthetic molecule with
+#     100 MOs has blocks of 32 (gaussians.mo_chunk). Fewer shells per
+#     unit add the partial sums in another order: the same to 1e-13.
+#  :: A budget below one work unit with one block raises
+#     MemoryBudgetError.
+#  :: fixed_grid refuses an angular degree below 2*lmax (the Ylm table
+#     is not orthogonal on it); with the default --grid-order the fixed
+#     grid gives the cubature all_c (MOs below 0 eV, lmax = 3) within
+#     --abserr.
+#
+#  Last edited
+#  17.10.2026 :: angular degree and lmax, fixed grid against cubature
+#  17.10.2026 :: MO blocks and MemoryBudgetError
+#  17.10.2026 :: with --max-memory
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import os
+import sys
+
+import numpy
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+sys.path.insert(0, os.path.join(root, "benchmarks"))
+import synthetic
+from sharpo import api
+from sharpo import gaussians
+from sharpo import projection
+
+
+@pytest.fixture(scope="module")
+def wfn():
+  qc = api.load(os.path.join(root, "example", "h2o.molden"), reader="native", sidecar=False)
+  centers = numpy.array([qc.geo_spec[0], numpy.mean(qc.geo_spec, axis=0)], dtype=float)
+  return gaussians.native_qc(qc, qc.mo_spec), centers
+
+
+budgets = {'none': 0., 'tight': 0.5, 'large': 4.}               #: MB; tight is 1 MB for the AOs
+
+
+@pytest.mark.parametrize("budget", sorted(budgets))
+@pytest.mark.parametrize("real_sh", [False, True], ids=["complex", "real"])
+@pytest.mark.parametrize("mode", ["mo", "mo-block", "ao"])
+def test_sweep_is_bit_identical_for_any_nproc(wfn, mode, real_sh, budget):
+  qc, centers = wfn
+  qgrid = projection.fixed_grid(1.5, 4, 20, 11, real_sh, [0.8, 1.5])
+  coeffs = qc['coeffs'] if mode == "ao" else None
+  mo_block = 2 if mode == "mo-block" else 0
+  max_memory = 1. if mode == "ao" and budget == "tight" else budgets[budget]
+
+  all_c = [projection.scheduled_sweep(qc, centers, qgrid, nproc, coeffs, mo_block, max_memory)
+           for nproc in (1, 2, 3)]
+  assert all_c[0].shape == (len(centers), 2, 5, len(qc['coeffs']))
+  assert numpy.isfinite(all_c[0]).all() and all_c[0].any()
+  for result in all_c[1:]:
+    assert result.tobytes() == all_c[0].tobytes()
+
+
+@pytest.fixture(scope="module")
+def large_wfn(tmpdir_factory):
+  filename = str(tmpdir_factory.mktemp("molden").join("12at-dzp.molden"))
+  synthetic.write_molden(filename, 12, "dzp", "closed", False)
+  qc = api.load(filename, reader="native", sidecar=False)
+  geo_spec = numpy.array(qc.geo_spec, dtype=float)
+  return gaussians.native_qc(qc, qc.mo_spec), numpy.array([geo_spec[0], geo_spec.mean(axis=0)])
+
+
+tight = {('mo', False): 3., ('mo', True): 2., ('ao', False): 4., ('ao', True): 2.}   #: MB; all shells in a unit
+
+
+def sweep(wfn, real_sh, mode, mo_block=0, max_memory=0.):
+  qc, centers = wfn
+  qgrid = projection.fixed_grid(3., 4, 20, 11, real_sh, [1.5, 3.])
+  coeffs = qc['coeffs'] if mode == "ao" else None
+  return projection.scheduled_sweep(qc, centers, qgrid, 1, coeffs, mo_block, max_memory)
+
+
+def blocks(wfn, real_sh, mode, max_memory):
+  qc, centers = wfn
+  qgrid = projection.fixed_grid(3., 4, 20, 11, real_sh, [1.5, 3.])
+  if mode == "ao":
+    qc = projection.ao_qc(qc)
+  n_func = projection.n_functions(qc)
+  n_shells, worker, workers = projection.sweep_shells(qc, qgrid, len(centers), n_func, 1, max_memory, mode == "ao")
+  fixed = projection.unit_bytes(qc, qgrid, n_func, n_shells, mode == "ao")
+  return n_shells, projection.mo_block_size(n_func, n_shells*len(qgrid['theta']), 0, worker, fixed), n_func
+
+
+@pytest.mark.parametrize("real_sh", [False, True], ids=["complex", "real"])
+@pytest.mark.parametrize("mode", ["mo", "ao"])
+def test_blocks_give_the_same_bits(large_wfn, mode, real_sh):
+  n_shells, n_block, n_func = blocks(large_wfn, real_sh, mode, tight[(mode, real_sh)])
+  assert n_block < n_func and (mode == "ao" or n_shells == projection.radial_block)
+
+  all_c = sweep(large_wfn, real_sh, mode)
+  for mo_block, max_memory in ((1, 0.), (40, 0.), (0, tight[(mode, real_sh)])):
+    assert sweep(large_wfn, real_sh, mode, mo_block, max_memory).tobytes() == all_c.tobytes()
+
+
+def test_fewer_shells_change_the_last_digits_only(large_wfn):
+  n_shells, n_block, n_func = blocks(large_wfn, False, "mo", 1.5)
+  assert n_shells < projection.radial_block and n_block < n_func
+  numpy.testing.assert_allclose(sweep(large_wfn, False, "mo", 0, 1.5), sweep(large_wfn, False, "mo"),
+                                rtol=1e-13, atol=1e-15)
+
+
+@pytest.mark.parametrize("mode", ["mo", "ao"])
+def test_budget_below_one_block_raises(large_wfn, mode):
+  with pytest.raises(projection.MemoryBudgetError):
+    sweep(large_wfn, False, mode, 0, 1.)
+
+
+@pytest.mark.parametrize("lmax, order", [(4, 7), (6, 11), (16, 31)])
+def test_angular_degree_below_two_lmax_raises(lmax, order):
+  with pytest.raises(ValueError):
+    projection.fixed_grid(1.5, lmax, 20, order)
+  projection.fixed_grid(1.5, lmax, 20, 2*lmax)
+
+
+def test_fixed_grid_matches_cubature():
+  pytest.importorskip("cubature")
+  qc = api.load(os.path.join(root, "example", "h2o.molden"), reader="native", sidecar=False)
+  abserr = 1e-3
+  settings = {'radius': 1.5, 'lmax': 3, 'e_range': (-30., 0.), 'evaluator': "native"}
+  cubature = api.project(qc, abserr=abserr, relerr=0., **settings)['all_c']
+  grid = api.project(qc, quadrature="gauss", grid_order=(64, 31), **settings)['all_c']
+  assert cubature.shape == grid.shape and numpy.abs(cubature).max() > 0.1
+  numpy.testing.assert_allclose(grid, cubature, rtol=0., atol=abserr)
@@ -0,0 +1,89 @@
+# ===========================================================
+#
+#   Tests for sharpo
+#   test_sh.py :: the spherical harmonics of all l at once
+#                 (sh_all, rsh_all) against the single ones
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python -m pytest tests
+#
+#  Comments
+#  :: sh() has all Ylm up to l = 6 typed in; sh_all uses the recursion
+#     formulas, so the two are independent.
+#  :: The real harmonics are checked against their definition by the
+#     complex ones (sh.py):
+#       S_l0 = Y_l0, S_lm = sqrt(2) (-1)^m Re(Y_l|m|) (m > 0),
+#       S_lm = sqrt(2) (-1)^m Im(Y_l|m|) (m < 0)
+#
+#  Last edited
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import os
+import sys
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sharpo import sh
+
+lmax = 6
+
+
+#--------------------------------------------
+# Random angles, the poles and phi = 0, 2 pi
+#--------------------------------------------
+def angles():
+  rng = numpy.random.RandomState(0)
+  theta = numpy.append(rng.uniform(0., numpy.pi, 200), [0., numpy.pi, 0.5*numpy.pi, 1.])
+  phi   = numpy.append(rng.uniform(0., 2.*numpy.pi, 200), [0.3, 1.2, 0., 2.*numpy.pi])
+  return theta, phi
+
+
+def test_sh_all_matches_sh():
+  theta, phi = angles()
+  ylm = sh.sh_all(lmax, theta, phi)
+  assert ylm.shape == ((lmax+1)**2, len(theta))
+  for l in range(0, lmax+1):
+    for m in range(-l, l+1):
+      numpy.testing.assert_allclose(ylm[l*l+l+m], sh.sh(l, m, theta, phi), rtol=1e-12, atol=1e-12,
+                                    err_msg="l = %i, m = %i" % (l, m))
+
+
+def test_rsh_all_is_real_combination_of_sh_all():
+  theta, phi = angles()
+  ylm = sh.sh_all(lmax, theta, phi)
+  slm = sh.rsh_all(lmax, theta, phi)
+  assert slm.shape == ylm.shape
+  assert slm.dtype == numpy.float64
+  for l in range(0, lmax+1):
+    for m in range(-l, l+1):
+      y = ylm[l*l+l+abs(m)]
+      if m > 0:
+        expected = numpy.sqrt(2.) * (-1)**m * numpy.real(y)
+      elif m < 0:
+        expected = numpy.sqrt(2.) * (-1)**m * numpy.imag(y)
+      else:
+        expected = numpy.real(y)
+      numpy.testing.assert_allclose(slm[l*l+l+m], expected, rtol=1e-12, atol=1e-12,
+                                    err_msg="l = %i, m = %i" % (l, m))
+      numpy.testing.assert_allclose(sh.rsh(l, m, theta, phi), expected, rtol=1e-12, atol=1e-12,
+                                    err_msg="rsh, l = %i, m = %i" % (l, m))
@@ -0,0 +1,98 @@
+# ===========================================================
+#
+#   Tests for sharpo
+#   test_smearing.py :: the sparse Gaussian smearing against the
+#                       per-point loop it replaced
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python -m pytest tests
+#
+#  Comments
+#  :: A small random spectrum (MOs inside, at the edges and outside of
+#     the energy grid, degenerate MOs) with weights[mo, atom, l]; the
+#     reference adds every Gaussian on the whole grid like the loops of
+#     the old mo_coefficients and sharpo. The cut at +- 8 sigma
+#     (smearing.window) leaves 1e-14 of the peak height.
+#  :: One channel, and alpha / beta channels with MOs of no channel.
+#  :: Importing smearing and mo_coefficients must not import scipy.
+#
+#  Last edited
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import os
+import subprocess
+import sys
+
+import numpy
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+from sharpo import smearing
+
+
+def loop_smearing(x, energies, weights, sigma, channels, n_channels):
+  gx = numpy.zeros((n_channels, len(x)) + weights.shape[1:])
+  for i_mos in range(0, len(energies)):
+    if channels[i_mos] < 0:
+      continue
+    for ix in range(0, len(x)):
+      gx[channels[i_mos], ix] += weights[i_mos] * (1./(sigma*numpy.sqrt(2.*numpy.pi))) * \
+                                 numpy.exp(-(1./(2.*sigma**2.))*(x[ix] - energies[i_mos])**2.)
+  return gx
+
+
+@pytest.fixture
+def spectrum():
+  rng = numpy.random.RandomState(7)
+  energies = numpy.concatenate([rng.uniform(-12., 3., 20), [-10., -10., -10.05, 2.98, 3.3, -14.]])
+  weights = rng.uniform(size=(len(energies), 3, 7))            #: weights[mo, atom, l]
+  return smearing.energy_grid(-10., 3., 50.), energies, weights
+
+
+@pytest.mark.parametrize("sigma", [0.1, 0.4])
+@pytest.mark.parametrize("spin_polarized", [False, True], ids=["restricted", "alpha-beta"])
+def test_smear_matches_the_loop(spectrum, sigma, spin_polarized):
+  x, energies, weights = spectrum
+  syms = [["1.1_a", "2.1_b", "3.1"][i % 3] for i in range(len(energies))]
+  channels, n_channels = smearing.spin_channels(syms, spin_polarized)
+  if spin_polarized:
+    assert n_channels == 2 and (channels == -1).any()
+
+  gx = smearing.smear(x, energies, weights, sigma, channels, n_channels)
+  reference = loop_smearing(x, energies, weights, sigma, channels, n_channels)
+  assert gx.shape == reference.shape == (n_channels, len(x), 3, 7)
+  numpy.testing.assert_allclose(gx, reference, rtol=1e-12, atol=1e-13*reference.max())
+
+
+def test_smear_one_weight_per_mo(spectrum):
+  x, energies, weights = spectrum
+  channels = numpy.zeros(len(energies), dtype=int)
+  numpy.testing.assert_allclose(smearing.smear(x, energies, weights[:,0,0], 0.1),
+                                loop_smearing(x, energies, weights[:,0,0], 0.1, channels, 1),
+                                rtol=1e-12, atol=1e-13)
+
+
+def test_import_does_not_need_scipy():
+  code = "import sys; import sharpo.smearing, sharpo.mo_coefficients; print('scipy' in sys.modules)"
+  output = subprocess.check_output([sys.executable, "-c", code], cwd=root)
+  assert output.strip() == b"False"
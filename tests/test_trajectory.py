@@ -0,0 +1,96 @@
+# ===========================================================
+#
+#   Tests for sharpo
+#   test_trajectory.py :: frames of a trajectory with the native
+#                         reader, read ahead and with -p > 1
+#
+#   License
+#   :: Copyright (c) 2016 by Lukas Hammerschmidt
+#      l.hammerschmidt@auckland.ac.nz
+#
+#   :: This file is part of sharpo. Sharpo is free software: you
+#      can redistribute it and/or modify it under the terms of the
+#      GNU Lesser General Public License as published by the Free
+#      Software Foundation, either version 3 of the License, or any
+#      later version.
+#
+#   :: This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#      GNU Lesser General Public License for more details. You should
+#      have received a copy of the GNU Lesser General Public License
+#      along with sharpo.  If not, see <http://www.gnu.org/licenses/>.
+#
+#   Usage
+#   :: python -m pytest tests
+#
+#  Comments
+#  :: The trajectory is example/h2o.molden twice in one file, so both
+#     frames have to give the same rows.
+#  :: --reader native has to give MoldenQC frames (no orbkit), read
+#     ahead in a thread (-p 1) or in the main thread (-p > 1).
+#
+#  Last edited
+#  17.10.2026 :: first version
+#
+# ===========================================================
+
+import os
+import sys
+
+import numpy
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+from sharpo import projection
+from sharpo import trajectory
+from sharpo import molden
+
+
+@pytest.fixture
+def frames(tmpdir):
+  with open(os.path.join(root, "example", "h2o.molden")) as f:
+    text = f.read()
+  filename = str(tmpdir.join("trajectory.molden"))
+  with open(filename, "w") as f:
+    f.write(text + text)
+  return trajectory.frame_list([filename], "molden")
+
+
+@pytest.mark.parametrize("background", [True, False], ids=["read-ahead", "main-thread"])
+def test_native_reader_reads_the_frames(frames, background):
+  assert len(frames) == 2
+  read = list(trajectory.prefetched(frames, "molden", "native", True, background))
+  assert [frame for frame, qc in read] == frames
+  for frame, qc in read:
+    assert isinstance(qc, molden.MoldenQC)
+    assert len(qc.mo_spec) > 0
+
+
+def frame_rows(output_file):
+  with open(output_file + ".frames.dat") as f:
+    rows = [line.split() for line in f if not line.startswith("#")]
+  return [row[1:] for row in rows if row[0] == "1"], [row[1:] for row in rows if row[0] == "2"]
+
+
+@pytest.mark.parametrize("numproc", [1, 2])
+def test_native_trajectory_run(frames, tmpdir, numproc):
+  output_file = str(tmpdir.join("out"))
+  trajectory.run(frames, {'itype':      "molden",
+                          'reader':     "native",
+                          'sidecar':    False,
+                          'qgrid':      projection.fixed_grid(1.5, 2, 16, 7),
+                          'centers':    numpy.array([[0., 0., 0.]]),
+                          'numproc':    numproc,
+                          'evaluator':  "native",
+                          'ao_mode':    False,
+                          'mo_block':   0,
+                          'max_memory': 0.,
+                          'emin':       0.,
+                          'emax':       0.,
+                          'efermi_shift': True,
+                          'output_file': output_file})
+  first, second = frame_rows(output_file)
+  assert len(first) > 0
+  assert first == second